@@ -0,0 +1,112 @@
+# benchmarks/bench_blocos.py
+#
+# Compara os formatos do arquivo binário: registros de tamanho fixo (original),
+# compactos (versão 2) e em blocos comprimidos (zlib e lzma):
+# tamanho em disco, varredura completa e buscas pontuais com cache frio e quente.
+# "Cache frio" = arquivos retirados do cache de páginas do sistema operacional
+# (posix_fadvise, quando disponível) e formato reaberto do zero.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_blocos [quantidade_de_filmes] [quantidade_de_buscas]
+# Se data/filmes.bin existir, os filmes são lidos dele; senão, são gerados.
+
+import glob
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import islice
+
+from src.binary_store import (salvar_filmes_binario, iterar_filmes_binario, obter_store, obter_formato,
+                              fechar_store, FORMATO_FIXO, FORMATO_COMPACTO, FORMATO_BLOCOS)
+from src.filme import Filme
+
+GENEROS = ("Drama", "Comedy", "Action", "Horror", "Romance", "Thriller", "Documentary", "Animation")
+PALAVRAS = ("the of a love night man day story life war dark last city house girl king "
+            "return blood world dead black time star lost secret road home island river").split()
+
+def _filmes(n: int) -> list[Filme]:
+    if os.path.exists("data/filmes.bin"):
+        filmes = [filme for _, filme in islice(iterar_filmes_binario("data/filmes.bin"), n)]
+        if filmes:
+            return filmes
+    random.seed(7)
+    diretores = [f"Diretor {i}" for i in range(max(n // 20, 1))]
+    return [Filme(f"tt{i:07d}",
+                  " ".join(random.choice(PALAVRAS) for _ in range(random.randint(1, 5))).title(),
+                  random.randint(1920, 2024),
+                  ",".join(random.sample(GENEROS, random.randint(1, 3))),
+                  random.choice(diretores))
+            for i in range(n)]
+
+def _esfriar(caminho: str):
+    """Fecha o formato e tira do cache de páginas o arquivo de dados e seus arquivos auxiliares."""
+    fechar_store(caminho)
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for arquivo in glob.glob(os.path.splitext(caminho)[0] + ".*"):
+        fd = os.open(arquivo, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+def _tamanho(caminho: str) -> int:
+    return sum(os.path.getsize(arquivo) for arquivo in glob.glob(os.path.splitext(caminho)[0] + ".*"))
+
+def _medir(nome: str, caminho: str, sorteio: list[int]):
+    """sorteio: posições (ordem de gravação) dos filmes buscados."""
+    _esfriar(caminho)
+    inicio = time.perf_counter()
+    enderecos = [endereco for endereco, _ in iterar_filmes_binario(caminho)]
+    varredura = time.perf_counter() - inicio
+    alvos = [enderecos[i] for i in sorteio]
+
+    frio = 0.0
+    for endereco in alvos:
+        _esfriar(caminho)
+        inicio = time.perf_counter()
+        obter_store(caminho).ler(endereco)
+        frio += time.perf_counter() - inicio
+
+    store = obter_store(caminho)
+    store.ler(alvos[0])
+    inicio = time.perf_counter()
+    for endereco in alvos:
+        store.ler(endereco)
+    quente = time.perf_counter() - inicio
+
+    extra = ""
+    formato = obter_formato(caminho)
+    if formato.em_blocos:
+        extra = f" | {len(formato.blocos)} blocos, {formato.blocos_lidos} descomprimidos nas buscas quentes"
+    fechar_store(caminho)
+    print(f"  {nome:<14} arquivo {_tamanho(caminho) / 2**20:7.2f} MB | varredura fria {varredura:6.3f}s | "
+          f"busca fria {frio / len(alvos) * 1e3:7.3f} ms | busca quente {quente / len(alvos) * 1e6:7.1f} µs{extra}")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    buscas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    filmes = _filmes(n)
+    random.seed(11)
+    sorteio = [random.randrange(len(filmes)) for _ in range(buscas)]
+    print(f"\nFormatos de filmes.bin ({len(filmes)} filmes, {buscas} buscas pontuais)")
+    if not hasattr(os, "posix_fadvise"):
+        print("  (posix_fadvise indisponível: o cache do sistema operacional não é esvaziado)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, formato, compressor in ((FORMATO_FIXO, FORMATO_FIXO, "zlib"),
+                                          (FORMATO_COMPACTO, FORMATO_COMPACTO, "zlib"),
+                                          ("blocos-zlib", FORMATO_BLOCOS, "zlib"),
+                                          ("blocos-lzma", FORMATO_BLOCOS, "lzma")):
+            caminho = os.path.join(pasta, nome, "filmes.bin")
+            os.makedirs(os.path.dirname(caminho))
+            inicio = time.perf_counter()
+            salvar_filmes_binario(filmes, caminho, formato, compressor)
+            print(f"  {nome:<14} gravado em {time.perf_counter() - inicio:.2f}s")
+            _medir(nome, caminho, sorteio)
+
+if __name__ == "__main__":
+    main()
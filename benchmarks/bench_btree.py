@@ -0,0 +1,73 @@
+# benchmarks/bench_btree.py
+#
+# Compara a construção da B-Tree por inserções repetidas (BTree.inserir)
+# com o carregamento em lote (BTree.bulk_load): tempo e quantidade de nós.
+# Mede também as consultas de intervalo: a lista completa (buscar_intervalo) contra
+# os N primeiros do scan em ordem, que para sem percorrer o resto do intervalo.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_btree [quantidade_de_chaves]
+
+import random
+import sys
+import time
+from itertools import islice
+
+from indices.arvore import BTree
+
+def _medir(descricao: str, construir):
+    inicio = time.perf_counter()
+    arvore = construir()
+    duracao = time.perf_counter() - inicio
+    print(f"  {descricao:<28} {duracao:8.3f}s  {arvore.contar_nos():>9} nós")
+    return arvore
+
+def comparar(nome: str, pares: list[tuple], t: int = 3):
+    print(f"\n{nome} ({len(pares)} chaves, t={t})")
+    ordenados = sorted(pares)
+
+    def por_insercao():
+        arvore = BTree(t)
+        for chave, offset in pares:
+            arvore.inserir(chave, offset)
+        return arvore
+
+    _medir("inserções repetidas", por_insercao)
+    _medir("bulk_load (fill=1.0)", lambda: BTree.bulk_load(ordenados, 1.0, t=t))
+    arvore = _medir("bulk_load (fill=0.7)", lambda: BTree.bulk_load(ordenados, 0.7, t=t))
+    _medir_intervalos(arvore, ordenados)
+
+def _medir_intervalos(arvore: BTree, ordenados: list[tuple], consultas: int = 50, primeiros: int = 20):
+    """Intervalos com cerca de 1/4 das chaves: resultado inteiro x primeira página do scan."""
+    random.seed(3)
+    limites = []
+    for _ in range(consultas):
+        inicio = random.randrange(len(ordenados) * 3 // 4)
+        limites.append((ordenados[inicio][0], ordenados[inicio + len(ordenados) // 4][0]))
+
+    comeco = time.perf_counter()
+    for min_key, max_key in limites:
+        arvore.buscar_intervalo(min_key, max_key)
+    completo = (time.perf_counter() - comeco) / consultas
+    comeco = time.perf_counter()
+    for min_key, max_key in limites:
+        list(islice(arvore.scan(min_key, max_key), primeiros))
+    pagina = (time.perf_counter() - comeco) / consultas
+    comeco = time.perf_counter()
+    for min_key, max_key in limites:
+        list(islice(arvore.scan_reverso(min_key, max_key), primeiros))
+    reverso = (time.perf_counter() - comeco) / consultas
+    print(f"  intervalo (~{len(ordenados) // 4} chaves): inteiro {completo * 1e3:8.3f} ms | "
+          f"{primeiros} primeiros pelo scan {pagina * 1e3:6.3f} ms | reverso {reverso * 1e3:6.3f} ms")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    random.seed(42)
+    tamanho = 236
+    anos = [(random.randint(1900, 2025), i * tamanho) for i in range(n)]
+    ids = [(f"tt{i:07d}", i * tamanho) for i in random.sample(range(10_000_000), n)]
+    comparar("Índice de ano (chaves duplicadas)", anos)
+    comparar("Índice de ID (chaves únicas)", ids)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_cache_registros.py
+#
+# Mede o cache de registros decodificados do FilmeStore com uma carga de buscas
+# concentrada em poucos filmes populares (distribuição de Zipf), como a de um catálogo
+# real: taxa de acertos e tempo por leitura sem cache e com as políticas LRU e CLOCK,
+# para algumas capacidades.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_cache_registros [quantidade_de_filmes] [quantidade_de_leituras]
+# Se data/filmes.bin existir, os filmes são lidos dele; senão, são gerados.
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_blocos import _filmes
+from src.binary_store import (salvar_filmes_binario, iterar_filmes_binario, obter_store, fechar_store,
+                              configurar_cache_registros, FORMATO_COMPACTO, FORMATO_BLOCOS)
+from src.cache_registros import POLITICAS
+
+EXPOENTE_ZIPF = 1.1
+TAMANHO_LOTE = 20   # filmes lidos por busca (uma página de resultados)
+
+def _sorteio_zipf(n: int, quantidade: int) -> list[int]:
+    """Posições sorteadas com probabilidade proporcional a 1 / posição^EXPOENTE_ZIPF."""
+    random.seed(13)
+    pesos = [1 / (i + 1) ** EXPOENTE_ZIPF for i in range(n)]
+    posicoes = random.choices(range(n), weights=pesos, k=quantidade)
+    # Os filmes populares ficam espalhados pelo arquivo, não só no início
+    embaralhadas = list(range(n))
+    random.shuffle(embaralhadas)
+    return [embaralhadas[p] for p in posicoes]
+
+def _medir(caminho: str, alvos: list[int], capacidade: int, politica: str) -> str:
+    fechar_store(caminho)
+    configurar_cache_registros(capacidade, politica)
+    store = obter_store(caminho)
+    inicio = time.perf_counter()
+    for i in range(0, len(alvos), TAMANHO_LOTE):
+        store.fetch(alvos[i:i + TAMANHO_LOTE])
+    duracao = (time.perf_counter() - inicio) / len(alvos)
+    cache = store.cache
+    resumo = f"{duracao * 1e6:7.2f} µs por filme"
+    if capacidade:
+        resumo += f" | acertos {cache.taxa_acertos():6.1%} | despejos {cache.despejos}"
+    fechar_store(caminho)
+    return resumo
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    leituras = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    filmes = _filmes(n)
+    sorteio = _sorteio_zipf(len(filmes), leituras)
+    print(f"\nCache de registros ({len(filmes)} filmes, {leituras} leituras com Zipf s={EXPOENTE_ZIPF})")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in (FORMATO_COMPACTO, FORMATO_BLOCOS):
+            caminho = os.path.join(pasta, formato, "filmes.bin")
+            os.makedirs(os.path.dirname(caminho))
+            salvar_filmes_binario(filmes, caminho, formato)
+            enderecos = [endereco for endereco, _ in iterar_filmes_binario(caminho)]
+            alvos = [enderecos[p] for p in sorteio]
+            print(f"  {formato}")
+            print(f"    {'sem cache':<22} {_medir(caminho, alvos, 0, POLITICAS[0])}")
+            for capacidade in (len(filmes) // 100, len(filmes) // 10):
+                for politica in POLITICAS:
+                    descricao = f"{politica.upper()} {capacidade} filmes"
+                    print(f"    {descricao:<22} {_medir(caminho, alvos, capacidade, politica)}")
+
+if __name__ == "__main__":
+    main()
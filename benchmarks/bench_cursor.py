@@ -0,0 +1,85 @@
+# benchmarks/bench_cursor.py
+#
+# Mede o tempo até a primeira página de um resultado grande (ex: prefixo de uma letra ou
+# intervalo de anos amplo) exibido pelo paginador: o caminho original (todos os filmes
+# lidos e o resultado inteiro ordenado antes da página 1) e o CursorResultados (só os
+# offsets e as chaves; heap top-K e leitura da página exibida). Mede também o resultado
+# reaproveitado do cache de buscas e a memória retida pelo resultado.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_cursor [quantidade_de_filmes]
+# Se data/filmes.bin existir, os filmes são lidos dele; senão, são gerados.
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_blocos import _filmes
+from src.binary_store import salvar_filmes_binario, iterar_filmes_binario, obter_store, fechar_store
+from src.cursor_resultados import CursorResultados, OrdemPreguicosa
+
+ITENS_POR_PAGINA = 10
+
+def _original(caminho: str, offsets: list[int]) -> list:
+    """Como antes: lê todos os filmes, ordena a lista inteira e exibe a página 1."""
+    pares = obter_store(caminho).fetch_pares(offsets)
+    pares.sort(key=lambda par: par[1].titulo.lower())
+    filmes = [filme for _, filme in pares]
+    [str(filme) for filme in filmes[:ITENS_POR_PAGINA]]
+    return filmes
+
+def _cursor(caminho: str, offsets: list[int]) -> CursorResultados:
+    """Lê os candidatos (o planejador precisa deles), mas só guarda chave e offset."""
+    pares = obter_store(caminho).fetch_pares(offsets)
+    cursor = CursorResultados(OrdemPreguicosa([(filme.titulo.lower(), offset) for offset, filme in pares]), caminho)
+    [str(filme) for filme in cursor.pagina(1, ITENS_POR_PAGINA)]
+    return cursor
+
+def _medir(nome: str, funcao, caminho: str, offsets: list[int]):
+    fechar_store(caminho)
+    gc.collect()
+    inicio = time.perf_counter()
+    funcao(caminho, offsets)
+    duracao = time.perf_counter() - inicio
+
+    fechar_store(caminho)
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao(caminho, offsets)
+    fechar_store(caminho)   # descarta o cache de registros: só conta o que o resultado retém
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    print(f"    {nome:<36} página 1 em {duracao * 1e3:8.1f} ms | resultado retém {memoria / 1024:8.0f} KiB")
+
+def _medir_cache(caminho: str, offsets: list[int]):
+    """Resultado já no cache de buscas: offsets em ordem, sem consultar índices."""
+    for nome, funcao in (("original (fetch de todos)", lambda: obter_store(caminho).fetch(offsets)[:ITENS_POR_PAGINA]),
+                         ("CursorResultados", lambda: CursorResultados(offsets, caminho).pagina(1, ITENS_POR_PAGINA))):
+        fechar_store(caminho)
+        inicio = time.perf_counter()
+        funcao()
+        print(f"    {nome:<36} página 1 em {(time.perf_counter() - inicio) * 1e3:8.1f} ms")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    filmes = _filmes(n)
+    print(f"\nPrimeira página de um resultado com todos os {len(filmes)} filmes, ordenado por título")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "filmes.bin")
+        salvar_filmes_binario(filmes, caminho)
+        offsets = [offset for offset, _ in iterar_filmes_binario(caminho)]
+        print("  busca executada pelo planejador")
+        _medir("original (lista ordenada inteira)", _original, caminho, offsets)
+        _medir("CursorResultados (heap top-K)", _cursor, caminho, offsets)
+        print("  resultado reaproveitado do cache de buscas")
+        _medir_cache(caminho, offsets)
+        fechar_store(caminho)
+
+if __name__ == "__main__":
+    main()
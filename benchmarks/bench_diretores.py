@@ -0,0 +1,93 @@
+# benchmarks/bench_diretores.py
+#
+# Mede o índice de diretores (nomes normalizados + trigramas) com uma quantidade de
+# nomes da ordem de name.basics.tsv: construção, memória, tamanho do arquivo e tempo
+# das buscas exatas sem caixa/acentos e das sugestões aproximadas, comparado à
+# alternativa sem índice (varrer todas as chaves normalizadas).
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_diretores [quantidade_de_nomes]
+# Os nomes são gerados combinando prenomes e sobrenomes formados por sílabas.
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from indices.diretores import (IndiceDiretores, normalizar_nome, salvar_indice_diretores_em_arquivo,
+                               carregar_indice_diretores_de_arquivo)
+
+PRENOMES = ("Stanley Pedro Akira Agnès Sofia Jean-Luc Wong François Ingmar Céline Yasujirō Andrei Chantal "
+            "Martin Kathryn Lynne Bong Jane Krzysztof Lucrecia Abbas Ousmane Hayao Satyajit Werner Maria "
+            "José Ana João Luis Carmen Olga Pierre Giulia Hans Ingrid Kenji Mei Raúl Fatima Nikos Björn").split()
+# Sílabas consoante + vogal + final: sobrenomes variados como os de name.basics.tsv
+SILABAS = [c + v + f for c in "b c d f g h j k l m n p r s t v w z ch sh tr".split()
+           for v in "a e i o u á é ó ã y".split() for f in ("", "n", "r", "s", "l", "k", "tt")]
+
+def _sobrenome() -> str:
+    return "".join(random.choice(SILABAS) for _ in range(random.randint(2, 4))).capitalize()
+
+def _nomes(n: int) -> list[str]:
+    random.seed(5)
+    nomes = []
+    for _ in range(n):
+        nome = f"{random.choice(PRENOMES)} {_sobrenome()}"
+        if random.random() < 0.3:
+            nome += f" {_sobrenome()}"
+        nomes.append(nome)
+    return nomes
+
+def _digitacao(nome: str) -> str:
+    """Simula um erro de digitação (troca de duas letras vizinhas) e remove os acentos."""
+    chave = normalizar_nome(nome)
+    i = random.randrange(1, max(len(chave) - 1, 2))
+    return chave[:i - 1] + chave[i] + chave[i - 1] + chave[i + 1:]
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    nomes = _nomes(n)
+    print(f"\nÍndice de diretores ({n} nomes gerados)")
+
+    inicio = time.perf_counter()
+    indice = IndiceDiretores()
+    for nome in nomes:
+        indice.inserir(nome)
+    construcao = time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "diretores.idx")
+        salvar_indice_diretores_em_arquivo(indice, caminho)
+        tamanho = os.path.getsize(caminho)
+        inicio = time.perf_counter()
+        indice = carregar_indice_diretores_de_arquivo(caminho)
+        carga = time.perf_counter() - inicio
+    print(f"  {len(indice)} nomes distintos | construção {construcao:6.2f}s | arquivo {tamanho / 2**20:6.1f} MB | "
+          f"carregar {carga:5.2f}s")
+
+    amostra = random.sample(nomes, 100)
+    inicio = time.perf_counter()
+    for nome in amostra:
+        indice.buscar_nomes(nome.upper())
+    print(f"  busca sem caixa/acentos: {(time.perf_counter() - inicio) / len(amostra) * 1e3:8.3f} ms por consulta")
+
+    for descricao, consultas in (("sobrenome", [normalizar_nome(nome.split()[1]) for nome in amostra[:20]]),
+                                 ("nome completo com erro", [_digitacao(nome) for nome in amostra[:20]])):
+        inicio = time.perf_counter()
+        acertos = 0
+        for consulta, nome in zip(consultas, amostra):
+            sugestoes = indice.buscar_semelhantes(consulta, limite=10)
+            acertos += any(sugerido == nome for sugerido, _ in sugestoes)
+        duracao = (time.perf_counter() - inicio) / len(consultas)
+        extra = f" | original entre as 10 primeiras em {acertos}/{len(consultas)}" if "erro" in descricao else ""
+        print(f"  sugestões ({descricao}): {duracao * 1e3:8.2f} ms por consulta{extra}")
+
+    chaves = list(indice.por_chave)
+    consulta = normalizar_nome(amostra[0].split()[1])
+    inicio = time.perf_counter()
+    [chave for chave in chaves if consulta in chave]
+    print(f"  sem índice (varrer as chaves normalizadas): {(time.perf_counter() - inicio) * 1e3:8.1f} ms por consulta "
+          "(só trechos exatos, sem tolerar erros)")
+
+if __name__ == "__main__":
+    main()
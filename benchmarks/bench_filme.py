@@ -0,0 +1,98 @@
+# benchmarks/bench_filme.py
+#
+# Compara as representações de um filme lido de filmes.bin, com o catálogo inteiro em
+# memória (como em ler_filmes_binario): a classe original (com __dict__ por instância),
+# Filme com __slots__ e o decodificador do próprio formato (o que as buscas usam), todos
+# com os campos decodificados na leitura. Mede a memória da lista de filmes e o tempo de
+# leitura quando só o ano é usado (ex: varredura por ano) e quando todos os campos são usados.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_filme [quantidade_de_filmes]
+# Se data/filmes.bin existir, os filmes são lidos dele; senão, são gerados.
+
+import gc
+import os
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_blocos import _filmes
+from src.binary_store import salvar_filmes_binario, iterar_filmes_binario, obter_formato, fechar_store, FORMATO_FIXO
+from src.filme import Filme
+from src.formato_compacto import FORMATO_REGISTRO, TAMANHO_FIXO
+
+class _FilmeComDict:
+    """A classe Filme original: atributos em um __dict__ por instância."""
+
+    def __init__(self, id: str, titulo: str, ano: int, genero: str, diretor: str):
+        self.id = id
+        self.titulo = titulo
+        self.ano = ano
+        self.genero = genero
+        self.diretor = diretor
+
+def _leitor_imediato(formato, classe):
+    """Decodificação original de um registro do formato, com todos os campos na leitura."""
+    if formato.tamanho_minimo == Filme.TAMANHO_REGISTRO:
+        def ler(buffer, offset):
+            id_b, titulo_b, ano, genero_b, diretor_b = struct.unpack_from(Filme.FORMATO_REGISTRO, buffer, offset)
+            return classe(id_b.decode("utf-8").rstrip("\x00"), titulo_b.decode("utf-8").rstrip("\x00"), ano,
+                          genero_b.decode("utf-8").rstrip("\x00"), diretor_b.decode("utf-8").rstrip("\x00"))
+        return ler
+    generos, diretores = formato.generos.valores, formato.diretores.valores
+
+    def ler(buffer, offset):
+        ano, genero, diretor, n_id, n_titulo = struct.unpack_from(FORMATO_REGISTRO, buffer, offset)
+        inicio = offset + TAMANHO_FIXO
+        return classe(bytes(buffer[inicio:inicio + n_id]).decode("utf-8"),
+                      bytes(buffer[inicio + n_id:inicio + n_id + n_titulo]).decode("utf-8"),
+                      ano, generos[genero], diretores[diretor])
+    return ler
+
+def _medir(nome: str, ler, dados: bytes, offsets: list[int]):
+    gc.collect()
+    tracemalloc.start()
+    filmes = [ler(dados, o) for o in offsets]
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del filmes
+
+    gc.collect()
+    inicio = time.perf_counter()
+    filmes = [ler(dados, o) for o in offsets]
+    leitura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    sum(filme.ano for filme in filmes)
+    so_ano = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for filme in filmes:
+        filme.id, filme.titulo, filme.genero, filme.diretor
+    demais = time.perf_counter() - inicio
+    print(f"    {nome:<34} memória {memoria / len(offsets):6.1f} B/filme | leitura {leitura * 1e3:7.1f} ms | "
+          f"+ ano {so_ano * 1e3:6.1f} ms | + demais campos {demais * 1e3:7.1f} ms")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    filmes = _filmes(n)
+    print(f"\nRepresentação dos filmes em memória ({len(filmes)} filmes)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome_formato in ("compacto", FORMATO_FIXO):
+            caminho = os.path.join(pasta, nome_formato, "filmes.bin")
+            os.makedirs(os.path.dirname(caminho))
+            salvar_filmes_binario(filmes, caminho, nome_formato)
+            offsets = [offset for offset, _ in iterar_filmes_binario(caminho)]
+            with open(caminho, "rb") as f:
+                dados = f.read()
+            formato = obter_formato(caminho)
+            print(f"  formato {nome_formato}")
+            _medir("original (__dict__, tudo na leitura)", _leitor_imediato(formato, _FilmeComDict), dados, offsets)
+            _medir("Filme (__slots__, tudo na leitura)", _leitor_imediato(formato, Filme), dados, offsets)
+            _medir("formato.decodificar", formato.decodificar, dados, offsets)
+            fechar_store(caminho)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_trie.py
+#
+# Compara a Trie original (um TrieNode por caractere, salva com pickle)
+# com a TrieCompacta (radix achatada em arrays, carregada com mmap):
+# memória ocupada, tamanho do arquivo, tempo de salvamento/carregamento e de busca.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_trie [quantidade_de_titulos]
+# Se data/filmes.bin existir, os títulos são lidos dele; senão, são gerados.
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from indices.trie import Trie, salvar_trie_em_arquivo, carregar_trie_de_arquivo
+from indices.trie_compacta import TrieCompacta, salvar_trie_compacta, carregar_trie_compacta
+from src.binary_store import iterar_filmes_binario
+
+PALAVRAS = ("the of a love night man day story life war dark last city house girl king "
+            "return blood world dead black time star lost secret road home island river").split()
+
+def _titulos(n: int) -> list[str]:
+    if os.path.exists("data/filmes.bin"):
+        titulos = [filme.titulo for _, filme in iterar_filmes_binario("data/filmes.bin")]
+        if titulos:
+            return titulos[:n]
+    random.seed(7)
+    return [" ".join(random.choice(PALAVRAS) for _ in range(random.randint(1, 5))).title() + f" {i}"
+            for i in range(n)]
+
+def _construir(classe, titulos: list[str]):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    trie = classe()
+    for i, titulo in enumerate(titulos):
+        trie.inserir(titulo, i * 236)
+    duracao = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return trie, duracao, memoria
+
+def _medir_carga(carregar, caminho: str):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    trie = carregar(caminho)
+    duracao = time.perf_counter() - inicio
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return trie, duracao, memoria
+
+def _medir_buscas(trie, prefixos: list[str]) -> float:
+    inicio = time.perf_counter()
+    for prefixo in prefixos:
+        trie.buscar(prefixo)
+    return time.perf_counter() - inicio
+
+def _linha(nome, construcao, mem_construcao, salvar_s, tamanho, carga_s, mem_carga, busca_s):
+    print(f"  {nome:<14} construção {construcao:7.2f}s ({mem_construcao / 2**20:8.1f} MB) | "
+          f"salvar {salvar_s:6.2f}s | arquivo {tamanho / 2**20:7.1f} MB | "
+          f"carregar {carga_s:6.3f}s ({mem_carga / 2**20:8.1f} MB) | buscas {busca_s:6.3f}s")
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    titulos = _titulos(n)
+    prefixos = [t[:random.randint(1, 6)] for t in random.sample(titulos, min(1000, len(titulos)))]
+    print(f"\nTrie vs TrieCompacta ({len(titulos)} títulos)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # Trie original
+        caminho = os.path.join(pasta, "trie.idx")
+        trie, construcao, mem_construcao = _construir(Trie, titulos)
+        inicio = time.perf_counter()
+        try:
+            salvar_trie_em_arquivo(trie, caminho)
+        except RecursionError:
+            print("  Trie           pickle excedeu o limite de recursão ao salvar")
+        else:
+            salvar_s = time.perf_counter() - inicio
+            del trie
+            trie, carga_s, mem_carga = _medir_carga(carregar_trie_de_arquivo, caminho)
+            _linha("Trie", construcao, mem_construcao, salvar_s, os.path.getsize(caminho),
+                   carga_s, mem_carga, _medir_buscas(trie, prefixos))
+        del trie
+
+        # Trie compacta
+        caminho = os.path.join(pasta, "trie_compacta.idx")
+        trie, construcao, mem_construcao = _construir(TrieCompacta, titulos)
+        inicio = time.perf_counter()
+        salvar_trie_compacta(trie, caminho)
+        salvar_s = time.perf_counter() - inicio
+        trie.fechar()
+        trie, carga_s, mem_carga = _medir_carga(carregar_trie_compacta, caminho)
+        _linha("TrieCompacta", construcao, mem_construcao, salvar_s, os.path.getsize(caminho),
+               carga_s, mem_carga, _medir_buscas(trie, prefixos))
+        trie.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_varredura.py
+#
+# Mede as varreduras completas de filmes.bin com um filtro de gênero e de intervalo de
+# anos, em cada formato: a leitura pura do arquivo (limite da banda de disco/cache),
+# a varredura que cria um Filme por registro e aplica o predicado nele (iterar) e a
+# varredura filtrada nos campos crus de cada lote (varrer_filmes_binario).
+#
+# Uso (a partir da raiz do projeto):
+#     python -m benchmarks.bench_varredura [quantidade_de_filmes]
+# Se data/filmes.bin existir, os filmes são lidos dele; senão, são gerados.
+
+import glob
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_blocos import _filmes
+from src.binary_store import (salvar_filmes_binario, iterar_filmes_binario, varrer_filmes_binario,
+                              FORMATO_FIXO, FORMATO_COMPACTO, FORMATO_BLOCOS)
+from src.varredura import FiltroVarredura, TAMANHO_LOTE
+
+FILTROS = (("gênero = Drama", None, "Drama"),
+           ("anos 1990-1999", (1990, 1999), None),
+           ("Comedy em 2000-2010", (2000, 2010), "Comedy"))
+
+def _aceita(filme, ano, genero) -> bool:
+    if ano is not None and not ano[0] <= filme.ano <= ano[1]:
+        return False
+    return genero is None or genero.lower() in filme.genero.lower().split(",")
+
+def _leitura_pura(caminho: str) -> float:
+    inicio = time.perf_counter()
+    with open(caminho, "rb") as f:
+        while f.read(TAMANHO_LOTE):
+            pass
+    return time.perf_counter() - inicio
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    filmes = _filmes(n)
+    print(f"\nVarreduras filtradas de filmes.bin ({len(filmes)} filmes)")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in (FORMATO_FIXO, FORMATO_COMPACTO, FORMATO_BLOCOS):
+            caminho = os.path.join(pasta, formato, "filmes.bin")
+            os.makedirs(os.path.dirname(caminho))
+            salvar_filmes_binario(filmes, caminho, formato)
+            tamanho = sum(os.path.getsize(a) for a in glob.glob(os.path.splitext(caminho)[0] + ".*")) / 2**20
+            _leitura_pura(caminho)
+            print(f"  {formato}: {tamanho:.1f} MB | leitura pura {tamanho / _leitura_pura(caminho):7.0f} MB/s")
+            for descricao, ano, genero in FILTROS:
+                inicio = time.perf_counter()
+                esperados = sum(1 for _, filme in iterar_filmes_binario(caminho) if _aceita(filme, ano, genero))
+                por_filme = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                aceitos = sum(1 for _ in varrer_filmes_binario(caminho, FiltroVarredura(ano, genero)))
+                filtrada = time.perf_counter() - inicio
+                assert aceitos == esperados
+                print(f"    {descricao:<20} {aceitos:7d} aceitos | Filme por registro {por_filme:6.2f}s "
+                      f"({tamanho / por_filme:6.0f} MB/s) | filtro nos campos crus {filtrada:6.2f}s "
+                      f"({tamanho / filtrada:6.0f} MB/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,163 @@
 # indices/arvore.py
 
 import pickle
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Iterator
+
 from src.filme import Filme 
 
+# Offsets lidos do disco por vez quando os filmes de um intervalo são gerados em ordem
+TAMANHO_PAGINA_RESULTADOS = 256
+
+def _chave(par):
+    return par[0]
+
+def _mesmo_no(no):
+    return no
+
+def percorrer_em_ordem(raiz, obter_no, min_key=None, max_key=None, reverso: bool = False) -> Iterator[tuple]:
+    """
+    Gera os pares (chave, offset) com min_key <= chave <= max_key em ordem de chave
+    (decrescente com reverso=True), sem montar listas. None deixa o limite em aberto.
+    obter_no: converte uma referência de filho no nó (identidade na BTree em memória,
+    leitura pelo buffer pool na BTreePaginada).
+    A descida até a primeira chave usa busca binária em cada nó; a partir dela, a pilha
+    guarda o caminho até a folha atual e cada nó é visitado uma única vez. Chaves
+    duplicadas podem estar nos dois lados de um separador, e a descida pelo filho
+    anterior à primeira ocorrência garante que todas apareçam, em ordem.
+    O gerador pode ser abandonado a qualquer momento (ex: islice com os N primeiros).
+    """
+    pilha = []   # (nó, posição): na folha, o início (ou o fim, em reverso) das chaves a emitir;
+                 # em um nó interno, o filho que está sendo percorrido
+    no = raiz
+    while True:
+        if reverso:
+            i = len(no.keys) if max_key is None else bisect_right(no.keys, max_key, key=_chave)
+        else:
+            i = 0 if min_key is None else bisect_left(no.keys, min_key, key=_chave)
+        pilha.append((no, i))
+        if no.is_leaf:
+            break
+        no = obter_no(no.children[i])
+
+    while pilha:
+        no, i = pilha.pop()
+        if no.is_leaf:
+            if reverso:
+                for par in reversed(no.keys[:i]):
+                    if min_key is not None and par[0] < min_key:
+                        return
+                    yield par
+            else:
+                for par in islice(no.keys, i, None):
+                    if max_key is not None and par[0] > max_key:
+                        return
+                    yield par
+            continue
+
+        # O filho i terminou: emite a chave vizinha e desce pelo filho seguinte (ou anterior)
+        if reverso:
+            if i == 0:
+                continue
+            par = no.keys[i - 1]
+            if min_key is not None and par[0] < min_key:
+                return
+            proximo = i - 1
+        else:
+            if i >= len(no.keys):
+                continue
+            par = no.keys[i]
+            if max_key is not None and par[0] > max_key:
+                return
+            proximo = i + 1
+        yield par
+        pilha.append((no, proximo))
+        filho = obter_no(no.children[proximo])
+        while True:
+            pilha.append((filho, len(filho.keys) if reverso else 0))
+            if filho.is_leaf:
+                break
+            filho = obter_no(filho.children[-1 if reverso else 0])
+
+class MontadorEmLote:
+    """
+    Monta uma Árvore B de baixo para cima a partir de pares (chave, offset) ordenados,
+    recebidos um a um. Cada nível guarda só o nó aberto, o último nó fechado e o separador
+    entre os dois (a borda direita da árvore): quando o nó aberto enche, o anterior é
+    entregue a emitir() e ele e seu separador sobem para o nível de cima. O anterior fica
+    retido para que, no fim, o último nó de cada nível (que pode ter menos que t-1 chaves)
+    seja redistribuído com ele. A árvore resultante é a mesma da montagem nível a nível.
+    novo_no(is_leaf): cria um nó vazio (com listas keys e children).
+    emitir(no): recebe cada nó já completo, sempre depois de todos os seus filhos, e
+    devolve a referência guardada no pai (o próprio nó, ou o número da página gravada).
+    """
+
+    def __init__(self, t: int, fill_factor: float, novo_no, emitir):
+        max_chaves = 2 * t - 1
+        self.t = t
+        self.chaves_por_no = max(t - 1, min(max_chaves, int(fill_factor * max_chaves)), 1)
+        self._novo_no = novo_no
+        self._emitir = emitir
+        self._niveis = []   # por nível (0 = folhas): [anterior, separador, aberto]
+
+    def _nivel(self, n: int) -> list:
+        if n == len(self._niveis):
+            self._niveis.append([None, None, self._novo_no(n == 0)])
+        return self._niveis[n]
+
+    def adicionar(self, par):
+        """Acrescenta o próximo par (em ordem) às folhas."""
+        self._adicionar_chave(0, par)
+
+    def _adicionar_chave(self, n: int, par):
+        """Acrescenta a chave ao nó aberto do nível; com o nó cheio, ela passa a separá-lo do próximo."""
+        nivel = self._nivel(n)
+        aberto = nivel[2]
+        if len(aberto.keys) < self.chaves_por_no:
+            aberto.keys.append(par)
+            return
+        if nivel[0] is not None:
+            self._subir(n + 1, nivel[0], nivel[1])
+        nivel[0], nivel[1], nivel[2] = aberto, par, self._novo_no(n == 0)
+
+    def _subir(self, n: int, no, separador=None):
+        """Emite o nó como filho do nível n e, se houver, acrescenta o separador que o segue."""
+        self._nivel(n)[2].children.append(self._emitir(no))
+        if separador is not None:
+            self._adicionar_chave(n, separador)
+
+    def finalizar(self):
+        """
+        Fecha os níveis de baixo para cima (redistribuindo o último nó de cada um com o
+        anterior, se ficou com menos que t-1 chaves) e retorna a referência da raiz.
+        """
+        n = 0
+        while True:
+            anterior, separador, ultimo = self._nivel(n)
+            if anterior is None:
+                # Único nó do nível mais alto: é a raiz (ou, se só recebeu um filho, o filho)
+                if not ultimo.is_leaf and not ultimo.keys:
+                    return ultimo.children[0]
+                return self._emitir(ultimo)
+            if len(ultimo.keys) < self.t - 1:
+                chaves = anterior.keys + [separador] + ultimo.keys
+                filhos = anterior.children + ultimo.children
+                if len(chaves) <= 2 * self.t - 1:
+                    anterior.keys, anterior.children = chaves, filhos
+                    ultimo = None
+                else:
+                    meio = len(chaves) // 2
+                    anterior.keys, separador, ultimo.keys = chaves[:meio], chaves[meio], chaves[meio + 1:]
+                    if not anterior.is_leaf:
+                        anterior.children, ultimo.children = filhos[:meio + 1], filhos[meio + 1:]
+            if ultimo is None:
+                self._subir(n + 1, anterior)
+            else:
+                self._subir(n + 1, anterior, separador)
+                self._subir(n + 1, ultimo)
+            n += 1
+
 class BTreeNode:
     def __init__(self, t, is_leaf):
         """
@@ -32,6 +187,31 @@ class BTree:
         self.t = t 
         self.root = BTreeNode(t, True) # A raiz inicial é uma folha
 
+    @classmethod
+    def bulk_load(cls, pares_ordenados, fill_factor: float = 1.0, t: int = 3) -> "BTree":
+        """
+        Constrói a Árvore B de baixo para cima a partir de pares (chave, offset) já ordenados,
+        consumidos um a um pelo MontadorEmLote: as folhas são preenchidas diretamente (até
+        fill_factor da capacidade 2t-1) e os separadores sobem para os níveis internos à
+        medida que os nós fecham, sem as descidas, divisões e list.insert de inserções
+        repetidas e sem copiar os pares para uma lista.
+        """
+        arvore = cls(t)
+        montador = MontadorEmLote(t, fill_factor, lambda is_leaf: BTreeNode(t, is_leaf), _mesmo_no)
+        for par in pares_ordenados:
+            montador.adicionar(par)
+        arvore.root = montador.finalizar()
+        return arvore
+
+    def contar_nos(self) -> int:
+        """Retorna a quantidade total de nós da árvore."""
+        total, pilha = 0, [self.root]
+        while pilha:
+            node = pilha.pop()
+            total += 1
+            pilha.extend(node.children)
+        return total
+
     def inserir(self, key, offset: int):
         """
         Insere uma nova chave e seu offset associado na Árvore B.
@@ -102,90 +282,31 @@ class BTree:
         # Insere a chave promovida no nó pai na posição correta
         parent_node.keys.insert(i, promoted_key_pair)
 
-    def buscar(self, key) -> list[int]:
+    def scan(self, min_key=None, max_key=None) -> Iterator[tuple]:
         """
-        Busca uma chave na Árvore B e retorna uma lista de offsets associados.
-        Como anos podem não ser únicos, retorna todos os offsets para a chave.
+        Gera os pares (chave, offset) com min_key <= chave <= max_key em ordem crescente
+        de chave, sob demanda (None deixa o limite em aberto). Pode ser interrompido após
+        os N primeiros resultados sem percorrer o resto do intervalo.
         """
-        return self._buscar_recursivo(self.root, key)
+        return percorrer_em_ordem(self.root, _mesmo_no, min_key, max_key)
 
-    def _buscar_recursivo(self, node: BTreeNode, key) -> list[int]:
-        """
-        Método auxiliar recursivo para buscar uma chave.
-        """
-        i = 0
-        # Encontra a primeira chave maior ou igual à chave buscada
-        while i < len(node.keys) and key > node.keys[i][0]:
-            i += 1
-        
-        offsets_encontrados = []
-        
-        # Verifica se a chave foi encontrada neste nó
-        if i < len(node.keys) and key == node.keys[i][0]:
-            # Coleta todos os offsets para essa chave neste nó (útil para chaves duplicadas como anos)
-            offsets_encontrados.extend([k[1] for k in node.keys if k[0] == key])
-            
-            # Se não for uma folha, continua buscando nos filhos, pois a chave pode estar em múltiplos locais
-            # ou ser um separador para um intervalo de chaves que contém a chave buscada.
-            if not node.is_leaf:
-                # Busca no filho à esquerda da chave encontrada
-                offsets_encontrados.extend(self._buscar_recursivo(node.children[i], key))
-                # Busca no filho à direita da chave encontrada (se houver, e se a chave for a última no nó)
-                if i + 1 < len(node.children):
-                    offsets_encontrados.extend(self._buscar_recursivo(node.children[i + 1], key))
-            
-            return offsets_encontrados
-        
-        # Se não encontrou no nó atual e é folha, a chave não existe na árvore
-        elif node.is_leaf:
-            return []
-        
-        # Se não encontrou no nó atual e não é folha, desce para o filho apropriado
-        else:
-            return self._buscar_recursivo(node.children[i], key)
+    def scan_reverso(self, min_key=None, max_key=None) -> Iterator[tuple]:
+        """Como scan, mas em ordem decrescente de chave (começando por max_key)."""
+        return percorrer_em_ordem(self.root, _mesmo_no, min_key, max_key, reverso=True)
 
-    def buscar_intervalo(self, min_key, max_key) -> list[int]:
+    def buscar(self, key) -> list[int]:
         """
-        Busca todas as chaves dentro de um intervalo [min_key, max_key] e retorna seus offsets.
+        Busca uma chave na Árvore B e retorna uma lista de offsets associados.
+        Como anos podem não ser únicos, retorna todos os offsets para a chave.
         """
-        offsets = []
-        self._coletar_offsets_em_intervalo(self.root, min_key, max_key, offsets)
-        return list(set(offsets)) # Remove duplicatas, se houver, pois uma chave pode aparecer em múltiplos caminhos na busca
+        return [offset for _, offset in self.scan(key, key)]
 
-    def _coletar_offsets_em_intervalo(self, node: BTreeNode, min_key, max_key, offsets_list: list[int]):
+    def buscar_intervalo(self, min_key, max_key) -> list[int]:
         """
-        Método auxiliar recursivo para coletar offsets dentro de um intervalo.
+        Busca todas as chaves dentro de um intervalo [min_key, max_key] e retorna seus offsets,
+        em ordem de chave.
         """
-        i = 0
-        # Encontra o primeiro filho ou chave que pode estar no intervalo
-        while i < len(node.keys) and min_key > node.keys[i][0]:
-            i += 1
-        
-        # Percorre os filhos e chaves
-        
-        # Visita o filho antes da primeira chave no intervalo (se houver)
-        if not node.is_leaf and i < len(node.children):
-            self._coletar_offsets_em_intervalo(node.children[i], min_key, max_key, offsets_list)
-
-        # Percorre as chaves do nó atual
-        current_key_idx = i
-        while current_key_idx < len(node.keys):
-            key_val, offset_val = node.keys[current_key_idx]
-            if min_key <= key_val <= max_key:
-                offsets_list.append(offset_val)
-            elif key_val > max_key: # Se já passou do max_key na folha, podemos parar de verificar chaves neste nó
-                break
-            
-            # Se não é folha, visita o filho à direita da chave atual
-            if not node.is_leaf and current_key_idx + 1 < len(node.children):
-                self._coletar_offsets_em_intervalo(node.children[current_key_idx + 1], min_key, max_key, offsets_list)
-            
-            current_key_idx += 1
-            
-        # Garante que o último filho (se houver e não foi visitado) seja visitado
-        if not node.is_leaf and current_key_idx < len(node.children): # Se ainda restam filhos para visitar
-            self._coletar_offsets_em_intervalo(node.children[current_key_idx], min_key, max_key, offsets_list)
-
+        return [offset for _, offset in self.scan(min_key, max_key)]
 
     def salvar_para_arquivo(self, caminho: str):
         """Salva a B-Tree completa em um arquivo usando pickle."""
@@ -207,12 +328,8 @@ def construir_indice_ano_b_tree(filmes: list[Filme], t: int = 3) -> BTree:
     Constrói um índice B-Tree para o ano dos filmes.
     t: Grau mínimo da B-Tree.
     """
-    b_tree = BTree(t)
-    for i, filme in enumerate(filmes):
-        # Acessa TAMANHO_REGISTRO via Filme.TAMANHO_REGISTRO
-        posicao = i * Filme.TAMANHO_REGISTRO 
-        b_tree.inserir(filme.ano, posicao)
-    return b_tree
+    pares = sorted((filme.ano, i * Filme.TAMANHO_REGISTRO) for i, filme in enumerate(filmes))
+    return BTree.bulk_load(pares, t=t)
 
 # Construtor do índice de ID
 def construir_indice_id_b_tree(filmes: list[Filme], t: int = 3) -> BTree:
@@ -220,15 +337,11 @@ def construir_indice_id_b_tree(filmes: list[Filme], t: int = 3) -> BTree:
     Constrói um índice B-Tree para o ID dos filmes.
     t: Grau mínimo da B-Tree.
     """
-    b_tree = BTree(t)
-    for i, filme in enumerate(filmes):
-        # Acessa TAMANHO_REGISTRO via Filme.TAMANHO_REGISTRO
-        posicao = i * Filme.TAMANHO_REGISTRO
-        b_tree.inserir(filme.id, posicao)
-    return b_tree
+    pares = sorted((filme.id, i * Filme.TAMANHO_REGISTRO) for i, filme in enumerate(filmes))
+    return BTree.bulk_load(pares, t=t)
 
 # Funções de busca que usam a BTree e o binary_store
-from src.binary_store import ler_filme_por_offset # Importa para ler filmes
+from src.binary_store import obter_store # Importa para ler filmes
 
 def buscar_filmes_por_ano_b_tree(b_tree: BTree, ano: int | tuple, caminho_bin: str = "data/filmes.bin") -> list[Filme]:
     """
@@ -242,12 +355,25 @@ def buscar_filmes_por_ano_b_tree(b_tree: BTree, ano: int | tuple, caminho_bin: s
     else:
         offsets = b_tree.buscar(ano)
     
-    filmes = []
-    for offset in offsets:
-        filme = ler_filme_por_offset(offset, caminho_bin)
-        if filme: # Adiciona apenas se o filme foi lido com sucesso
-            filmes.append(filme)
-    return filmes
+    # Lê todos os registros de uma vez; offsets inválidos são descartados pelo store
+    return obter_store(caminho_bin).fetch(offsets)
+
+def iterar_filmes_em_ordem(b_tree, min_key=None, max_key=None, caminho_bin: str = "data/filmes.bin",
+                           reverso: bool = False,
+                           tamanho_pagina: int = TAMANHO_PAGINA_RESULTADOS) -> Iterator[Filme]:
+    """
+    Gera os filmes com chave em [min_key, max_key] já em ordem de chave (ano ou ID;
+    decrescente com reverso=True), sem montar nem ordenar o intervalo inteiro: os offsets
+    vêm do scan da árvore e são lidos do disco em páginas de tamanho_pagina.
+    Ex: os 20 filmes mais recentes = islice(iterar_filmes_em_ordem(indice_ano, reverso=True), 20).
+    """
+    store = obter_store(caminho_bin)
+    pares = b_tree.scan_reverso(min_key, max_key) if reverso else b_tree.scan(min_key, max_key)
+    while True:
+        pagina = [offset for _, offset in islice(pares, tamanho_pagina)]
+        if not pagina:
+            return
+        yield from store.fetch(pagina)
 
 def buscar_filme_por_id_b_tree(b_tree_id: BTree, filme_id: str, caminho_bin: str = "data/filmes.bin") -> Filme | None:
     """
@@ -259,4 +385,4 @@ def buscar_filme_por_id_b_tree(b_tree_id: BTree, filme_id: str, caminho_bin: str
         return None
     
     # Para ID, esperamos apenas um offset único. Pega o primeiro válido.
-    return ler_filme_por_offset(offsets[0], caminho_bin)
+    return obter_store(caminho_bin).ler(offsets[0])
@@ -0,0 +1,526 @@
+# indices/arvore_paginada.py
+
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import count, islice
+from typing import Iterator
+
+from indices.arvore import MontadorEmLote, percorrer_em_ordem
+
+MAGICO = b"SIXBTREE"
+VERSAO = 1
+
+TAMANHO_PAGINA_PADRAO = 4096
+TAMANHO_BUFFER_PADRAO = 256  # quantidade de nós mantidos em memória pelo buffer pool
+TAMANHO_BUFFER_MINIMO = 16
+
+# No modo sem roubo, quantidade máxima de nós sujos retidos em memória: acima dela as
+# alterações passam para uma cópia de trabalho do arquivo, onde podem ser gravadas
+LIMITE_RETIDOS_PADRAO = 2048
+
+# Lotes com pelo menos esta fração da quantidade de chaves da árvore são incorporados
+# reconstruindo a árvore (intercalação das chaves existentes com as novas + bulk load)
+FRACAO_RECONSTRUCAO = 0.1
+
+# Cabeçalho (página 0): mágico, versão, tamanho da página, t, raiz, total de páginas,
+# tipo da chave ('i' = inteiro, 's' = texto) e tamanho da chave em bytes
+FORMATO_CABECALHO = "<8sIIIIIcI"
+
+# Cabeçalho de cada nó: is_leaf, quantidade de chaves
+FORMATO_NO = "<BH"
+TAMANHO_NO = struct.calcsize(FORMATO_NO)
+
+# Formato e tamanho da chave; para texto, o tamanho é o mínimo do espaço de cada chave
+# (construir e as inserções o alargam até a maior chave, em bytes UTF-8)
+TIPOS_CHAVE = {"int": (b"i", 4), "str": (b"s", 12)}
+
+def tamanho_chave_texto(chave: str) -> int:
+    """Bytes ocupados por uma chave de texto (UTF-8)."""
+    return len(chave.encode("utf-8"))
+
+class PaginaBTree:
+    """
+    Nó da B-Tree paginada. Igual ao BTreeNode, mas os filhos são números de página
+    e não objetos, para que cada nó possa ser lido do disco sob demanda.
+    """
+    __slots__ = ("pagina", "is_leaf", "keys", "children")
+
+    def __init__(self, pagina: int, is_leaf: bool):
+        self.pagina = pagina
+        self.is_leaf = is_leaf
+        self.keys = []       # Lista de tuplas (chave, offset). Mantida ordenada.
+        self.children = []   # Lista de números de página dos filhos
+
+    def __repr__(self):
+        return f"PaginaBTree(pagina={self.pagina}, keys={[k[0] for k in self.keys]}, is_leaf={self.is_leaf})"
+
+class BufferPool:
+    """
+    Cache LRU de nós da B-Tree paginada, com capacidade limitada.
+    Nós modificados são marcados como sujos e gravados no disco quando
+    saem do cache ou quando descarregar() é chamado.
+    No modo sem roubo (sem_roubo=True), nós sujos nunca são gravados ao sair do cache:
+    ficam retidos em memória, fora do LRU, até descarregar(). Assim o arquivo da árvore
+    só muda em um checkpoint. Quando os retidos passam de limite_retidos, ao_exceder()
+    é chamado (a árvore troca o arquivo por uma cópia de trabalho) e o pool passa a
+    gravar os nós sujos normalmente (permitir_roubo).
+    """
+
+    def __init__(self, ler_pagina, gravar_pagina, capacidade: int = TAMANHO_BUFFER_PADRAO,
+                 sem_roubo: bool = False, limite_retidos: int = LIMITE_RETIDOS_PADRAO,
+                 ao_exceder=None):
+        self._ler_pagina = ler_pagina
+        self._gravar_pagina = gravar_pagina
+        self.capacidade = max(TAMANHO_BUFFER_MINIMO, capacidade)
+        self.sem_roubo = sem_roubo
+        self.limite_retidos = limite_retidos
+        self._ao_exceder = ao_exceder
+        self._nos: OrderedDict[int, PaginaBTree] = OrderedDict()
+        self._sujos: set[int] = set()
+        self._retidos: dict[int, PaginaBTree] = {}   # nós sujos no modo sem roubo
+        self.acertos = 0
+        self.faltas = 0
+
+    @property
+    def retidos(self) -> int:
+        """Quantidade de nós sujos retidos em memória (modo sem roubo)."""
+        return len(self._retidos)
+
+    def obter(self, pagina: int) -> PaginaBTree:
+        """Retorna o nó da página, lendo-o do disco se não estiver em cache."""
+        no = self._retidos.get(pagina)
+        if no is not None:
+            self.acertos += 1
+            return no
+        no = self._nos.get(pagina)
+        if no is not None:
+            self._nos.move_to_end(pagina)
+            self.acertos += 1
+            return no
+        self.faltas += 1
+        no = self._ler_pagina(pagina)
+        self._guardar(no)
+        return no
+
+    def marcar_sujo(self, no: PaginaBTree):
+        """Registra que o nó foi modificado (ou criado) e precisa ser gravado."""
+        if self.sem_roubo:
+            self._nos.pop(no.pagina, None)
+            self._retidos[no.pagina] = no
+            if len(self._retidos) > self.limite_retidos and self._ao_exceder is not None:
+                self._ao_exceder()
+            return
+        self._sujos.add(no.pagina)
+        self._guardar(no)
+
+    def permitir_roubo(self):
+        """
+        Sai do modo sem roubo: os nós retidos voltam ao LRU como sujos e, daqui em diante,
+        são gravados ao sair do cache (o arquivo aberto já não é o snapshot).
+        """
+        self.sem_roubo = False
+        retidos, self._retidos = self._retidos, {}
+        for pagina in sorted(retidos):
+            self._sujos.add(pagina)
+            self._guardar(retidos[pagina])
+
+    def _guardar(self, no: PaginaBTree):
+        self._nos[no.pagina] = no
+        self._nos.move_to_end(no.pagina)
+        while len(self._nos) > self.capacidade:
+            pagina, antigo = self._nos.popitem(last=False)
+            if pagina in self._sujos:
+                self._gravar_pagina(antigo)
+                self._sujos.discard(pagina)
+
+    def descarregar(self):
+        """Grava no disco todos os nós sujos, mantendo-os em cache."""
+        for pagina in sorted(self._sujos):
+            self._gravar_pagina(self._nos[pagina])
+        self._sujos.clear()
+        retidos, self._retidos = self._retidos, {}
+        for pagina in sorted(retidos):
+            self._gravar_pagina(retidos[pagina])
+            self._guardar(retidos[pagina])
+
+    def limpar(self):
+        """Descarta o cache (os nós sujos devem ter sido descarregados antes)."""
+        self._nos.clear()
+        self._sujos.clear()
+        self._retidos.clear()
+
+class BTreePaginada:
+    """
+    Árvore B armazenada em disco em páginas de tamanho fixo, endereçadas pelo número
+    da página. Só o cabeçalho é lido ao abrir o arquivo; os nós são carregados sob
+    demanda através de um buffer pool LRU de tamanho configurável. Oferece a mesma
+    interface de busca e inserção da BTree em memória.
+    Com sem_roubo=True o arquivo aberto funciona como um snapshot: as alterações ficam
+    em memória e só são gravadas, em um novo arquivo, por salvar_como().
+    """
+
+    def __init__(self, caminho: str, tamanho_buffer: int = TAMANHO_BUFFER_PADRAO, sem_roubo: bool = False):
+        """Abre uma B-Tree paginada existente (lê apenas o cabeçalho)."""
+        self.caminho = caminho
+        self.sem_roubo = sem_roubo
+        self._temporario = False   # True quando o arquivo aberto é uma cópia de trabalho
+        self._nome_base = os.path.basename(caminho)   # prefixo das cópias de trabalho
+        self._abrir(tamanho_buffer)
+
+    def _abrir(self, tamanho_buffer: int):
+        self._arquivo = open(self.caminho, "r+b")
+        try:
+            self._ler_cabecalho()
+        except Exception:
+            self._arquivo.close()
+            raise
+        # Uma cópia de trabalho não é o snapshot: seus nós sujos podem ser gravados nela
+        self.pool = BufferPool(self._ler_pagina, self._gravar_pagina, tamanho_buffer,
+                               self.sem_roubo and not self._temporario,
+                               ao_exceder=self._passar_para_copia)
+
+    def _passar_para_copia(self):
+        """
+        Chamado pelo buffer pool quando os nós retidos (modo sem roubo) passam do limite:
+        o snapshot é copiado para uma cópia de trabalho, que passa a ser o arquivo aberto,
+        e os nós sujos passam a ser gravados nela. O snapshot continua intacto até o
+        checkpoint (salvar_como move a cópia para o novo arquivo; fechar a descarta).
+        """
+        temporario = self._novo_temporario()
+        self._arquivo.close()
+        shutil.copyfile(self.caminho, temporario)
+        self.caminho = temporario
+        self._temporario = True
+        self._arquivo = open(temporario, "r+b")
+        self.pool.permitir_roubo()
+
+    def _novo_temporario(self) -> str:
+        """Cria (vazio) um arquivo para uma cópia de trabalho, na pasta da árvore."""
+        descritor, temporario = tempfile.mkstemp(prefix=self._nome_base + ".",
+                                                 suffix=".tmp", dir=os.path.dirname(self.caminho) or ".")
+        os.close(descritor)
+        return temporario
+
+    #----------------------#
+    #  Criação do arquivo  #
+    #----------------------#
+    @staticmethod
+    def calcular_t(tipo_chave: str, tamanho_pagina: int = TAMANHO_PAGINA_PADRAO,
+                   tamanho_chave: int | None = None) -> int:
+        """
+        Maior grau mínimo t cujo nó cheio (2t-1 chaves, 2t filhos) cabe em uma página.
+        tamanho_chave: espaço de cada chave de texto (padrão: o de TIPOS_CHAVE).
+        """
+        tamanho_chave = BTreePaginada._tamanho_chave(tipo_chave, tamanho_chave)
+        bytes_por_chave = tamanho_chave + 8  # chave + offset
+        t = (tamanho_pagina - TAMANHO_NO + bytes_por_chave) // (2 * bytes_por_chave + 8)
+        if t < 2:
+            raise ValueError(f"Página de {tamanho_pagina} bytes é pequena demais para a B-Tree "
+                             f"(chaves de {tamanho_chave} bytes).")
+        return t
+
+    @staticmethod
+    def _tamanho_chave(tipo_chave: str, tamanho_chave: int | None) -> int:
+        """Espaço de cada chave: o fixo do tipo ou, para texto, ao menos o padrão."""
+        formato_chave, padrao = TIPOS_CHAVE[tipo_chave]
+        if formato_chave != b"s" or tamanho_chave is None:
+            return padrao
+        return max(padrao, tamanho_chave)
+
+    @classmethod
+    def construir(cls, caminho: str, pares_ordenados, tipo_chave: str,
+                  fill_factor: float = 1.0,
+                  tamanho_pagina: int = TAMANHO_PAGINA_PADRAO,
+                  tamanho_buffer: int = TAMANHO_BUFFER_PADRAO,
+                  sem_roubo: bool = False,
+                  tamanho_chave: int | None = None) -> "BTreePaginada":
+        """
+        Cria o arquivo da B-Tree paginada a partir de pares (chave, offset) ordenados,
+        consumidos um a um pelo MontadorEmLote com o grau t que ocupa uma página inteira
+        por nó. Cada nó é gravado na próxima página assim que fica completo (as folhas e
+        os nós internos de baixo para cima; a raiz é a última página), então só a borda
+        direita da árvore fica em memória durante a construção.
+        tamanho_chave: bytes UTF-8 da maior chave de texto (registrado no cabeçalho).
+        Uma chave maior que o espaço não é truncada: levanta ValueError.
+        """
+        t = cls.calcular_t(tipo_chave, tamanho_pagina, tamanho_chave)
+        formato_chave = TIPOS_CHAVE[tipo_chave][0]
+        tamanho_chave = cls._tamanho_chave(tipo_chave, tamanho_chave)
+        with open(caminho, "wb") as f:
+            f.write(b"\x00" * tamanho_pagina)  # reserva a página 0 para o cabeçalho
+            paginas = count(1)
+
+            def gravar(no: PaginaBTree) -> int:
+                no.pagina = next(paginas)
+                f.write(cls._codificar(no, formato_chave, tamanho_chave, tamanho_pagina))
+                return no.pagina
+
+            montador = MontadorEmLote(t, fill_factor, lambda is_leaf: PaginaBTree(0, is_leaf), gravar)
+            for par in pares_ordenados:
+                montador.adicionar(par)
+            raiz = montador.finalizar()
+
+            f.seek(0)
+            f.write(struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO, tamanho_pagina, t, raiz,
+                                next(paginas), formato_chave, tamanho_chave))
+        print(f"📁 B-Tree paginada criada em: {caminho}")
+        return cls(caminho, tamanho_buffer, sem_roubo)
+
+    #---------------------------------#
+    #  Leitura e gravação de páginas  #
+    #---------------------------------#
+    def _ler_cabecalho(self):
+        dados = self._arquivo.read(struct.calcsize(FORMATO_CABECALHO))
+        if len(dados) < struct.calcsize(FORMATO_CABECALHO):
+            raise ValueError(f"Arquivo de B-Tree paginada inválido: {self.caminho}")
+        (magico, versao, self.tamanho_pagina, self.t, self.raiz,
+         self.total_paginas, self.formato_chave, self.tamanho_chave) = struct.unpack(FORMATO_CABECALHO, dados)
+        if magico != MAGICO or versao != VERSAO:
+            raise ValueError(f"Arquivo não é uma B-Tree paginada (versão {VERSAO}): {self.caminho}")
+
+    def _gravar_cabecalho(self):
+        self._arquivo.seek(0)
+        self._arquivo.write(struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO, self.tamanho_pagina, self.t,
+                                        self.raiz, self.total_paginas, self.formato_chave, self.tamanho_chave))
+
+    @staticmethod
+    def _codificar(no: PaginaBTree, formato_chave: bytes, tamanho_chave: int, tamanho_pagina: int) -> bytes:
+        """Serializa um nó em exatamente uma página."""
+        n = len(no.keys)
+        if formato_chave == b"s":
+            chaves = [(chave.encode("utf-8"), offset) for chave, offset in no.keys]
+            for chave, _ in chaves:
+                if len(chave) > tamanho_chave:
+                    raise ValueError(f"Chave de {len(chave)} bytes não cabe na B-Tree "
+                                     f"(até {tamanho_chave} bytes): {chave.decode('utf-8')!r}")
+        else:
+            chaves = no.keys
+        formato_par = "i" if formato_chave == b"i" else f"{tamanho_chave}s"
+        formato = f"<BH{(formato_par + 'q') * n}{len(no.children)}I"
+        valores = [c for par in chaves for c in par]
+        dados = struct.pack(formato, no.is_leaf, n, *valores, *no.children)
+        return dados.ljust(tamanho_pagina, b"\x00")
+
+    def _decodificar(self, pagina: int, dados: bytes) -> PaginaBTree:
+        """Reconstrói o nó a partir dos bytes de uma página."""
+        is_leaf, n = struct.unpack_from(FORMATO_NO, dados, 0)
+        no = PaginaBTree(pagina, bool(is_leaf))
+        formato_par = "i" if self.formato_chave == b"i" else f"{self.tamanho_chave}s"
+        valores = struct.unpack_from(f"<{(formato_par + 'q') * n}", dados, TAMANHO_NO)
+        if self.formato_chave == b"s":
+            no.keys = [(valores[i].rstrip(b"\x00").decode("utf-8"), valores[i + 1]) for i in range(0, 2 * n, 2)]
+        else:
+            no.keys = [(valores[i], valores[i + 1]) for i in range(0, 2 * n, 2)]
+        if not no.is_leaf:
+            inicio_filhos = TAMANHO_NO + struct.calcsize(f"<{(formato_par + 'q') * n}")
+            no.children = list(struct.unpack_from(f"<{n + 1}I", dados, inicio_filhos))
+        return no
+
+    def _ler_pagina(self, pagina: int) -> PaginaBTree:
+        self._arquivo.seek(pagina * self.tamanho_pagina)
+        return self._decodificar(pagina, self._arquivo.read(self.tamanho_pagina))
+
+    def _gravar_pagina(self, no: PaginaBTree):
+        self._arquivo.seek(no.pagina * self.tamanho_pagina)
+        self._arquivo.write(self._codificar(no, self.formato_chave, self.tamanho_chave, self.tamanho_pagina))
+
+    def _novo_no(self, is_leaf: bool) -> PaginaBTree:
+        """Aloca uma nova página no fim do arquivo para um nó."""
+        no = PaginaBTree(self.total_paginas, is_leaf)
+        self.total_paginas += 1
+        self.pool.marcar_sujo(no)
+        return no
+
+    #------------#
+    #  Inserção  #
+    #------------#
+    def _cheio(self, no: PaginaBTree) -> bool:
+        return len(no.keys) == 2 * self.t - 1
+
+    def _maior_que_o_espaco(self, chaves) -> int | None:
+        """Bytes da maior chave de texto que não cabe no espaço atual (None se todas cabem)."""
+        if self.formato_chave != b"s":
+            return None
+        maior = max((tamanho_chave_texto(chave) for chave in chaves), default=0)
+        return maior if maior > self.tamanho_chave else None
+
+    def inserir(self, key, offset: int):
+        """
+        Insere uma nova chave e seu offset associado (mesmo algoritmo da BTree). Uma chave
+        de texto maior que o espaço das chaves reconstrói a árvore com um espaço maior.
+        """
+        maior = self._maior_que_o_espaco((key,))
+        if maior is not None:
+            self._reconstruir_com([(key, offset)], maior)
+            return
+        raiz = self.pool.obter(self.raiz)
+        if self._cheio(raiz):
+            nova_raiz = self._novo_no(False)
+            nova_raiz.children.append(raiz.pagina)
+            self._split_child(nova_raiz, 0, raiz)
+            self.raiz = nova_raiz.pagina
+            self._insert_non_full(nova_raiz, key, offset)
+        else:
+            self._insert_non_full(raiz, key, offset)
+
+    def inserir_lote(self, pares, total_atual: int | None = None):
+        """
+        Insere vários pares (chave, offset) de uma vez. Os pares são ordenados antes:
+        inserções consecutivas percorrem o mesmo caminho da raiz às folhas, que
+        permanece no buffer pool, e as páginas sujas são gravadas uma vez só.
+        total_atual: quantidade de chaves já na árvore; se o lote for grande em relação
+        a ela (FRACAO_RECONSTRUCAO), a árvore é reconstruída por intercalação. Também é
+        reconstruída, com um espaço de chave maior, se alguma chave não couber no atual.
+        """
+        pares = sorted(pares)
+        maior = self._maior_que_o_espaco(chave for chave, _ in pares)
+        if maior is not None or (total_atual is not None and len(pares) >= total_atual * FRACAO_RECONSTRUCAO):
+            self._reconstruir_com(pares, maior)
+            return
+        for key, offset in pares:
+            self.inserir(key, offset)
+
+    def _reconstruir_com(self, pares_ordenados: list, tamanho_chave: int | None = None):
+        """
+        Grava uma nova árvore com as chaves atuais (lidas em ordem pelo scan) intercaladas
+        com as novas, por bulk load, e a coloca no lugar do arquivo atual. A intercalação é
+        consumida à medida que as páginas da nova árvore são gravadas, sem montar a árvore
+        (nem a lista das chaves atuais) em memória. No modo sem roubo
+        o snapshot não é substituído: a nova árvore vira a cópia de trabalho.
+        tamanho_chave: novo espaço das chaves de texto, quando as atuais não bastam.
+        """
+        tipo_chave = next(nome for nome, (formato, _) in TIPOS_CHAVE.items() if formato == self.formato_chave)
+        temporario = self._novo_temporario()
+        nova = BTreePaginada.construir(temporario, heapq.merge(self.scan(), pares_ordenados),
+                                       tipo_chave, tamanho_pagina=self.tamanho_pagina,
+                                       tamanho_buffer=self.pool.capacidade,
+                                       tamanho_chave=max(self.tamanho_chave, tamanho_chave or 0))
+        nova.fechar()
+        # As páginas sujas da árvore antiga já estão na nova: basta descartá-las
+        self.pool.limpar()
+        self._arquivo.close()
+        if not self.sem_roubo:
+            os.replace(temporario, self.caminho)
+        else:
+            if self._temporario:
+                os.remove(self.caminho)
+            self.caminho = temporario
+            self._temporario = True
+        self._abrir(self.pool.capacidade)
+
+    def _insert_non_full(self, no: PaginaBTree, key, offset: int):
+        while True:
+            # Posição após a última chave <= key (busca binária no nó)
+            i = bisect_right(no.keys, key, key=lambda par: par[0])
+            if no.is_leaf:
+                no.keys.insert(i, (key, offset))
+                self.pool.marcar_sujo(no)
+                return
+            filho = self.pool.obter(no.children[i])
+            if self._cheio(filho):
+                self._split_child(no, i, filho)
+                if key > no.keys[i][0]:
+                    i += 1
+                filho = self.pool.obter(no.children[i])
+            no = filho
+
+    def _split_child(self, pai: PaginaBTree, i: int, cheio: PaginaBTree):
+        novo = self._novo_no(cheio.is_leaf)
+        promovida = cheio.keys[self.t - 1]
+        novo.keys = cheio.keys[self.t:]
+        cheio.keys = cheio.keys[:self.t - 1]
+        if not cheio.is_leaf:
+            novo.children = cheio.children[self.t:]
+            cheio.children = cheio.children[:self.t]
+        pai.children.insert(i + 1, novo.pagina)
+        pai.keys.insert(i, promovida)
+        self.pool.marcar_sujo(cheio)
+        self.pool.marcar_sujo(novo)
+        self.pool.marcar_sujo(pai)
+
+    #----------#
+    #  Buscas  #
+    #----------#
+    def scan(self, min_key=None, max_key=None) -> Iterator[tuple]:
+        """
+        Gera os pares (chave, offset) com min_key <= chave <= max_key em ordem crescente
+        de chave, lendo as páginas pelo buffer pool à medida que o gerador avança
+        (None deixa o limite em aberto). Parar após N resultados lê só as páginas deles.
+        """
+        return percorrer_em_ordem(self.pool.obter(self.raiz), self.pool.obter, min_key, max_key)
+
+    def scan_reverso(self, min_key=None, max_key=None) -> Iterator[tuple]:
+        """Como scan, mas em ordem decrescente de chave (começando por max_key)."""
+        return percorrer_em_ordem(self.pool.obter(self.raiz), self.pool.obter, min_key, max_key, reverso=True)
+
+    def buscar(self, key) -> list[int]:
+        """Retorna todos os offsets associados à chave, lendo apenas as páginas necessárias."""
+        return [offset for _, offset in self.scan(key, key)]
+
+    def contar(self, key, limite: int | None = None) -> int:
+        """
+        Quantidade de ocorrências da chave (lê as mesmas páginas que buscar). Com limite, a
+        contagem para ao atingi-lo e só as páginas até ali são lidas.
+        """
+        return self.contar_intervalo(key, key, limite)
+
+    def contar_intervalo(self, min_key, max_key, limite: int | None = None) -> int:
+        """Quantidade de chaves em [min_key, max_key], parando em limite se informado."""
+        return sum(1 for _ in islice(self.scan(min_key, max_key), limite))
+
+    def buscar_intervalo(self, min_key, max_key) -> list[int]:
+        """Retorna os offsets das chaves em [min_key, max_key], em ordem de chave."""
+        return [offset for _, offset in self.scan(min_key, max_key)]
+
+    #----------------#
+    #  Persistência  #
+    #----------------#
+    def salvar(self):
+        """Grava as páginas modificadas e o cabeçalho no disco."""
+        self.pool.descarregar()
+        self._gravar_cabecalho()
+        self._arquivo.flush()
+        print(f"📁 B-Tree paginada salva em: {self.caminho}")
+
+    def salvar_como(self, novo_caminho: str):
+        """
+        Grava a árvore atual (arquivo aberto + nós modificados) em novo_caminho e passa a
+        usá-lo, sem alterar o arquivo anterior. Usado no checkpoint do modo sem roubo.
+        """
+        if novo_caminho != self.caminho:
+            self._arquivo.close()
+            if self._temporario:
+                os.replace(self.caminho, novo_caminho)
+            else:
+                shutil.copyfile(self.caminho, novo_caminho)
+            self.caminho = novo_caminho
+            self._temporario = False
+            self._nome_base = os.path.basename(novo_caminho)
+            self._arquivo = open(novo_caminho, "r+b")
+        self.pool.descarregar()
+        # O novo arquivo é o snapshot: alterações seguintes voltam a ficar retidas
+        self.pool.sem_roubo = self.sem_roubo
+        self._gravar_cabecalho()
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        """
+        Salva as alterações pendentes e fecha o arquivo. No modo sem roubo as alterações
+        não gravadas por salvar_como() são descartadas (o snapshot não é alterado).
+        """
+        if self._arquivo.closed:
+            return
+        if not self.sem_roubo:
+            self.pool.descarregar()
+            self._gravar_cabecalho()
+        self._arquivo.close()
+        self.pool.limpar()
+        if self._temporario:
+            os.remove(self.caminho)
+            self._temporario = False
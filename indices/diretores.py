@@ -0,0 +1,173 @@
+# indices/diretores.py
+
+import bisect
+import heapq
+import math
+import pickle
+from array import array
+from collections import Counter
+
+from indices.palavras import normalizar_palavras
+
+# Fração mínima dos trigramas da consulta que um nome precisa conter para ser sugerido
+SEMELHANCA_MINIMA = 0.5
+
+# Uma lista de trigrama só é consultada por busca binária quando é essa quantidade de vezes
+# maior que o conjunto de candidatos (percorrer uma lista inteira custa bem menos por elemento)
+PROPORCAO_BUSCA_BINARIA = 16
+
+#---------------------------------------#
+#      Normalização dos nomes           #
+#---------------------------------------#
+def normalizar_nome(nome: str) -> str:
+    """
+    Chave de um nome de diretor sem diferenças de caixa, acentos e pontuação
+    ("Pedro Almodóvar" e "pedro  almodovar" -> "pedro almodovar").
+    """
+    return " ".join(normalizar_palavras(nome))
+
+def _trigramas(chave: str) -> set[str]:
+    """Trigramas da chave, com espaços nas bordas para valorizar o início e o fim das palavras."""
+    chave = f" {chave} "
+    return {chave[i:i + 3] for i in range(len(chave) - 2)}
+
+def _contem(ids: array, id_nome: int) -> bool:
+    i = bisect.bisect_left(ids, id_nome)
+    return i < len(ids) and ids[i] == id_nome
+
+#------------------------------#
+#      Índice de diretores     #
+#------------------------------#
+class IndiceDiretores:
+    """
+    Índice dos nomes de diretores (as chaves do índice hash) para buscas sem diferenciar
+    caixa e acentos e para sugestões aproximadas.
+    Cada nome recebe um número; as chaves normalizadas apontam para os números dos nomes
+    (busca exata normalizada em O(1)) e cada trigrama aponta para o array ordenado dos
+    números dos nomes que o contêm. A busca aproximada só conta os candidatos presentes
+    nas listas mais curtas (filtro de prefixo): um nome com pelo menos k dos T trigramas
+    da consulta aparece obrigatoriamente em uma das T - k + 1 listas mais curtas. Nas
+    listas restantes, muito mais longas que o conjunto de candidatos, cada candidato é
+    procurado por busca binária em vez de a lista inteira ser percorrida.
+    """
+
+    def __init__(self):
+        self.nomes: list[str] = []
+        self.por_chave: dict[str, list[int]] = {}
+        self.postings: dict[str, array] = {}
+        self.tamanhos = array("H")   # quantidade de trigramas de cada nome
+
+    def __len__(self):
+        return len(self.nomes)
+
+    #------------------#
+    #      Insere      #
+    #------------------#
+    def inserir(self, nome: str):
+        """Acrescenta um nome de diretor (nomes já presentes são ignorados)."""
+        chave = normalizar_nome(nome)
+        ids = self.por_chave.get(chave)
+        if ids is None:
+            self.por_chave[chave] = ids = []
+        elif any(self.nomes[i] == nome for i in ids):
+            return
+        id_nome = len(self.nomes)
+        self.nomes.append(nome)
+        ids.append(id_nome)
+        trigramas = _trigramas(chave)
+        self.tamanhos.append(min(len(trigramas), 0xFFFF))
+        for trigrama in trigramas:
+            lista = self.postings.get(trigrama)
+            if lista is None:
+                self.postings[trigrama] = lista = array("I")
+            lista.append(id_nome)
+
+    #-----------------#
+    #      Busca      #
+    #-----------------#
+    def buscar_nomes(self, consulta: str) -> list[str]:
+        """Nomes iguais à consulta sem considerar caixa, acentos e pontuação."""
+        return [self.nomes[i] for i in self.por_chave.get(normalizar_nome(consulta), ())]
+
+    def buscar_semelhantes(self, consulta: str, limite: int = 10,
+                           semelhanca_minima: float = SEMELHANCA_MINIMA) -> list[tuple[str, float]]:
+        """
+        Retorna até `limite` pares (nome, semelhança) dos nomes mais parecidos com a consulta,
+        do mais para o menos semelhante. A semelhança (0 a 1) é a média entre a fração dos
+        trigramas da consulta presentes no nome e o coeficiente de Dice dos dois conjuntos,
+        então "kubrick" encontra "Stanley Kubrick" e um nome com erro de digitação ainda
+        encontra o original.
+        """
+        chave = normalizar_nome(consulta)
+        if not chave:
+            return []
+        trigramas = sorted(_trigramas(chave), key=lambda g: len(self.postings.get(g, ())))
+        total = len(trigramas)
+
+        def semelhanca(par):
+            id_nome, comuns = par
+            return (comuns / total + 2 * comuns / (total + self.tamanhos[id_nome])) / 2
+
+        candidatos = self._candidatos(trigramas, max(1, math.ceil(semelhanca_minima * total)))
+        melhores = heapq.nlargest(limite, candidatos, key=semelhanca)
+        return [(self.nomes[id_nome], round(semelhanca((id_nome, comuns)), 3)) for id_nome, comuns in melhores]
+
+    def _candidatos(self, trigramas: list[str], minimo: int) -> list[tuple[int, int]]:
+        """
+        Pares (número do nome, trigramas em comum) dos nomes com pelo menos `minimo` dos
+        trigramas, que chegam ordenados da lista mais curta para a mais longa.
+        """
+        total = len(trigramas)
+        contagem = Counter()
+        for trigrama in trigramas[:total - minimo + 1]:
+            contagem.update(self.postings.get(trigrama, ()))
+        candidatos = set(contagem)
+        restantes = minimo - 1
+        for trigrama in trigramas[total - minimo + 1:]:
+            ids = self.postings.get(trigrama, ())
+            if len(ids) < len(candidatos) * PROPORCAO_BUSCA_BINARIA:
+                contagem.update(candidatos.intersection(ids))
+            else:
+                contagem.update(i for i in candidatos if _contem(ids, i))
+            # Descarta os candidatos que não chegam ao mínimo nem com as listas que faltam
+            restantes -= 1
+            candidatos = {i for i in candidatos if contagem[i] + restantes >= minimo}
+        # Ao final das listas (restantes = 0), só sobram candidatos com o mínimo de trigramas
+        return [(id_nome, contagem[id_nome]) for id_nome in candidatos]
+
+#-----------------------------------------#
+#      Resolver o nome de um diretor      #
+#-----------------------------------------#
+def resolver_diretor(nome: str, hash_diretor: dict[str, list[int]],
+                     indice: IndiceDiretores | None = None) -> list[str]:
+    """
+    Nomes do índice hash que correspondem ao nome informado: o próprio nome, se ele
+    existir exatamente; senão, com o índice de diretores, os nomes iguais a ele sem
+    considerar caixa e acentos ("kubrick" não é resolvido aqui, veja buscar_semelhantes).
+    """
+    if nome in hash_diretor:
+        return [nome]
+    if indice is None:
+        return []
+    return [n for n in indice.buscar_nomes(nome) if n in hash_diretor]
+
+#-------------------------------------------#
+#      Salvar índice de diretores           #
+#-------------------------------------------#
+def salvar_indice_diretores_em_arquivo(indice: IndiceDiretores, caminho: str) -> None:
+    """
+    Salva o índice de diretores (nomes, chaves normalizadas e trigramas) usando pickle.
+    """
+    with open(caminho, "wb") as f:
+        pickle.dump(indice, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"📁 Índice de Diretores salvo em: {caminho}")
+
+#-------------------------------------------#
+#      Carregar índice de diretores         #
+#-------------------------------------------#
+def carregar_indice_diretores_de_arquivo(caminho: str) -> IndiceDiretores:
+    """
+    Carrega o índice de diretores de um arquivo usando pickle.
+    """
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
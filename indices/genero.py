@@ -0,0 +1,65 @@
+# indices/genero.py
+
+import pickle
+from collections import defaultdict
+from src.filme import Filme
+from src.binary_store import obter_store
+
+#-------------------------------------#
+#      Chaves de gênero de um filme   #
+#-------------------------------------#
+def chaves_de_genero(genero: str) -> list[str]:
+    """
+    Retorna as chaves de índice de um campo de gênero ("Drama,Comedy" -> ["drama", "comedy"]),
+    com a mesma normalização usada pela busca sequencial por gênero.
+    """
+    return list(dict.fromkeys(genero.lower().split(',')))
+
+#------------------------------------#
+#      Construir índice de gênero    #
+#------------------------------------#
+def construir_indice_genero(filmes: list[Filme]) -> dict[str, list[int]]:
+    """
+    Constrói um índice invertido que mapeia cada gênero (em minúsculas)
+    para a lista de offsets dos filmes desse gênero no arquivo binário.
+    """
+    indice_genero = defaultdict(list)
+    for i, filme in enumerate(filmes):
+        posicao = i * Filme.TAMANHO_REGISTRO
+        for chave in chaves_de_genero(filme.genero):
+            indice_genero[chave].append(posicao)
+    return indice_genero
+
+#---------------------------------------#
+#      Salvar índice de gênero          #
+#---------------------------------------#
+def salvar_indice_genero_em_arquivo(indice_genero: dict[str, list[int]], caminho: str) -> None:
+    """
+    Salva o índice de gênero (dicionário) em um arquivo binário usando pickle.
+    """
+    with open(caminho, "wb") as f:
+        pickle.dump(indice_genero, f)
+    print(f"📁 Índice de Gênero salvo em: {caminho}")
+
+#---------------------------------------#
+#      Carregar índice de gênero        #
+#---------------------------------------#
+def carregar_indice_genero_de_arquivo(caminho: str) -> dict[str, list[int]]:
+    """
+    Carrega o índice de gênero (dicionário) de um arquivo binário usando pickle.
+    """
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
+
+#----------------------------------#
+#      Buscar por gênero           #
+#----------------------------------#
+def buscar_filmes_por_genero_indice(genero: str, indice_genero: dict[str, list[int]], caminho_bin: str = "data/filmes.bin") -> list[Filme]:
+    """
+    Busca filmes pelo gênero usando o índice invertido.
+    Retorna uma lista de objetos Filme.
+    """
+    offsets = indice_genero.get(genero.lower())
+    if not offsets:
+        return []
+    return obter_store(caminho_bin).fetch(offsets)
@@ -3,7 +3,8 @@
 import pickle
 from collections import defaultdict
 from src.filme import Filme #
-from src.binary_store import ler_filme_por_offset
+from src.binary_store import obter_store
+from indices.diretores import IndiceDiretores, resolver_diretor
 
 #--------------------------------#
 #      Construir índice hash     #
@@ -43,17 +44,15 @@ def carregar_hash_de_arquivo(caminho: str) -> dict[str, list[int]]:
 #----------------------------------#
 #      Buscar por diretor          #
 #----------------------------------#
-def buscar_filmes_por_diretor(nome_diretor: str, hash_diretor: dict[str, list[int]], caminho_bin: str = "data/filmes.bin") -> list[Filme]:
+def buscar_filmes_por_diretor(nome_diretor: str, hash_diretor: dict[str, list[int]], caminho_bin: str = "data/filmes.bin",
+                              indice_diretores: IndiceDiretores | None = None) -> list[Filme]:
     """
     Busca filmes pelo nome do diretor usando o índice hash.
+    Com o índice de diretores, o nome também é encontrado sem considerar caixa e acentos.
     Retorna uma lista de objetos Filme.
     """
-    if nome_diretor not in hash_diretor:
+    nomes = resolver_diretor(nome_diretor, hash_diretor, indice_diretores)
+    if not nomes:
         return []
 
-    filmes = []
-    for offset in hash_diretor[nome_diretor]:
-        filme = ler_filme_por_offset(offset, caminho_bin)
-        if filme:
-            filmes.append(filme)
-    return filmes
+    return obter_store(caminho_bin).fetch([offset for nome in nomes for offset in hash_diretor[nome]])
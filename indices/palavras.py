@@ -0,0 +1,232 @@
+# indices/palavras.py
+
+import bisect
+import pickle
+import re
+import unicodedata
+
+from src.filme import Filme
+from src.binary_store import obter_store
+
+# Tamanho dos n-gramas usados para achar palavras que contêm um trecho
+TAMANHO_NGRAMA = 3
+
+# Qualidade da correspondência entre uma palavra da consulta e uma palavra do título
+PALAVRA_EXATA = 3
+PREFIXO_DE_PALAVRA = 2
+TRECHO_DE_PALAVRA = 1
+
+_PADRAO_PALAVRA = re.compile(r"\w+")
+
+#--------------------------------------#
+#      Normalização das palavras       #
+#--------------------------------------#
+def normalizar_palavras(texto: str) -> list[str]:
+    """
+    Divide um texto nas palavras usadas pelo índice: minúsculas, sem acentos e separadas
+    por espaços ou pontuação ("O Poderoso Chefão" -> ["o", "poderoso", "chefao"]).
+    """
+    texto = texto.casefold()
+    if not texto.isascii():
+        decomposto = unicodedata.normalize("NFKD", texto)
+        texto = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return _PADRAO_PALAVRA.findall(texto)
+
+def _ngramas(palavra: str) -> set[str]:
+    return {palavra[i:i + TAMANHO_NGRAMA] for i in range(len(palavra) - TAMANHO_NGRAMA + 1)}
+
+def _qualidade(termo: str, palavra: str) -> int:
+    """Qualidade da correspondência do termo da consulta com uma palavra (0 = não corresponde)."""
+    if palavra == termo:
+        return PALAVRA_EXATA
+    if palavra.startswith(termo):
+        return PREFIXO_DE_PALAVRA
+    if len(termo) >= TAMANHO_NGRAMA and termo in palavra:
+        return TRECHO_DE_PALAVRA
+    return 0
+
+def _contem(offsets: list[int], offset: int) -> bool:
+    i = bisect.bisect_left(offsets, offset)
+    return i < len(offsets) and offsets[i] == offset
+
+#-----------------------------#
+#      Pontuar um título      #
+#-----------------------------#
+def pontuar_titulo(consulta: str, titulo: str) -> tuple[int, int] | None:
+    """
+    Pontua um título para a consulta, com as mesmas regras do índice: cada palavra da
+    consulta precisa corresponder a uma palavra do título, como palavra inteira, prefixo
+    ou (com pelo menos TAMANHO_NGRAMA letras) trecho. Retorna (soma das qualidades,
+    quantidade de palavras do título), ou None se o título não corresponde à consulta.
+    Usado para filtrar registros lidos do disco e ordenar resultados por relevância.
+    """
+    palavras = normalizar_palavras(titulo)
+    pontos = 0
+    for termo in dict.fromkeys(normalizar_palavras(consulta)):
+        melhor = max((_qualidade(termo, palavra) for palavra in palavras), default=0)
+        if not melhor:
+            return None
+        pontos += melhor
+    return pontos, len(palavras)
+
+def chave_de_relevancia(consulta: str):
+    """Chave de ordenação de filmes pela relevância do título (mais relevantes primeiro)."""
+    def chave(filme: Filme):
+        pontos, palavras = pontuar_titulo(consulta, filme.titulo) or (0, 0)
+        return -pontos, palavras, filme.titulo.lower()
+    return chave
+
+#----------------------------#
+#      Índice de palavras    #
+#----------------------------#
+class IndicePalavras:
+    """
+    Índice invertido das palavras dos títulos: cada palavra normalizada aponta para a
+    lista de offsets dos filmes cujo título a contém. Encontra "godfather" em
+    "The Godfather", o que a Trie (prefixo do título inteiro) não faz.
+    Os termos da consulta também casam com prefixos de palavras (pelo vocabulário
+    ordenado) e, com pelo menos TAMANHO_NGRAMA letras, com trechos de palavras: o mapa de
+    n-gramas leva de cada trigrama às palavras que o contêm, então o trecho é procurado
+    só entre as palavras que têm todos os seus trigramas. Sem n-gramas (com_ngramas=False),
+    os trechos são procurados em todo o vocabulário.
+    As listas de offsets ficam em ordem crescente, já que os registros são sempre
+    acrescentados ao final de filmes.bin.
+    """
+
+    def __init__(self, com_ngramas: bool = True):
+        self.postings: dict[str, list[int]] = {}
+        self.palavras_por_titulo: dict[int, int] = {}   # offset -> quantidade de palavras do título
+        self.ngramas: dict[str, set[str]] | None = {} if com_ngramas else None
+        self._vocabulario = None   # palavras em ordem, refeitas na primeira busca após uma inserção
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["_vocabulario"] = None
+        return estado
+
+    def __len__(self):
+        return len(self.palavras_por_titulo)
+
+    #------------------#
+    #      Insere      #
+    #------------------#
+    def inserir(self, titulo: str, offset: int):
+        palavras = normalizar_palavras(titulo)
+        self.palavras_por_titulo[offset] = len(palavras)
+        for palavra in dict.fromkeys(palavras):
+            offsets = self.postings.get(palavra)
+            if offsets is None:
+                self.postings[palavra] = offsets = []
+                self._vocabulario = None
+                if self.ngramas is not None:
+                    for ngrama in _ngramas(palavra):
+                        self.ngramas.setdefault(ngrama, set()).add(palavra)
+            offsets.append(offset)
+
+    #-----------------#
+    #      Busca      #
+    #-----------------#
+    def _palavras_do_termo(self, termo: str) -> dict[str, int]:
+        """Palavras do vocabulário que correspondem ao termo, com a qualidade de cada uma."""
+        if self._vocabulario is None:
+            self._vocabulario = sorted(self.postings)
+        vocabulario = self._vocabulario
+        encontradas = {}
+        i = bisect.bisect_left(vocabulario, termo)
+        while i < len(vocabulario) and vocabulario[i].startswith(termo):
+            encontradas[vocabulario[i]] = _qualidade(termo, vocabulario[i])
+            i += 1
+        if len(termo) >= TAMANHO_NGRAMA:
+            if self.ngramas is None:
+                candidatas = self.postings
+            else:
+                conjuntos = sorted((self.ngramas.get(g, set()) for g in _ngramas(termo)), key=len)
+                candidatas = set.intersection(*conjuntos)
+            for palavra in candidatas:
+                if palavra not in encontradas and termo in palavra:
+                    encontradas[palavra] = TRECHO_DE_PALAVRA
+        return encontradas
+
+    def _tamanho(self, palavras: dict[str, int]) -> int:
+        return sum(len(self.postings[palavra]) for palavra in palavras)
+
+    def buscar_pontuado(self, consulta: str) -> list[tuple[int, int]]:
+        """
+        Retorna pares (offset, pontos) dos títulos que correspondem a todas as palavras da
+        consulta, do mais relevante para o menos relevante (mais pontos, depois títulos
+        com menos palavras). As listas dos termos são intersectadas a partir do termo
+        mais seletivo; quando os candidatos são poucos, a presença de cada um nas listas
+        seguintes é conferida por busca binária, sem percorrê-las.
+        """
+        termos = [self._palavras_do_termo(t) for t in dict.fromkeys(normalizar_palavras(consulta))]
+        if not termos:
+            return []
+        termos.sort(key=self._tamanho)
+
+        pontos = None
+        for palavras in termos:
+            atual = {}
+            for palavra, qualidade in palavras.items():
+                offsets = self.postings[palavra]
+                if pontos is None:
+                    alvos = offsets
+                elif len(pontos) * 8 < len(offsets):
+                    alvos = [o for o in pontos if _contem(offsets, o)]
+                else:
+                    alvos = [o for o in offsets if o in pontos]
+                for offset in alvos:
+                    if atual.get(offset, 0) < qualidade:
+                        atual[offset] = qualidade
+            pontos = atual if pontos is None else {o: pontos[o] + q for o, q in atual.items()}
+            if not pontos:
+                return []
+
+        ordenados = sorted(pontos.items(), key=lambda par: (-par[1], self.palavras_por_titulo.get(par[0], 0), par[0]))
+        return ordenados
+
+    def buscar(self, consulta: str) -> list[int]:
+        """Offsets dos títulos que correspondem à consulta, em ordem de relevância."""
+        return [offset for offset, _ in self.buscar_pontuado(consulta)]
+
+    def contar(self, consulta: str) -> int:
+        """
+        Estimativa (limite superior) da quantidade de resultados, sem intersectar as listas:
+        o tamanho das listas do termo mais seletivo.
+        """
+        termos = [self._palavras_do_termo(t) for t in dict.fromkeys(normalizar_palavras(consulta))]
+        return min((self._tamanho(palavras) for palavras in termos), default=0)
+
+#----------------------------------------#
+#      Salvar índice de palavras         #
+#----------------------------------------#
+def salvar_indice_palavras_em_arquivo(indice: IndicePalavras, caminho: str) -> None:
+    """
+    Salva o índice de palavras (listas de offsets e n-gramas) em um arquivo usando pickle.
+    """
+    with open(caminho, "wb") as f:
+        pickle.dump(indice, f, protocol=pickle.HIGHEST_PROTOCOL)
+    print(f"📁 Índice de Palavras salvo em: {caminho}")
+
+#----------------------------------------#
+#      Carregar índice de palavras       #
+#----------------------------------------#
+def carregar_indice_palavras_de_arquivo(caminho: str) -> IndicePalavras:
+    """
+    Carrega o índice de palavras de um arquivo usando pickle.
+    """
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
+
+#-----------------------------------#
+#      Buscar por palavras          #
+#-----------------------------------#
+def buscar_filmes_por_palavras_indice(consulta: str, indice: IndicePalavras,
+                                      caminho_bin: str = "data/filmes.bin") -> list[Filme]:
+    """
+    Busca filmes pelas palavras do título usando o índice de palavras.
+    Retorna uma lista de objetos Filme, do mais relevante para o menos relevante.
+    """
+    offsets = indice.buscar(consulta)
+    if not offsets:
+        return []
+    return obter_store(caminho_bin).fetch(offsets)
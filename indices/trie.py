@@ -1,11 +1,8 @@
 # trie.py
 
 import pickle
-import struct
 from src.filme import Filme
-
-# constantes
-TAMANHO_REGISTRO = 236
+from src.binary_store import obter_store
 
 class TrieNode:
     def __init__(self):
@@ -73,21 +70,4 @@ def carregar_trie_de_arquivo(caminho: str) -> Trie:
 #-----------------------------#
 def buscar_titulos_por_prefixo(trie: Trie, prefixo: str, bin_path: str = "data/filmes.bin") -> list[Filme]:
     offsets = trie.buscar(prefixo)
-    filmes = []
-
-    with open(bin_path, "rb") as f:
-        for offset in offsets:
-            f.seek(offset)
-            bytes_lidos = f.read(TAMANHO_REGISTRO)
-            if not bytes_lidos:
-                continue
-            id_b, titulo_b, ano, genero_b, diretor_b = struct.unpack("10s100si20s100s", bytes_lidos)
-            filme = Filme(
-                id_b.decode("utf-8").rstrip("\x00"),
-                titulo_b.decode("utf-8").rstrip("\x00"),
-                ano,
-                genero_b.decode("utf-8").rstrip("\x00"),
-                diretor_b.decode("utf-8").rstrip("\x00")
-            )
-            filmes.append(filme)
-    return filmes
\ No newline at end of file
+    return obter_store(bin_path).fetch(offsets)
@@ -0,0 +1,372 @@
+# indices/trie_compacta.py
+
+import mmap
+import os
+import struct
+from array import array
+from collections import deque
+
+MAGICO = b"SIXTRIE1"
+
+# Cabeçalho: mágico, quantidade de nós, tamanho do bloco de rótulos, quantidade de offsets
+FORMATO_CABECALHO = "<8sqqq"
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+
+# Cada nó ocupa 6 inteiros no array plano:
+# início do rótulo, tamanho do rótulo, primeiro filho, quantidade de filhos,
+# início e fim (exclusivo) dos offsets da subárvore
+CAMPOS_NO = 6
+
+class NoRadix:
+    """
+    Nó da árvore radix usada durante a construção. Cadeias de nós com um único
+    filho são fundidas em um rótulo de vários bytes.
+    """
+    __slots__ = ("rotulo", "filhos", "offsets")
+
+    def __init__(self, rotulo: bytes = b""):
+        self.rotulo = rotulo
+        self.filhos = {}   # primeiro byte do rótulo do filho -> NoRadix
+        self.offsets = []  # offsets dos títulos que terminam neste nó
+
+def _prefixo_comum(a: bytes, b: bytes) -> int:
+    """Tamanho do maior prefixo comum entre dois rótulos."""
+    limite = min(len(a), len(b))
+    i = 0
+    while i < limite and a[i] == b[i]:
+        i += 1
+    return i
+
+class TrieCompacta:
+    """
+    Índice de prefixos de títulos com a mesma interface da Trie (inserir/buscar).
+    Os títulos (em minúsculas, UTF-8) ficam em uma árvore radix. Ao salvar, a árvore é
+    achatada em arrays: nós, rótulos e offsets, estes últimos em ordem de percurso, de
+    modo que os offsets de uma subárvore formam uma faixa contígua. O arquivo salvo é
+    mapeado em memória ao carregar, sem pickle.
+    Inserções feitas depois do carregamento ficam em uma radix em memória (delta) e são
+    incorporadas ao arquivo no próximo salvamento.
+    """
+
+    def __init__(self):
+        self._delta = NoRadix()
+        self._arquivo = None
+        self._mmap = None
+        self._visao = None
+        self._nos = None        # memoryview 'q' com CAMPOS_NO inteiros por nó
+        self._postings = None   # memoryview 'q' com os offsets
+        self._rotulos = None    # memoryview dos bytes dos rótulos
+
+    #------------------#
+    #      Insere      #
+    #------------------#
+    def inserir(self, titulo: str, offset: int):
+        self._inserir_chave(titulo.lower().encode("utf-8"), offset)
+
+    def _inserir_chave(self, resto: bytes, offset: int):
+        """Insere uma chave já normalizada (minúsculas, UTF-8) na radix em memória."""
+        no = self._delta
+        while resto:
+            filho = no.filhos.get(resto[0])
+            if filho is None:
+                filho = NoRadix(resto)
+                no.filhos[resto[0]] = filho
+                no = filho
+                break
+            comum = _prefixo_comum(filho.rotulo, resto)
+            if comum < len(filho.rotulo):
+                # Divide o rótulo do filho no ponto em que os títulos divergem
+                meio = NoRadix(filho.rotulo[:comum])
+                filho.rotulo = filho.rotulo[comum:]
+                meio.filhos[filho.rotulo[0]] = filho
+                no.filhos[resto[0]] = meio
+                filho = meio
+            no = filho
+            resto = resto[comum:]
+        no.offsets.append(offset)
+
+    #-----------------#
+    #      Busca      #
+    #-----------------#
+    def buscar(self, prefixo: str) -> list[int]:
+        chave = prefixo.lower().encode("utf-8")
+        offsets = []
+        no = self._buscar_no_base(chave)
+        if no is not None:
+            inicio, fim = self._nos[no * CAMPOS_NO + 4], self._nos[no * CAMPOS_NO + 5]
+            offsets.extend(self._postings[inicio:fim])
+        no_delta = self._buscar_no_delta(chave)
+        if no_delta is not None:
+            offsets.extend(offset for _, offset in self._percorrer_radix(no_delta, b""))
+        return offsets
+
+    def contar(self, prefixo: str) -> int:
+        """Quantidade de títulos com o prefixo (O(tamanho do prefixo) na parte achatada)."""
+        chave = prefixo.lower().encode("utf-8")
+        total = 0
+        no = self._buscar_no_base(chave)
+        if no is not None:
+            total += self._nos[no * CAMPOS_NO + 5] - self._nos[no * CAMPOS_NO + 4]
+        no_delta = self._buscar_no_delta(chave)
+        if no_delta is not None:
+            total += sum(1 for _ in self._percorrer_radix(no_delta, b""))
+        return total
+
+    def _buscar_no_delta(self, chave: bytes) -> NoRadix | None:
+        """Nó da radix em memória cuja subárvore contém todos os títulos com o prefixo."""
+        no = self._delta
+        while chave:
+            filho = no.filhos.get(chave[0])
+            if filho is None:
+                return None
+            if chave.startswith(filho.rotulo):
+                chave = chave[len(filho.rotulo):]
+            elif filho.rotulo.startswith(chave):
+                chave = b""
+            else:
+                return None
+            no = filho
+        return no
+
+    def _buscar_no_base(self, chave: bytes) -> int | None:
+        """Índice do nó da parte achatada cuja subárvore contém o prefixo."""
+        if self._nos is None:
+            return None
+        nos, rotulos = self._nos, self._rotulos
+        no = 0
+        while chave:
+            base = no * CAMPOS_NO
+            primeiro, quantidade = nos[base + 2], nos[base + 3]
+            # Os filhos estão ordenados pelo primeiro byte do rótulo: busca binária
+            baixo, alto = primeiro, primeiro + quantidade
+            while baixo < alto:
+                meio = (baixo + alto) // 2
+                if rotulos[nos[meio * CAMPOS_NO]] < chave[0]:
+                    baixo = meio + 1
+                else:
+                    alto = meio
+            if baixo >= primeiro + quantidade or rotulos[nos[baixo * CAMPOS_NO]] != chave[0]:
+                return None
+            inicio, tamanho = nos[baixo * CAMPOS_NO], nos[baixo * CAMPOS_NO + 1]
+            rotulo = bytes(rotulos[inicio:inicio + tamanho])
+            if chave.startswith(rotulo):
+                chave = chave[tamanho:]
+            elif rotulo.startswith(chave):
+                chave = b""
+            else:
+                return None
+            no = baixo
+        return no
+
+    #--------------------#
+    #      Percurso      #
+    #--------------------#
+    @staticmethod
+    def _percorrer_radix(no: NoRadix, prefixo: bytes):
+        """Gera (chave, offset) da radix em memória em ordem lexicográfica."""
+        pilha = [(no, prefixo + no.rotulo)]
+        while pilha:
+            atual, chave = pilha.pop()
+            for offset in atual.offsets:
+                yield chave, offset
+            for primeiro in sorted(atual.filhos, reverse=True):
+                filho = atual.filhos[primeiro]
+                pilha.append((filho, chave + filho.rotulo))
+
+    #----------------------------------#
+    #      Intercalação base + delta     #
+    #----------------------------------#
+    # Um ponto da árvore é (nó, bytes do rótulo do nó já percorridos): no meio de um rótulo
+    # ou, com o rótulo inteiro percorrido, no próprio nó. Os pontos da parte achatada usam
+    # o índice do nó; os do delta, o NoRadix.
+
+    def _tamanho_rotulo_base(self, no: int) -> int:
+        return self._nos[no * CAMPOS_NO + 1]
+
+    def _arestas_base(self, ponto) -> list[tuple[bytes, int]]:
+        """Arestas (rótulo restante, nó de destino) que saem de um ponto da parte achatada."""
+        if ponto is None:
+            return []
+        nos, rotulos = self._nos, self._rotulos
+        no, percorridos = ponto
+        inicio, tamanho = nos[no * CAMPOS_NO], nos[no * CAMPOS_NO + 1]
+        if percorridos < tamanho:
+            return [(bytes(rotulos[inicio + percorridos:inicio + tamanho]), no)]
+        primeiro, quantidade = nos[no * CAMPOS_NO + 2], nos[no * CAMPOS_NO + 3]
+        arestas = []
+        for filho in range(primeiro, primeiro + quantidade):
+            inicio, tamanho = nos[filho * CAMPOS_NO], nos[filho * CAMPOS_NO + 1]
+            arestas.append((bytes(rotulos[inicio:inicio + tamanho]), filho))
+        return arestas
+
+    def _proprios_base(self, ponto, destino: array):
+        """Acrescenta a destino os offsets que terminam no ponto da parte achatada."""
+        if ponto is None or ponto[1] < self._tamanho_rotulo_base(ponto[0]):
+            return
+        nos = self._nos
+        base = ponto[0] * CAMPOS_NO
+        # Os offsets próprios do nó vêm antes dos de qualquer filho na faixa da subárvore
+        fim_proprios = nos[base + 5]
+        if nos[base + 3]:
+            fim_proprios = nos[nos[base + 2] * CAMPOS_NO + 4]
+        destino.frombytes(self._postings[nos[base + 4]:fim_proprios].tobytes())
+
+    def _total_base(self, ponto) -> int:
+        """Quantidade de offsets abaixo do ponto da parte achatada."""
+        if ponto is None:
+            return 0
+        base = ponto[0] * CAMPOS_NO
+        return self._nos[base + 5] - self._nos[base + 4]
+
+    @staticmethod
+    def _arestas_delta(ponto) -> list[tuple[bytes, NoRadix]]:
+        """Arestas (rótulo restante, nó de destino) que saem de um ponto do delta."""
+        if ponto is None:
+            return []
+        no, percorridos = ponto
+        if percorridos < len(no.rotulo):
+            return [(no.rotulo[percorridos:], no)]
+        return [(no.filhos[primeiro].rotulo, no.filhos[primeiro]) for primeiro in sorted(no.filhos)]
+
+    def _totais_delta(self) -> dict[int, int]:
+        """Quantidade de offsets na subárvore de cada nó do delta (por id do nó)."""
+        totais = {}
+        pilha = [(self._delta, False)]
+        while pilha:
+            no, saindo = pilha.pop()
+            if saindo:
+                totais[id(no)] = len(no.offsets) + sum(totais[id(filho)] for filho in no.filhos.values())
+                continue
+            pilha.append((no, True))
+            pilha.extend((filho, False) for filho in no.filhos.values())
+        return totais
+
+    #----------------------------#
+    #      Achatar / salvar      #
+    #----------------------------#
+    def salvar(self, caminho: str):
+        """
+        Achata a radix (parte carregada + delta) e grava o arquivo. As duas árvores são
+        intercaladas em uma única passada em largura, direto nos arrays planos: a parte
+        carregada é lida do arquivo mapeado, sem ser reconstruída como NoRadix, e um
+        rótulo só é dividido onde os títulos da base e do delta divergem. A faixa de
+        offsets de cada nó é conhecida pelas quantidades das subárvores (na base, pela
+        própria faixa; no delta, contadas antes), então os offsets são gravados direto na
+        posição da ordem de percurso. O arquivo é escrito em um temporário e substituído
+        de forma atômica; depois disso a trie passa a usar o novo arquivo mapeado e o
+        delta é esvaziado.
+        """
+        totais_delta = self._totais_delta()
+        total_delta = lambda ponto: 0 if ponto is None else totais_delta[id(ponto[0])]
+        raiz_base = (0, 0) if self._nos is not None else None
+        raiz_delta = (self._delta, 0)
+        total = self._total_base(raiz_base) + total_delta(raiz_delta)
+
+        nos = array("q")
+        rotulos = bytearray()
+        postings = array("q", bytes(8 * total))
+        # (ponto na base, ponto no delta, rótulo, faixa de offsets da subárvore)
+        fila = deque([(raiz_base, raiz_delta, b"", 0, total)])
+        proximo_indice = 1
+        while fila:
+            ponto_base, ponto_delta, rotulo, inicio_sub, fim_sub = fila.popleft()
+
+            proprios = array("q")
+            self._proprios_base(ponto_base, proprios)
+            if ponto_delta is not None and ponto_delta[1] == len(ponto_delta[0].rotulo):
+                proprios.extend(ponto_delta[0].offsets)
+            postings[inicio_sub:inicio_sub + len(proprios)] = proprios
+
+            # Filhos: as arestas dos dois lados, casadas pelo primeiro byte do rótulo
+            arestas = {}
+            for restante, no in self._arestas_base(ponto_base):
+                arestas[restante[0]] = [restante, no, None, None]
+            for restante, no in self._arestas_delta(ponto_delta):
+                arestas.setdefault(restante[0], [None, None, None, None])[2:] = [restante, no]
+
+            inicio_filho = inicio_sub + len(proprios)
+            for primeiro in sorted(arestas):
+                restante_base, no_base, restante_delta, no_delta = arestas[primeiro]
+                if restante_delta is None:
+                    filho_rotulo, filho_delta = restante_base, None
+                    filho_base = (no_base, self._tamanho_rotulo_base(no_base))
+                elif restante_base is None:
+                    filho_rotulo, filho_base = restante_delta, None
+                    filho_delta = (no_delta, len(no_delta.rotulo))
+                else:
+                    comum = _prefixo_comum(restante_base, restante_delta)
+                    filho_rotulo = restante_base[:comum]
+                    filho_base = (no_base, self._tamanho_rotulo_base(no_base) - len(restante_base) + comum)
+                    filho_delta = (no_delta, len(no_delta.rotulo) - len(restante_delta) + comum)
+                fim_filho = inicio_filho + self._total_base(filho_base) + total_delta(filho_delta)
+                fila.append((filho_base, filho_delta, filho_rotulo, inicio_filho, fim_filho))
+                inicio_filho = fim_filho
+
+            nos.extend((len(rotulos), len(rotulo), proximo_indice, len(arestas), inicio_sub, fim_sub))
+            rotulos += rotulo
+            proximo_indice += len(arestas)
+
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            f.write(struct.pack(FORMATO_CABECALHO, MAGICO, len(nos) // CAMPOS_NO, len(rotulos), len(postings)))
+            nos.tofile(f)
+            postings.tofile(f)
+            f.write(rotulos)
+        self.fechar()
+        os.replace(temporario, caminho)
+        self._mapear(caminho)
+        self._delta = NoRadix()
+
+    #---------------------------#
+    #      Carregar (mmap)      #
+    #---------------------------#
+    @classmethod
+    def carregar(cls, caminho: str) -> "TrieCompacta":
+        trie = cls()
+        trie._mapear(caminho)
+        return trie
+
+    def _mapear(self, caminho: str):
+        arquivo = open(caminho, "rb")
+        try:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            arquivo.close()
+            raise ValueError(f"Arquivo de trie vazio: {caminho}")
+        magico, n_nos, tam_rotulos, n_postings = struct.unpack_from(FORMATO_CABECALHO, mapa, 0)
+        if magico != MAGICO:
+            mapa.close()
+            arquivo.close()
+            raise ValueError(f"Arquivo não é uma trie compacta: {caminho}")
+
+        visao = memoryview(mapa)
+        inicio_nos = TAMANHO_CABECALHO
+        inicio_postings = inicio_nos + 8 * CAMPOS_NO * n_nos
+        inicio_rotulos = inicio_postings + 8 * n_postings
+        self._arquivo, self._mmap, self._visao = arquivo, mapa, visao
+        self._nos = visao[inicio_nos:inicio_postings].cast("q")
+        self._postings = visao[inicio_postings:inicio_rotulos].cast("q")
+        self._rotulos = visao[inicio_rotulos:inicio_rotulos + tam_rotulos]
+
+    def fechar(self):
+        """Libera o mapeamento do arquivo (as entradas do delta são mantidas)."""
+        for visao in (self._nos, self._postings, self._rotulos, self._visao):
+            if visao is not None:
+                visao.release()
+        self._nos = self._postings = self._rotulos = self._visao = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+#-------------------------------------#
+#      Salva/carrega trie compacta    #
+#-------------------------------------#
+def salvar_trie_compacta(trie: TrieCompacta, caminho: str):
+    trie.salvar(caminho)
+    print(f"📁 TRIE compacta salva em: {caminho}")
+
+def carregar_trie_compacta(caminho: str) -> TrieCompacta:
+    return TrieCompacta.carregar(caminho)
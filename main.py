@@ -1,17 +1,22 @@
 # main.py
 
+import argparse
 from pathlib import Path
 import sys
+import time
 
-# Importa funções do extrator que são usadas para a extração inicial dos TSVs
-from src.extrator import (
-    carregar_nome_diretores,
-    carregar_diretores_por_titulo,
-    extrair_filmes
-)
+# Instante de início, usado para medir o tempo até o primeiro prompt e o primeiro resultado
+INICIO = time.perf_counter()
+
+# Importa a extração em etapas (sequencial ou paralela), usada para a extração inicial dos TSVs
+from src.extrator import extrair_filmes_em_etapas
+from src.extrator_paralelo import extrair_filmes_paralelo
 
 # Importa funções do binary_store para salvar o binário inicial
-from src.binary_store import salvar_filmes_binario, ler_filmes_binario # ler_filmes_binario pode ser útil aqui
+from src.binary_store import (salvar_filmes_binario, remover_binario, configurar_cache_registros,
+                              FORMATO_FIXO, FORMATO_COMPACTO, FORMATO_BLOCOS, FORMATO_PADRAO)
+from src.formato_blocos import COMPRESSORES
+from src.cache_registros import CAPACIDADE_REGISTROS, POLITICAS
 
 # Importa o novo IndexBuilder, que gerencia todos os índices
 from src.index_builder import IndexBuilder
@@ -19,7 +24,39 @@ from src.index_builder import IndexBuilder
 # Importa a nova interface de linha de comando
 from src.cli import menu_principal
 
-def main():
+# Teto de memória (MB) para a extração inicial dos TSVs e para a construção dos índices
+TETO_MEMORIA_MB = 4096
+
+# Quantidade de filmes extraídos quando nem --limite nem --completo são informados
+LIMITE_PADRAO = 1000
+
+def ler_argumentos(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="SixChairs — catálogo local de filmes")
+    parser.add_argument("--paralelo", action="store_true",
+                        help="extrai os TSVs em vários processos na construção inicial")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="número de processos da extração paralela (padrão: núcleos da CPU)")
+    parser.add_argument("--limite", type=int, default=LIMITE_PADRAO,
+                        help=f"quantidade máxima de filmes extraídos (padrão: {LIMITE_PADRAO})")
+    parser.add_argument("--completo", action="store_true",
+                        help="extrai o catálogo completo, sem limite de filmes")
+    parser.add_argument("--memoria-mb", type=float, default=TETO_MEMORIA_MB,
+                        help=f"teto de memória em MB da extração e orçamento para ordenar as chaves das B-Trees (padrão: {TETO_MEMORIA_MB})")
+    parser.add_argument("--formato", choices=(FORMATO_COMPACTO, FORMATO_FIXO, FORMATO_BLOCOS), default=FORMATO_PADRAO,
+                        help=f"formato do filmes.bin criado na construção inicial (padrão: {FORMATO_PADRAO})")
+    parser.add_argument("--compressor", choices=COMPRESSORES, default=COMPRESSORES[0],
+                        help="compressor dos blocos no formato em blocos (padrão: zlib)")
+    parser.add_argument("--aquecer", action="store_true",
+                        help="carrega em segundo plano os índices ainda não usados pelo menu")
+    parser.add_argument("--cache-registros", type=int, default=CAPACIDADE_REGISTROS,
+                        help=f"filmes decodificados mantidos em memória (padrão: {CAPACIDADE_REGISTROS}; 0 desativa)")
+    parser.add_argument("--politica-cache", choices=POLITICAS, default=POLITICAS[0],
+                        help="política de despejo do cache de registros (padrão: lru)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = ler_argumentos(argv)
+    configurar_cache_registros(args.cache_registros, args.politica_cache)
     DATA_DIR = Path("data")
     BIN_FILE = DATA_DIR / "filmes.bin"
     
@@ -27,9 +64,11 @@ def main():
     index_builder = IndexBuilder(str(BIN_FILE))
 
     # Tenta carregar os índices existentes e o arquivo binário
-    # Se o BIN_FILE não existe OU os índices não puderam ser carregados, reconstruir
-    if not BIN_FILE.exists() or not index_builder.carregar_todos_indices():
-        print("📤 Arquivo binário ou um ou mais índices não encontrados/válidos. Preparando extração dos arquivos TSV...")
+    # Se o BIN_FILE não existe, extrai os TSVs; se só os índices faltam ou não correspondem
+    # ao BIN_FILE, reconstrói os índices a partir dele (sem reextrair os TSVs)
+    carregados = BIN_FILE.exists() and index_builder.carregar_todos_indices()
+    if not BIN_FILE.exists():
+        print("📤 Arquivo binário não encontrado. Preparando extração dos arquivos TSV...")
 
         # Verifica se os arquivos .tsv necessários existem na pasta data/
         NAMES_FILE = DATA_DIR / "name.basics.tsv"
@@ -49,29 +88,58 @@ def main():
             print("⚠️  Certifique-se de que todos os arquivos .tsv estejam disponíveis na pasta 'data/'")
             sys.exit(1) # Sai do programa se os arquivos TSV não estiverem presentes
 
+        limite = None if args.completo else args.limite
+        if limite is None:
+            print("🌐 Modo catálogo completo: todos os filmes serão extraídos.")
         print("✅ Todos os arquivos foram encontrados. Extraindo e salvando filmes...")
 
-        # Carrega os dados brutos e extrai os objetos Filme
-        nomes_diretores = carregar_nome_diretores(str(NAMES_FILE))
-        diretores_por_titulo = carregar_diretores_por_titulo(str(CREW_FILE))
-        filmes_extraidos = extrair_filmes(str(BASICS_FILE), diretores_por_titulo, nomes_diretores, limite=1000)
-
-        # Salva a lista de filmes extraídos no arquivo binário
-        salvar_filmes_binario(filmes_extraidos, str(BIN_FILE))
-        print(f"✅ {len(filmes_extraidos)} filmes salvos inicialmente em: {BIN_FILE}")
-
-        # Constrói todos os índices a partir dos filmes recém-salvos
-        index_builder.construir_todos_indices(filmes_extraidos)
+        # Extrai os objetos Filme guardando apenas os tconsts/nconsts necessários
+        if args.paralelo:
+            filmes_extraidos = extrair_filmes_paralelo(
+                str(BASICS_FILE), str(CREW_FILE), str(NAMES_FILE),
+                limite=limite, processos=args.processos, teto_memoria_mb=args.memoria_mb
+            )
+        else:
+            filmes_extraidos = extrair_filmes_em_etapas(
+                str(BASICS_FILE), str(CREW_FILE), str(NAMES_FILE),
+                limite=limite, teto_memoria_mb=args.memoria_mb
+            )
+
+        # Grava os filmes no arquivo binário à medida que são extraídos (sem lista em memória).
+        # Se a extração parar no meio, o binário incompleto é apagado: senão a próxima
+        # execução o encontraria e o indexaria como o catálogo completo
+        try:
+            total_filmes = salvar_filmes_binario(filmes_extraidos, str(BIN_FILE), args.formato, args.compressor)
+        except MemoryError as e:
+            remover_binario(str(BIN_FILE))
+            print(f"❌ {e}")
+            print(f"🗑️ {BIN_FILE} incompleto removido. Aumente --memoria-mb ou reduza --limite.")
+            sys.exit(1)
+        except BaseException:
+            remover_binario(str(BIN_FILE))
+            raise
+        print(f"✅ {total_filmes} filmes salvos inicialmente em: {BIN_FILE}")
+
+        # Constrói todos os índices a partir do arquivo binário recém-salvo
+        index_builder.construir_indices_do_binario(memoria_mb=args.memoria_mb)
         
         # Salva os índices recém-construídos para persistência
         index_builder.salvar_todos_indices()
         print("💾 Filmes e todos os índices (TRIE, Hash, B-Tree) salvos com sucesso.")
 
+    elif not carregados:
+        print(f"🛠️ Reconstruindo os índices a partir de {BIN_FILE}...")
+        index_builder.construir_indices_do_binario(memoria_mb=args.memoria_mb)
+        index_builder.salvar_todos_indices()
+
     else:
         print("✅ Dados e índices carregados com sucesso de arquivos existentes.")
+        if args.aquecer:
+            index_builder.aquecer_em_segundo_plano()
 
     # Inicia a interface de linha de comando, passando o index_builder
-    menu_principal(index_builder, str(BIN_FILE))
+    menu_principal(index_builder, str(BIN_FILE), inicio=INICIO)
+    index_builder.fechar()
 
 if __name__ == "__main__":
     main()
@@ -1,23 +1,365 @@
 # src/binary_store.py
 
-import csv
-from typing import List
+import mmap
+import os
+import struct
+import zlib
+from typing import Iterable, Iterator, List
 from src.filme import Filme
+from src.formato_compacto import FormatoCompacto, MAGICO as MAGICO_COMPACTO
+from src.formato_blocos import FormatoBlocos, MAGICO as MAGICO_BLOCOS
+from src.cache_registros import CacheRegistros, CAPACIDADE_REGISTROS, POLITICA_LRU
+from src.varredura import FiltroVarredura, TAMANHO_LOTE
 
 ARQUIVO_BINARIO = "data/filmes.bin"
 
+# Offsets mais próximos que isso (em bytes) são agrupados em uma única faixa de leitura
+DISTANCIA_COALESCER = 64 * 1024
+
+# Formatos do arquivo binário: registros de tamanho fixo (original), compactos (versão 2)
+# ou em blocos comprimidos (arquivamento)
+FORMATO_FIXO = "fixo"
+FORMATO_COMPACTO = "compacto"
+FORMATO_BLOCOS = "blocos"
+FORMATO_PADRAO = FORMATO_COMPACTO
+
+# Só o ano e o gênero de cada registro de Filme.FORMATO_REGISTRO, para filtrar varreduras
+_COLUNAS_FILTRO = struct.Struct("112xi20s100x")
+assert _COLUNAS_FILTRO.size == Filme.TAMANHO_REGISTRO
+
+# Configuração do cache de registros decodificados dos FilmeStores criados a partir de agora
+_config_cache_registros = {"capacidade": CAPACIDADE_REGISTROS, "politica": POLITICA_LRU}
+
+#---------------#
+#  FormatoFixo  #
+#---------------#
+class FormatoFixo:
+    """
+    Formato original do arquivo binário: registros de Filme.TAMANHO_REGISTRO bytes
+    (Filme.FORMATO_REGISTRO), sem cabeçalho. Tem a mesma interface de FormatoCompacto.
+    """
+
+    tamanho_minimo = Filme.TAMANHO_REGISTRO
+    inicio_dados = 0
+    em_blocos = False
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        fim = self.fim_dos_registros()
+        if fim < os.path.getsize(caminho):
+            descartar_cauda(caminho, fim)
+
+    def codificar(self, filme: Filme) -> bytes:
+        return filme.to_bytes()
+
+    def decodificar(self, buffer, offset: int) -> Filme:
+        return Filme.from_buffer(buffer, offset)
+
+    @staticmethod
+    def como_gravado(filme: Filme) -> Filme:
+        """O filme como é lido de volta deste formato (campos cortados no tamanho fixo)."""
+        return Filme.from_bytes(filme.to_bytes())
+
+    @staticmethod
+    def tamanho_em(buffer, offset: int) -> int:
+        return Filme.TAMANHO_REGISTRO
+
+    def iterar(self, inicio: int = 0, registros_por_bloco: int = 4096) -> Iterator[tuple[int, Filme]]:
+        tamanho = Filme.TAMANHO_REGISTRO
+        offset = inicio
+        with open(self.caminho, "rb") as f:
+            f.seek(inicio)
+            while True:
+                bloco = f.read(tamanho * registros_por_bloco)
+                if not bloco:
+                    break
+                for inicio_registro in range(0, len(bloco) - tamanho + 1, tamanho):
+                    yield offset + inicio_registro, self.decodificar(bloco, inicio_registro)
+                offset += len(bloco)
+
+    def varrer(self, filtro: FiltroVarredura, inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+        """
+        Como iterar, mas cada lote é desempacotado de uma vez só no ano e no gênero
+        (struct.iter_unpack) e só os registros aceitos pelo filtro viram Filme.
+        """
+        tamanho = Filme.TAMANHO_REGISTRO
+        aceita = filtro.aceita
+        offset = inicio
+        with open(self.caminho, "rb") as f:
+            f.seek(inicio)
+            while True:
+                bloco = f.read(TAMANHO_LOTE - TAMANHO_LOTE % tamanho)
+                completos = len(bloco) // tamanho
+                if not completos:
+                    return
+                filtro.examinados += completos
+                colunas = _COLUNAS_FILTRO.iter_unpack(memoryview(bloco)[:completos * tamanho])
+                for posicao, (ano, genero) in zip(range(0, len(bloco), tamanho), colunas):
+                    if aceita(ano, genero):
+                        filtro.aceitos += 1
+                        yield offset + posicao, Filme.from_buffer(bloco, posicao)
+                offset += len(bloco)
+
+    def registrar_offset(self, offset: int):
+        pass
+
+    def __len__(self):
+        return os.path.getsize(self.caminho) // Filme.TAMANHO_REGISTRO
+
+    def fim_dos_registros(self) -> int:
+        """Offset logo após o último registro completo."""
+        return len(self) * Filme.TAMANHO_REGISTRO
+
+    def fim_do_registro(self, offset: int) -> int:
+        return offset + Filme.TAMANHO_REGISTRO
+
+    def assinatura(self, fim: int) -> int:
+        """crc32 do registro que termina em fim."""
+        if fim <= 0:
+            return 0
+        return assinatura_bytes(self.caminho, fim - Filme.TAMANHO_REGISTRO, fim)
+
+    def descarregar(self):
+        pass
+
+    def fechar(self):
+        pass
+
+def descartar_cauda(caminho: str, fim: int):
+    """Remove do final do arquivo um registro incompleto (gravação interrompida)."""
+    print(f"⚠️ Registro incompleto descartado no final de {caminho}.")
+    with open(caminho, "r+b") as f:
+        f.truncate(fim)
+
+def assinatura_bytes(caminho: str, inicio: int, fim: int) -> int:
+    """crc32 dos bytes [inicio, fim) do arquivo (0 para um intervalo vazio)."""
+    if fim <= inicio:
+        return 0
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        return zlib.crc32(f.read(fim - inicio))
+
+# Um formato aberto por caminho: o FilmeStore e os gravadores do mesmo arquivo
+# compartilham os dicionários, a tabela de offsets e o cache de blocos
+_formatos: dict = {}
+
+def obter_formato(caminho: str = ARQUIVO_BINARIO) -> FormatoFixo | FormatoCompacto | FormatoBlocos:
+    """Abre (uma vez por caminho) o formato do arquivo binário, identificado pelo cabeçalho."""
+    formato = _formatos.get(caminho)
+    if formato is None:
+        with open(caminho, "rb") as f:
+            magico = f.read(len(MAGICO_COMPACTO))
+        if magico == MAGICO_COMPACTO:
+            formato = FormatoCompacto(caminho)
+        elif magico == MAGICO_BLOCOS:
+            formato = FormatoBlocos(caminho)
+        else:
+            formato = FormatoFixo(caminho)
+        _formatos[caminho] = formato
+    return formato
+
+def criar_binario(caminho: str = ARQUIVO_BINARIO, formato: str = FORMATO_PADRAO, compressor: str = "zlib"):
+    """
+    Cria um arquivo binário vazio no formato informado (substituindo o existente).
+    compressor: zlib ou lzma, usado só no formato em blocos.
+    """
+    fechar_store(caminho)
+    if formato == FORMATO_COMPACTO:
+        _formatos[caminho] = FormatoCompacto.criar(caminho)
+    elif formato == FORMATO_BLOCOS:
+        _formatos[caminho] = FormatoBlocos.criar(caminho, compressor)
+    else:
+        open(caminho, "wb").close()
+        _formatos[caminho] = FormatoFixo(caminho)
+
+#--------------#
+#  FilmeStore  #
+#--------------#
+class FilmeStore:
+    """
+    Acesso de longa duração ao arquivo binário através de um mapeamento em memória (mmap).
+    O arquivo é aberto uma única vez e os registros são decodificados diretamente do
+    buffer mapeado, sem um open/seek/read por filme. Os filmes decodificados ficam no
+    cache de registros (src/cache_registros.py), consultado antes de qualquer leitura.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_BINARIO, distancia_coalescer: int = DISTANCIA_COALESCER):
+        self.caminho = caminho
+        self.distancia_coalescer = distancia_coalescer
+        self.cache = CacheRegistros(**_config_cache_registros)
+        self._arquivo = None
+        self._formato = None
+        self._mmap = None
+        self._tamanho = 0
+
+    def _mapear(self):
+        """
+        Garante que o mapeamento cobre o arquivo inteiro. Se o arquivo cresceu
+        (ex: após uma importação), o mapeamento é refeito com o novo tamanho.
+        """
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, "rb")
+            self._formato = obter_formato(self.caminho)
+
+        tamanho = os.fstat(self._arquivo.fileno()).st_size
+        if tamanho == self._tamanho and (self._mmap is not None or tamanho == 0):
+            return
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._tamanho = tamanho
+        if tamanho > 0:
+            self._mmap = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _faixas_coalescidas(self, offsets_ordenados: list[int]) -> list[tuple[int, int]]:
+        """
+        Agrupa offsets ordenados em faixas [inicio, fim) contíguas ou próximas,
+        para que cada faixa seja tratada como uma única leitura sequencial.
+        """
+        faixas = []
+        # No formato compacto o tamanho exato só é conhecido ao ler o registro; o mínimo basta
+        # para agrupar as leituras
+        tamanho = self._formato.tamanho_minimo
+        for offset in offsets_ordenados:
+            if faixas and offset - faixas[-1][1] <= self.distancia_coalescer:
+                faixas[-1][1] = offset + tamanho
+            else:
+                faixas.append([offset, offset + tamanho])
+        return [(inicio, fim) for inicio, fim in faixas]
+
+    def _pre_carregar(self, faixas: list[tuple[int, int]]):
+        """Avisa o sistema operacional sobre as faixas que serão lidas (quando suportado)."""
+        if not hasattr(self._mmap, "madvise") or not hasattr(mmap, "MADV_WILLNEED"):
+            return
+        for inicio, fim in faixas:
+            inicio_pagina = inicio - (inicio % mmap.PAGESIZE)
+            fim = min(fim, self._tamanho)
+            if fim > inicio_pagina:
+                self._mmap.madvise(mmap.MADV_WILLNEED, inicio_pagina, fim - inicio_pagina)
+
+    def fetch(self, offsets: Iterable[int]) -> List[Filme]:
+        """
+        Lê vários filmes de uma vez. Os offsets são ordenados e coalescidos em faixas
+        antes da leitura; o resultado preserva a ordem em que os offsets foram pedidos.
+        Offsets inválidos (fora do arquivo) são ignorados.
+        """
+        return [filme for _, filme in self.fetch_pares(offsets)]
+
+    def fetch_pares(self, offsets: Iterable[int]) -> list[tuple[int, Filme]]:
+        """Como fetch, mas retorna pares (offset, Filme) dos offsets válidos."""
+        offsets = list(offsets)
+        if not offsets:
+            return []
+        obtidos = {}
+        for o in dict.fromkeys(offsets):
+            filme = self.cache.obter(o)
+            if filme is not None:
+                obtidos[o] = filme
+        faltantes = [o for o in dict.fromkeys(offsets) if o not in obtidos]
+        if faltantes:
+            for o, filme in self._decodificar(faltantes).items():
+                self.cache.guardar(o, filme)
+                obtidos[o] = filme
+        return [(o, obtidos[o]) for o in offsets if o in obtidos]
+
+    def _decodificar(self, offsets: list[int]) -> dict[int, Filme]:
+        """Lê e decodifica do arquivo os filmes dos offsets válidos (sem passar pelo cache)."""
+        self._mapear()
+        if self._formato.em_blocos:
+            # Em blocos, o próprio formato lê e descomprime só os blocos envolvidos
+            validos = [n for n in offsets if 0 <= n < len(self._formato)]
+            return dict(zip(validos, self._formato.ler_varios(validos)))
+        if self._mmap is None:
+            return {}
+
+        formato = self._formato
+        validos = sorted({o for o in offsets
+                          if formato.inicio_dados <= o and o + formato.tamanho_minimo <= self._tamanho})
+        self._pre_carregar(self._faixas_coalescidas(validos))
+
+        return {o: formato.decodificar(self._mmap, o) for o in validos}
+
+    def ler(self, offset: int) -> Filme | None:
+        """Lê um único filme no offset informado, ou None se o offset for inválido."""
+        filmes = self.fetch([offset])
+        return filmes[0] if filmes else None
+
+    def fechar(self):
+        """Libera o mapeamento, o descritor do arquivo e o cache de registros."""
+        self.cache.limpar()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+        self._formato = None
+        self._tamanho = 0
+
+# Um FilmeStore por caminho, compartilhado por todas as buscas do processo
+_stores: dict[str, FilmeStore] = {}
+
+def obter_store(caminho: str = ARQUIVO_BINARIO) -> FilmeStore:
+    """Retorna o FilmeStore compartilhado para o arquivo informado, criando-o se necessário."""
+    store = _stores.get(caminho)
+    if store is None:
+        store = FilmeStore(caminho)
+        _stores[caminho] = store
+    return store
+
+def configurar_cache_registros(capacidade: int = CAPACIDADE_REGISTROS, politica: str = POLITICA_LRU):
+    """
+    Define o tamanho (em filmes; 0 desativa) e a política de despejo (lru ou clock) do
+    cache de registros. Vale para os FilmeStores abertos depois da chamada.
+    """
+    CacheRegistros(capacidade, politica)   # valida a política
+    _config_cache_registros.update(capacidade=capacidade, politica=politica)
+
+def fechar_store(caminho: str = ARQUIVO_BINARIO):
+    """Fecha o FilmeStore e o formato do arquivo informado (necessário antes de reescrevê-lo)."""
+    store = _stores.pop(caminho, None)
+    if store is not None:
+        store.fechar()
+    formato = _formatos.pop(caminho, None)
+    if formato is not None:
+        formato.fechar()
+
+# Arquivos auxiliares dos formatos compacto (dicionários e offsets) e em blocos (diretório)
+EXTENSOES_AUXILIARES = (".dic", ".off", ".blk")
+
+def remover_binario(caminho: str = ARQUIVO_BINARIO):
+    """
+    Fecha e apaga o arquivo binário e seus auxiliares. Usado quando a gravação inicial do
+    catálogo é interrompida: um filmes.bin incompleto seria indexado como se estivesse completo.
+    """
+    fechar_store(caminho)
+    base = os.path.splitext(caminho)[0]
+    for arquivo in (caminho, *(base + extensao for extensao in EXTENSOES_AUXILIARES)):
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+
 #-------------------------#
 #  salvar_filmes_binario  #
 #-------------------------#
-def salvar_filmes_binario(filmes: List[Filme], caminho: str = ARQUIVO_BINARIO):
+def salvar_filmes_binario(filmes: Iterable[Filme], caminho: str = ARQUIVO_BINARIO,
+                          formato: str = FORMATO_PADRAO, compressor: str = "zlib") -> int:
     """
     Salva uma lista de filmes no arquivo binário em modo heap (inserção serial).
-    Utiliza o método Filme.to_bytes() para serializar cada objeto.
+    Cada objeto é serializado pelo formato escolhido (fixo: Filme.to_bytes(); compacto:
+    registros de tamanho variável com dicionários, veja src/formato_compacto.py; blocos:
+    blocos comprimidos com zlib ou lzma, veja src/formato_blocos.py).
+    Aceita qualquer iterável (ex: um gerador), então os filmes não precisam estar
+    todos em memória. Retorna a quantidade de filmes gravados.
     """
-    with open(caminho, "wb") as f:
+    criar_binario(caminho, formato, compressor)
+    total = 0
+    with GravadorBinario(caminho) as gravador:
         for filme in filmes:
-            f.write(filme.to_bytes())
-    print(f"✅ {len(filmes)} filmes salvos em: {caminho}")
+            gravador.adicionar(filme)
+            total += 1
+    print(f"✅ {total} filmes salvos em: {caminho}")
+    return total
 
 #----------------------#
 #  ler_filmes_binario  #
@@ -25,38 +367,49 @@ def salvar_filmes_binario(filmes: List[Filme], caminho: str = ARQUIVO_BINARIO):
 def ler_filmes_binario(caminho: str = ARQUIVO_BINARIO) -> List[Filme]:
     """
     Lê todos os filmes do arquivo binário e retorna como lista de objetos Filme.
-    Utiliza o método Filme.from_bytes() para desserializar cada registro.
     """
-    filmes = []
     try:
-        with open(caminho, "rb") as f:
-            while True:
-                # Acessa TAMANHO_REGISTRO via Filme.TAMANHO_REGISTRO
-                bytes_lidos = f.read(Filme.TAMANHO_REGISTRO) 
-                if not bytes_lidos:
-                    break
-                filme = Filme.from_bytes(bytes_lidos)
-                filmes.append(filme)
+        return [filme for _, filme in iterar_filmes_binario(caminho)]
     except FileNotFoundError:
         print(f"⚠️ Arquivo binário não encontrado: {caminho}")
-    return filmes
+        return []
 
-#-------------------------------#
-#  NOVA FUNÇÃO: ler_filme_por_offset  #
-#-------------------------------#
+#-------------------------#
+#  iterar_filmes_binario  #
+#-------------------------#
+def iterar_filmes_binario(caminho: str = ARQUIVO_BINARIO, inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+    """
+    Percorre o arquivo binário sequencialmente, lendo vários registros por vez,
+    e gera pares (offset, Filme) sem manter o catálogo inteiro em memória.
+    inicio: offset do primeiro registro lido (ex: só a cauda ainda não indexada).
+    """
+    return obter_formato(caminho).iterar(inicio)
+
+#-------------------------#
+#  varrer_filmes_binario  #
+#-------------------------#
+def varrer_filmes_binario(caminho: str = ARQUIVO_BINARIO, filtro: FiltroVarredura | None = None,
+                          inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+    """
+    Varredura completa do arquivo binário com os predicados de ano e gênero do filtro
+    aplicados nos campos crus de cada lote de registros, antes de qualquer Filme ser
+    criado. Gera os pares (offset, Filme) dos registros aceitos; sem filtro (ou com um
+    filtro vazio), equivale a iterar_filmes_binario.
+    """
+    if filtro is None or filtro.vazio:
+        return iterar_filmes_binario(caminho, inicio)
+    return obter_formato(caminho).varrer(filtro, inicio)
+
+#------------------------#
+#  ler_filme_por_offset  #
+#------------------------#
 def ler_filme_por_offset(offset: int, caminho: str = ARQUIVO_BINARIO) -> Filme | None:
     """
     Lê um único filme do arquivo binário em um dado offset.
     Retorna o objeto Filme ou None se o offset for inválido ou o arquivo não existir.
     """
     try:
-        with open(caminho, "rb") as f:
-            f.seek(offset)
-            # Acessa TAMANHO_REGISTRO via Filme.TAMANHO_REGISTRO
-            bytes_lidos = f.read(Filme.TAMANHO_REGISTRO)
-            if not bytes_lidos:
-                return None
-            return Filme.from_bytes(bytes_lidos)
+        return obter_store(caminho).ler(offset)
     except FileNotFoundError:
         print(f"⚠️ Arquivo binário não encontrado: {caminho}")
         return None
@@ -72,7 +425,59 @@ def adicionar_filme_ao_binario(filme: Filme, caminho: str = ARQUIVO_BINARIO) ->
     Adiciona um único filme ao final do arquivo binário e retorna seu offset.
     Abre o arquivo em modo 'ab' (append binary).
     """
-    with open(caminho, "ab") as f:
-        offset = f.tell()
-        f.write(filme.to_bytes())
-    return offset
+    with GravadorBinario(caminho) as gravador:
+        return gravador.adicionar(filme)
+
+#-------------------#
+#  GravadorBinario  #
+#-------------------#
+class GravadorBinario:
+    """
+    Acrescenta vários filmes ao final do arquivo binário por um único arquivo aberto
+    com buffer, em vez de um open em modo 'ab' por filme (usado na importação em lote).
+    Os registros são gravados no formato do arquivo (um arquivo inexistente é criado no
+    formato padrão); self.offset é o fim do último registro gravado. No formato em blocos
+    o próprio formato agrupa os registros, e os endereços são números de registro.
+    """
+
+    def __init__(self, caminho: str = ARQUIVO_BINARIO, tamanho_buffer: int = 1024 * 1024):
+        self.caminho = caminho
+        if not os.path.exists(caminho):
+            criar_binario(caminho)
+        self._formato = obter_formato(caminho)
+        if self._formato.em_blocos:
+            self._f = None
+            self.offset = self._formato.fim_dos_registros()
+        else:
+            self._f = open(caminho, "ab", buffering=tamanho_buffer)
+            self.offset = self._f.seek(0, os.SEEK_END)
+
+    def adicionar(self, filme: Filme) -> int:
+        """Grava o filme no buffer e retorna o offset que ele ocupará no arquivo."""
+        if self._f is None:
+            offset = self._formato.adicionar(filme)
+            self.offset = self._formato.fim_do_registro(offset)
+            return offset
+        offset = self.offset
+        registro = self._formato.codificar(filme)
+        self._f.write(registro)
+        self._formato.registrar_offset(offset)
+        self.offset += len(registro)
+        return offset
+
+    def descarregar(self):
+        """Garante que os registros gravados até aqui estejam no arquivo."""
+        if self._f is not None:
+            self._f.flush()
+        self._formato.descarregar()
+
+    def fechar(self):
+        if self._f is not None:
+            self._f.close()
+        self._formato.descarregar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -3,37 +3,44 @@
 # Importa Filme para tipagem
 from src.filme import Filme 
 
+from src.binary_store import varrer_filmes_binario, obter_store
+from src.varredura import FiltroVarredura
+from src.cache_buscas import obter_cache_buscas
+from src.cursor_resultados import CursorResultados, OrdemPreguicosa
+
 # Importa as funções de busca de cada tipo de índice
 from indices.trie import buscar_titulos_por_prefixo 
 from indices.hash import buscar_filmes_por_diretor 
 from indices.arvore import buscar_filmes_por_ano_b_tree, buscar_filme_por_id_b_tree 
+from indices.genero import buscar_filmes_por_genero_indice
+from indices.palavras import chave_de_relevancia, normalizar_palavras
+from indices.diretores import normalizar_nome
+
+# Importa o planejador de buscas combinadas
+from src.planejador import planejar_busca
 
 #--------------------#
 #  Busca por Gênero  #
 #--------------------#
-def buscar_filmes_por_genero(genero: str, caminho_bin="data/filmes.bin") -> list[Filme]:
+def buscar_filmes_por_genero(genero: str, caminho_bin="data/filmes.bin", indice_genero: dict | None = None) -> list[Filme]:
     """
-    Busca filmes por gênero fazendo uma varredura sequencial no arquivo binário,
+    Busca filmes por gênero. Se o índice invertido de gênero for informado, usa-o;
+    caso contrário, faz uma varredura sequencial no arquivo binário,
     sem carregá-lo inteiramente em memória.
     """
-    genero_lower = genero.lower() 
+    if indice_genero is not None:
+        return buscar_filmes_por_genero_indice(genero, indice_genero, caminho_bin)
+
     resultados = []
+    # Filmes já no cache de registros são reaproveitados; os demais não entram nele, para
+    # que a varredura não despeje os filmes populares
+    cache = obter_store(caminho_bin).cache
 
     try:
-        with open(caminho_bin, "rb") as f:
-            while True:
-                # Lê um único registro (o tamanho de um filme) do arquivo
-                bytes_lidos = f.read(Filme.TAMANHO_REGISTRO) 
-                if not bytes_lidos:
-                    # Se não houver mais bytes para ler, chegamos ao fim do arquivo
-                    break
-                
-                # Converte os bytes lidos em um objeto Filme
-                filme = Filme.from_bytes(bytes_lidos)
-                
-                # Compara o gênero do filme com o gênero buscado
-                if genero_lower in filme.genero.lower().split(','):
-                    resultados.append(filme)
+        # Percorre os registros em qualquer formato do arquivo binário; o gênero é
+        # comparado nos bytes crus e só os filmes do gênero buscado são criados
+        for offset, filme in varrer_filmes_binario(caminho_bin, FiltroVarredura(genero=genero)):
+            resultados.append(cache.reaproveitar(offset, filme))
     except FileNotFoundError:
         print(f"⚠️  Arquivo binário não encontrado: {caminho_bin}")
         
@@ -42,6 +49,24 @@ def buscar_filmes_por_genero(genero: str, caminho_bin="data/filmes.bin") -> list
 #---------------------#
 #  Busca com Filtros  #
 #---------------------#
+def _chave_busca(prefixo_titulo, diretor, ano, genero, palavras_titulo, ordenar_por, ordem_crescente,
+                 diretor_normalizado: bool) -> tuple:
+    """
+    Chave do cache de buscas: os filtros normalizados como os índices os comparam (a Trie e
+    o índice de gênero não diferenciam caixa; as palavras do título e, com o índice de
+    diretores, o diretor também não diferenciam acentos) e as opções de ordenação.
+    """
+    return (
+        prefixo_titulo.lower() if prefixo_titulo else None,
+        (normalizar_nome(diretor) if diretor and diretor_normalizado else diretor) or None,
+        diretor_normalizado,
+        ano or None,
+        genero.lower() if genero else None,
+        tuple(normalizar_palavras(palavras_titulo)) if palavras_titulo else None,
+        ordenar_por,
+        ordem_crescente,
+    )
+
 def buscar_filmes_com_filtros(
     prefixo_titulo: str | None,
     diretor: str | None,
@@ -54,44 +79,79 @@ def buscar_filmes_com_filtros(
     indice_id_obj,  
     caminho_bin: str = "data/filmes.bin",
     ordenar_por: str = 'titulo', 
-    ordem_crescente: bool = True 
-) -> list[Filme]:
+    ordem_crescente: bool = True,
+    indice_genero_obj: dict | None = None,
+    explicar: bool = False,
+    palavras_titulo: str | None = None,
+    indice_palavras_obj=None,
+    indice_diretores_obj=None,
+    usar_cache: bool = True,
+    contagem_anos: dict | None = None
+) -> CursorResultados:
     """
     Realiza buscas de filmes combinando diferentes filtros usando os índices.
-    Aplica a ordenação final aos resultados.
+    Os critérios são executados por um plano baseado em custo (src/planejador.py):
+    os offsets são intersectados a partir do critério mais seletivo e só os
+    sobreviventes são lidos do disco. Com explicar=True, o plano é exibido.
+    palavras_titulo: palavras (ou trechos de palavras) que o título deve conter, em
+    qualquer posição, resolvidas pelo índice de palavras (indices/palavras.py).
+    Aplica a ordenação final aos resultados; ordenar_por='relevancia' ordena pela
+    qualidade da correspondência com palavras_titulo.
+    indice_diretores_obj: quando informado, o diretor é encontrado sem diferenciar
+    caixa e acentos (indices/diretores.py).
+    contagem_anos: filmes por ano das estatísticas incrementais; estima o critério de ano
+    sem percorrer a B-Tree.
+    Com usar_cache=True, uma busca repetida (mesmos filtros normalizados e ordenação)
+    reaproveita os offsets do resultado guardado no cache de buscas (src/cache_buscas.py).
+    Retorna um CursorResultados (src/cursor_resultados.py): só os offsets e o total; os
+    filmes de cada página são lidos quando a página é exibida. As ordenações por título,
+    ano e diretor usam um heap (top-K) em vez de ordenar o resultado inteiro.
     """
 
     if id_filme:
-        filme = buscar_filme_por_id_b_tree(indice_id_obj, id_filme, caminho_bin)
-        if filme:
-            return [filme] 
-        return [] 
-
-    filmes_candidatos_por_criterio = []
-
-    if prefixo_titulo:
-        filmes_candidatos_por_criterio.append(set(buscar_titulos_por_prefixo(trie_obj, prefixo_titulo, caminho_bin)))
-
-    if diretor:
-        filmes_candidatos_por_criterio.append(set(buscar_filmes_por_diretor(diretor, hash_diretor_obj, caminho_bin)))
-
-    if ano:
-        filmes_candidatos_por_criterio.append(set(buscar_filmes_por_ano_b_tree(indice_ano_obj, ano, caminho_bin)))
+        # Para ID, esperamos apenas um offset único
+        return CursorResultados(indice_id_obj.buscar(id_filme)[:1], caminho_bin)
 
-    if genero:
-        filmes_candidatos_por_criterio.append(set(buscar_filmes_por_genero(genero, caminho_bin)))
+    cache = chave = None
+    if usar_cache:
+        cache = obter_cache_buscas(caminho_bin)
+        chave = _chave_busca(prefixo_titulo, diretor, ano, genero, palavras_titulo, ordenar_por,
+                             ordem_crescente, indice_diretores_obj is not None)
+        offsets = cache.obter(chave)
+        if offsets is not None:
+            if explicar:
+                print(f"🧭 Resultado reaproveitado do cache de buscas ({len(offsets)} offset(s)); "
+                      "nenhum índice consultado.")
+            return CursorResultados(offsets, caminho_bin)
 
-    if not filmes_candidatos_por_criterio:
-        return []
+    plano = planejar_busca(
+        prefixo_titulo, diretor, ano, genero,
+        trie_obj, hash_diretor_obj, indice_ano_obj, indice_genero_obj, caminho_bin,
+        palavras_titulo, indice_palavras_obj, indice_diretores_obj, contagem_anos
+    )
+    if plano is None:
+        return CursorResultados([], caminho_bin)
 
-    filmes_filtrados_set = set.intersection(*filmes_candidatos_por_criterio)
-    filmes_filtrados_list = list(filmes_filtrados_set) 
+    pares = plano.executar_pares()
+    if explicar:
+        print(plano.explicar())
 
-    if ordenar_por == 'titulo':
-        filmes_filtrados_list.sort(key=lambda f: f.titulo.lower(), reverse=not ordem_crescente)
+    # Só as chaves de ordenação e os offsets seguem adiante; os filmes são descartados
+    # e relidos (pelo cache de registros) página a página
+    reverso = not ordem_crescente
+    if ordenar_por == 'relevancia' and palavras_titulo:
+        relevancia = chave_de_relevancia(palavras_titulo)
+        pares.sort(key=lambda par: relevancia(par[1]))
+        offsets = [offset for offset, _ in pares]
+    elif ordenar_por == 'titulo':
+        offsets = OrdemPreguicosa([(filme.titulo.lower(), offset) for offset, filme in pares], reverso)
     elif ordenar_por == 'ano':
-        filmes_filtrados_list.sort(key=lambda f: f.ano, reverse=not ordem_crescente)
+        offsets = OrdemPreguicosa([(filme.ano, offset) for offset, filme in pares], reverso)
     elif ordenar_por == 'diretor':
-        filmes_filtrados_list.sort(key=lambda f: f.diretor.lower(), reverse=not ordem_crescente)
+        offsets = OrdemPreguicosa([(filme.diretor.lower(), offset) for offset, filme in pares], reverso)
+    else:
+        offsets = [offset for offset, _ in pares]
 
-    return filmes_filtrados_list
+    if cache is not None:
+        cache.guardar(chave, offsets)
+    return CursorResultados(offsets, caminho_bin)
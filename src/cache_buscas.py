@@ -0,0 +1,101 @@
+# src/cache_buscas.py
+
+from array import array
+from collections import OrderedDict
+from typing import Sequence
+
+from src.cursor_resultados import OrdemPreguicosa, PESO_ENTRADA
+
+# Limites do cache: quantidade de buscas guardadas e total de offsets somando todas elas
+# (em offsets de 8 bytes; uma OrdemPreguicosa ainda não materializada pesa mais por entrada)
+CAPACIDADE_BUSCAS = 128
+MAX_OFFSETS = 2_000_000
+
+def _peso(offsets: Sequence[int]) -> int:
+    """Memória de um resultado guardado, em offsets de 8 bytes."""
+    return len(offsets) * PESO_ENTRADA if isinstance(offsets, OrdemPreguicosa) else len(offsets)
+
+class CacheBuscas:
+    """
+    Cache LRU dos resultados das buscas combinadas. A chave é a tupla normalizada dos
+    filtros e da ordenação; o valor é a sequência de offsets do resultado, na ordem final
+    (os filmes são lidos de novo pelo FilmeStore, que é barato com o arquivo mapeado).
+    Listas de offsets ficam em arrays compactos; uma OrdemPreguicosa (src/cursor_resultados.py)
+    é guardada como está e continua sendo ordenada sob demanda por quem a reaproveitar, mas
+    conta PESO_ENTRADA offsets por entrada, e vira um array assim que estiver toda ordenada.
+    O cache é limitado tanto pela quantidade de buscas quanto pelo total de offsets guardados.
+    O IndexBuilder invalida o cache sempre que filmes são adicionados ao catálogo ou os
+    índices são reconstruídos.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_BUSCAS, max_offsets: int = MAX_OFFSETS):
+        self.capacidade = capacidade
+        self.max_offsets = max_offsets
+        self._entradas: OrderedDict[tuple, Sequence[int]] = OrderedDict()
+        self._pesos: dict[tuple, int] = {}
+        self._offsets = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obter(self, chave: tuple) -> Sequence[int] | None:
+        """Offsets do resultado guardado para a chave, ou None (contando acerto ou falha)."""
+        offsets = self._entradas.get(chave)
+        if offsets is None:
+            self.falhas += 1
+            return None
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        if isinstance(offsets, OrdemPreguicosa) and offsets.completa:
+            # Quem usou o resultado já o ordenou inteiro: guarda só os offsets, em array
+            offsets = array("q", offsets[:])
+            self._entradas[chave] = offsets
+            self._offsets += len(offsets) - self._pesos[chave]
+            self._pesos[chave] = len(offsets)
+        return offsets
+
+    def guardar(self, chave: tuple, offsets: Sequence[int]):
+        """Guarda o resultado de uma busca, descartando as menos usadas se passar dos limites."""
+        peso = _peso(offsets)
+        if peso > self.max_offsets:
+            return
+        if self._entradas.pop(chave, None) is not None:
+            self._offsets -= self._pesos.pop(chave)
+        self._entradas[chave] = array("q", offsets) if isinstance(offsets, list) else offsets
+        self._pesos[chave] = peso
+        self._offsets += peso
+        while len(self._entradas) > self.capacidade or self._offsets > self.max_offsets:
+            removida, _ = self._entradas.popitem(last=False)
+            self._offsets -= self._pesos.pop(removida)
+
+    def invalidar(self):
+        """Descarta todos os resultados (o catálogo ou os offsets mudaram)."""
+        if self._entradas:
+            self._entradas.clear()
+            self._pesos.clear()
+            self._offsets = 0
+        self.invalidacoes += 1
+
+    def resumo(self) -> str:
+        total = self.acertos + self.falhas
+        taxa = f"{self.acertos / total:.0%}" if total else "-"
+        return (f"⚡ Cache de buscas: {self.acertos} acerto(s), {self.falhas} falha(s) (taxa {taxa}), "
+                f"{len(self)} busca(s) guardada(s), {self.invalidacoes} invalidação(ões)")
+
+# Um cache por arquivo binário, compartilhado por todas as buscas do processo
+_caches: dict[str, CacheBuscas] = {}
+
+def obter_cache_buscas(caminho_bin: str) -> CacheBuscas:
+    """Retorna o cache de buscas do arquivo binário informado, criando-o se necessário."""
+    cache = _caches.get(caminho_bin)
+    if cache is None:
+        cache = CacheBuscas()
+        _caches[caminho_bin] = cache
+    return cache
+
+def invalidar_cache_buscas(caminho_bin: str):
+    """Invalida o cache de buscas do arquivo binário (chamado pelo IndexBuilder)."""
+    obter_cache_buscas(caminho_bin).invalidar()
@@ -0,0 +1,159 @@
+# src/cache_registros.py
+
+from collections import OrderedDict
+
+from src.filme import Filme
+
+# Quantidade padrão de filmes decodificados mantidos em memória por arquivo binário
+CAPACIDADE_REGISTROS = 50_000
+
+POLITICA_LRU = "lru"
+POLITICA_CLOCK = "clock"
+POLITICAS = (POLITICA_LRU, POLITICA_CLOCK)
+
+class _PoliticaLRU:
+    """Despeja o registro usado há mais tempo (OrderedDict reordenado a cada acerto)."""
+
+    def __init__(self, capacidade: int):
+        self.capacidade = capacidade
+        self._itens: OrderedDict[int, Filme] = OrderedDict()
+
+    def obter(self, offset: int) -> Filme | None:
+        filme = self._itens.get(offset)
+        if filme is not None:
+            self._itens.move_to_end(offset)
+        return filme
+
+    def espiar(self, offset: int) -> Filme | None:
+        """Consulta sem mudar a ordem de uso."""
+        return self._itens.get(offset)
+
+    def guardar(self, offset: int, filme: Filme) -> int:
+        """Guarda o filme e retorna quantos registros foram despejados."""
+        self._itens[offset] = filme
+        self._itens.move_to_end(offset)
+        despejados = 0
+        while len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+            despejados += 1
+        return despejados
+
+    def limpar(self):
+        self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+class _PoliticaClock:
+    """
+    Aproximação da LRU com custo constante por acerto (sem reordenar estruturas): os
+    registros ocupam posições fixas de um anel, e um acerto só marca o bit de referência.
+    Para abrir espaço, o ponteiro percorre o anel limpando os bits marcados e despeja
+    o primeiro registro sem marca (segunda chance).
+    """
+
+    def __init__(self, capacidade: int):
+        self.capacidade = capacidade
+        self._offsets: list[int | None] = [None] * capacidade
+        self._filmes: list[Filme | None] = [None] * capacidade
+        self._referenciado = bytearray(capacidade)
+        self._posicoes: dict[int, int] = {}
+        self._ponteiro = 0
+
+    def obter(self, offset: int) -> Filme | None:
+        posicao = self._posicoes.get(offset)
+        if posicao is None:
+            return None
+        self._referenciado[posicao] = 1
+        return self._filmes[posicao]
+
+    def espiar(self, offset: int) -> Filme | None:
+        """Consulta sem marcar o bit de referência."""
+        posicao = self._posicoes.get(offset)
+        return None if posicao is None else self._filmes[posicao]
+
+    def guardar(self, offset: int, filme: Filme) -> int:
+        posicao = self._posicoes.get(offset)
+        if posicao is not None:
+            self._filmes[posicao] = filme
+            self._referenciado[posicao] = 1
+            return 0
+        while self._referenciado[self._ponteiro]:
+            self._referenciado[self._ponteiro] = 0
+            self._ponteiro = (self._ponteiro + 1) % self.capacidade
+        posicao = self._ponteiro
+        self._ponteiro = (self._ponteiro + 1) % self.capacidade
+        despejado = self._offsets[posicao]
+        if despejado is not None:
+            del self._posicoes[despejado]
+        self._offsets[posicao] = offset
+        self._filmes[posicao] = filme
+        self._posicoes[offset] = posicao
+        return 0 if despejado is None else 1
+
+    def limpar(self):
+        self.__init__(self.capacidade)
+
+    def __len__(self):
+        return len(self._posicoes)
+
+class CacheRegistros:
+    """
+    Cache dos filmes já decodificados de um arquivo binário, por offset, compartilhado
+    por todas as leituras do processo (o FilmeStore de cada arquivo tem o seu). Filmes
+    populares não são decodificados de novo a cada busca. Limitado a `capacidade`
+    registros, com despejo LRU ou CLOCK; conta acertos, falhas e despejos.
+    Os offsets de um arquivo não mudam enquanto ele está aberto (os registros só são
+    acrescentados ao final), então o cache só é descartado quando o arquivo é fechado.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_REGISTROS, politica: str = POLITICA_LRU):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de cache desconhecida: {politica}")
+        self.politica = politica
+        self.capacidade = capacidade
+        self._politica = (_PoliticaClock if politica == POLITICA_CLOCK else _PoliticaLRU)(max(capacidade, 1))
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def __len__(self):
+        return len(self._politica)
+
+    def obter(self, offset: int) -> Filme | None:
+        if self.capacidade <= 0:
+            return None
+        filme = self._politica.obter(offset)
+        if filme is None:
+            self.falhas += 1
+        else:
+            self.acertos += 1
+        return filme
+
+    def guardar(self, offset: int, filme: Filme):
+        if self.capacidade > 0:
+            self.despejos += self._politica.guardar(offset, filme)
+
+    def reaproveitar(self, offset: int, filme: Filme) -> Filme:
+        """
+        Usado pelas varreduras sequenciais, que já decodificaram o registro: retorna o filme
+        em cache para o offset, se houver, ou o filme recebido. Não guarda nada, não mexe na
+        ordem de uso e não conta acerto nem falha: uma varredura ampla (ex: um gênero comum)
+        passaria boa parte do catálogo pelo cache e despejaria os filmes populares.
+        """
+        if self.capacidade <= 0:
+            return filme
+        em_cache = self._politica.espiar(offset)
+        return filme if em_cache is None else em_cache
+
+    def limpar(self):
+        self._politica.limpar()
+
+    def taxa_acertos(self) -> float:
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def resumo(self) -> str:
+        return (f"🗃️ Cache de registros ({self.politica.upper()}): {len(self)}/{self.capacidade} filme(s), "
+                f"{self.acertos} acerto(s), {self.falhas} falha(s) (taxa {self.taxa_acertos():.0%}), "
+                f"{self.despejos} despejo(s)")
@@ -1,15 +1,20 @@
 # src/cli.py (antigo menu.py - MODIFICADO)
 
+import time
 from pathlib import Path
 from src.buscas import buscar_filmes_com_filtros
+from src.cache_buscas import obter_cache_buscas
+from src.cursor_resultados import CursorResultados
+from src.binary_store import obter_store
 from src.index_builder import IndexBuilder
-from src.estatisticas import gerar_estatisticas
+from src.estatisticas import relatorio_por_decada, relatorio_genero_por_ano, relatorio_top_diretores
 from src.extrator import carregar_nome_diretores, carregar_diretores_por_titulo, extrair_filmes
 
-def exibir_resultados_paginados(filmes: list, itens_por_pagina: int = 10):
+def exibir_resultados_paginados(filmes: list | CursorResultados, itens_por_pagina: int = 10):
     """
     Exibe uma lista de filmes de forma paginada, permitindo ao usuário navegar
     entre as páginas e reordenar os resultados.
+    Com um CursorResultados, só os filmes da página exibida são lidos do disco.
     """
     if not filmes:
         print("🔍 Nenhum filme encontrado.")
@@ -25,8 +30,8 @@ def exibir_resultados_paginados(filmes: list, itens_por_pagina: int = 10):
         inicio = (pagina_atual - 1) * itens_por_pagina
         fim = min(inicio + itens_por_pagina, total_filmes)
 
-        for i in range(inicio, fim):
-            print(f"🔸 {filmes[i]}")
+        for filme in filmes[inicio:fim]:
+            print(f"🔸 {filme}")
 
         print("\n📖 Opções de navegação:")
         print("n = próxima página | p = página anterior | r = reordenar | s = sair da visualização")
@@ -76,17 +81,43 @@ def exibir_resultados_paginados(filmes: list, itens_por_pagina: int = 10):
             print("❌ Opção inválida. Tente novamente.")
 
 
-def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.bin"):
+def sugerir_diretor(index_builder: IndexBuilder, diretor: str) -> str | None:
+    """
+    Mostra os diretores com nome mais parecido com o informado e retorna o escolhido
+    pelo usuário, ou None se não houver sugestões ou nenhuma for escolhida.
+    """
+    inicio = time.perf_counter()
+    sugestoes = index_builder.indice_diretores.buscar_semelhantes(diretor, limite=5)
+    if not sugestoes:
+        return None
+    print(f"\n💡 Diretores com nome parecido ({(time.perf_counter() - inicio) * 1000:.1f} ms):")
+    for i, (nome, semelhanca) in enumerate(sugestoes, 1):
+        print(f"{i}. {nome} (semelhança {semelhanca:.0%})")
+    escolha = input("Escolha um diretor (ou Enter para voltar): ").strip()
+    if escolha.isdigit() and 1 <= int(escolha) <= len(sugestoes):
+        return sugestoes[int(escolha) - 1][0]
+    return None
+
+
+def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.bin",
+                   inicio: float | None = None):
     """
     Função principal da interface de linha de comando.
+    inicio: instante (time.perf_counter) em que o programa começou; quando informado, o
+    menu exibe o tempo até o primeiro prompt e até o primeiro resultado de busca.
     """
     print("\n📚 Bem-vindo ao sistema de busca SixChairs!")
+    if inicio is not None:
+        print(f"⏱️ Tempo até o primeiro prompt: {time.perf_counter() - inicio:.3f}s")
+    primeira_busca = inicio is not None
     
     while True:
         print("\n--- MENU PRINCIPAL ---")
         print("1. Buscar filmes")
         print("2. Importar novo lote de filmes (TSV simplificado)")
         print("3. Ver estatísticas")
+        print("4. Relatórios (década, gênero por ano, diretores por período)")
+        print("5. Checkpoint dos índices (compacta o log de alterações)")
         print("0. Sair")
 
         opcao_principal = input("Escolha uma opção: ")
@@ -106,6 +137,7 @@ def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.
                 print("4. Buscar por ID")
                 print("5. Buscar por gênero")
                 print("6. Combinação de filtros")
+                print("7. Buscar por palavras do título (em qualquer posição)")
                 print("0. Voltar ao menu principal")
 
                 opcao_busca = input("Escolha uma opção: ")
@@ -114,9 +146,10 @@ def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.
                     break
 
                 prefixo = diretor = id_filme = None
-                ano = genero = None
+                ano = genero = palavras = None
                 ordenar_por_param = 'titulo' 
                 ordem_crescente_param = True 
+                explicar_param = False
 
                 if opcao_busca == "1":
                     prefixo = input("Digite o prefixo do título: ")
@@ -135,6 +168,8 @@ def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.
                 elif opcao_busca == "6":
                     txt = input("Prefixo do título (ou Enter): ")
                     prefixo = txt if txt else None
+                    txt = input("Palavras do título (ou Enter): ")
+                    palavras = txt if txt else None
                     txt = input("Nome do diretor (ou Enter): ")
                     diretor = txt if txt else None
                     txt = input("Ano (ou Enter): ")
@@ -153,29 +188,67 @@ def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.
                     print("1. Título (Padrão: A-Z)")
                     print("2. Ano (Crescente)")
                     print("3. Diretor (A-Z)")
-                    ord_opt = input("Escolha a ordenação inicial (1/2/3 ou Enter para padrão): ")
+                    print("4. Relevância (palavras do título)")
+                    ord_opt = input("Escolha a ordenação inicial (1/2/3/4 ou Enter para padrão): ")
                     if ord_opt == '2':
                         ordenar_por_param = 'ano'
                     elif ord_opt == '3':
                         ordenar_por_param = 'diretor'
+                    elif ord_opt == '4':
+                        ordenar_por_param = 'relevancia'
+                    explicar_param = input("Mostrar o plano de execução da busca? (s/N): ").strip().lower() == 's'
+                elif opcao_busca == "7":
+                    palavras = input("Digite as palavras do título: ")
+                    ordenar_por_param = 'relevancia'
                 else:
                     print("❌ Opção inválida.")
                     continue
 
-                resultados = buscar_filmes_com_filtros(
-                    prefixo_titulo=prefixo,
-                    diretor=diretor,
-                    ano=ano,
-                    id_filme=id_filme,
-                    genero=genero,
-                    trie_obj=index_builder.trie,
-                    hash_diretor_obj=index_builder.hash_diretor,
-                    indice_ano_obj=index_builder.indice_ano,
-                    indice_id_obj=index_builder.indice_id,
-                    caminho_bin=caminho_bin,
-                    ordenar_por=ordenar_por_param,
-                    ordem_crescente=ordem_crescente_param
-                )
+                # Só os índices dos filtros informados são usados (e carregados, se preciso)
+                cache_buscas = obter_cache_buscas(caminho_bin)
+                acertos_antes = cache_buscas.acertos
+                inicio_busca = time.perf_counter()
+                try:
+                    resultados = buscar_filmes_com_filtros(
+                        prefixo_titulo=prefixo,
+                        diretor=diretor,
+                        ano=ano,
+                        id_filme=id_filme,
+                        genero=genero,
+                        trie_obj=index_builder.trie if prefixo else None,
+                        hash_diretor_obj=index_builder.hash_diretor if diretor else None,
+                        indice_ano_obj=index_builder.indice_ano if ano else None,
+                        indice_id_obj=index_builder.indice_id if id_filme else None,
+                        caminho_bin=caminho_bin,
+                        ordenar_por=ordenar_por_param,
+                        ordem_crescente=ordem_crescente_param,
+                        indice_genero_obj=index_builder.indice_genero if genero else None,
+                        explicar=explicar_param,
+                        palavras_titulo=palavras,
+                        indice_palavras_obj=index_builder.indice_palavras if palavras else None,
+                        indice_diretores_obj=index_builder.indice_diretores if diretor else None,
+                        contagem_anos=index_builder.estatisticas.anos.contagens if ano else None
+                    )
+                except Exception as e:
+                    print(f"❌ Erro na busca: {e}")
+                    continue
+
+                if primeira_busca:
+                    agora = time.perf_counter()
+                    print(f"⏱️ Primeira busca em {agora - inicio_busca:.3f}s "
+                          f"({agora - inicio:.3f}s desde o início do programa).")
+                    primeira_busca = False
+                if cache_buscas.acertos > acertos_antes:
+                    print(f"{cache_buscas.resumo()} | busca em {(time.perf_counter() - inicio_busca) * 1000:.1f} ms")
+
+                if not resultados and opcao_busca == "2" and diretor:
+                    # Diretor não encontrado: sugere os nomes mais parecidos (busca por trigramas)
+                    diretor = sugerir_diretor(index_builder, diretor)
+                    if diretor:
+                        resultados = buscar_filmes_com_filtros(
+                            None, diretor, None, None, None, None, index_builder.hash_diretor,
+                            None, None, caminho_bin, indice_diretores_obj=index_builder.indice_diretores
+                        )
                 
                 exibir_resultados_paginados(resultados)
 
@@ -200,7 +273,47 @@ def menu_principal(index_builder: IndexBuilder, caminho_bin: str = "data/filmes.
                 print(f"❌ Erro ao importar lote: {e}")
 
         elif opcao_principal == "3": # Ver estatísticas
-            gerar_estatisticas(caminho_bin)
+            # Agregados mantidos pelo IndexBuilder: não percorre o catálogo
+            index_builder.estatisticas.exibir()
+            print(obter_cache_buscas(caminho_bin).resumo())
+            print(obter_store(caminho_bin).cache.resumo())
+
+        elif opcao_principal == "4": # Relatórios sobre as colunas de estatísticas
+            while True:
+                print("\n--- RELATÓRIOS ---")
+                print("1. Filmes por década")
+                print("2. Gênero por ano")
+                print("3. Top diretores em um intervalo de anos")
+                print("0. Voltar ao menu principal")
+
+                opcao_relatorio = input("Escolha uma opção: ")
+
+                if opcao_relatorio == "0":
+                    break
+                elif opcao_relatorio == "1":
+                    relatorio_por_decada(index_builder.colunas)
+                elif opcao_relatorio == "2":
+                    genero = input("Digite o gênero: ").strip()
+                    if genero:
+                        relatorio_genero_por_ano(index_builder.colunas, genero)
+                elif opcao_relatorio == "3":
+                    try:
+                        ano_min = int(input("Ano inicial: "))
+                        ano_max = int(input("Ano final: "))
+                        txt = input("Quantidade de diretores (Enter para 10): ")
+                        n = int(txt) if txt else 10
+                    except ValueError:
+                        print("❌ Valor inválido.")
+                        continue
+                    relatorio_top_diretores(index_builder.colunas, ano_min, ano_max, n)
+                else:
+                    print("❌ Opção inválida.")
+
+        elif opcao_principal == "5": # Checkpoint: grava um novo snapshot dos índices e esvazia o log
+            try:
+                index_builder.checkpoint()
+            except Exception as e:
+                print(f"❌ Erro no checkpoint dos índices: {e}")
 
         else:
             print("❌ Opção inválida.")
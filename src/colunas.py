@@ -0,0 +1,80 @@
+# src/colunas.py
+
+import os
+import struct
+from array import array
+
+from src.filme import Filme
+from src.binary_store import iterar_filmes_binario
+from src.formato_compacto import DicionarioColuna
+
+MAGICO = b"SIXCOL02"
+# Versão anterior, com os valores dos dicionários separados por NUL (ainda lida)
+MAGICO_V1 = b"SIXCOL01"
+
+# Cabeçalho: mágico, quantidade de filmes, tamanho do dicionário de gêneros e de diretores (em bytes)
+FORMATO_CABECALHO = "<8sqqq"
+
+class ColunasFilmes:
+    """
+    Arquivo auxiliar colunar (colunas.idx) com uma posição por registro de filmes.bin:
+    o ano e os códigos de gênero e de diretor em arrays compactos, mais os dicionários
+    que traduzem os códigos de volta para texto. Permite agregações sobre o catálogo
+    inteiro sem ler nem decodificar os registros do arquivo binário.
+    """
+
+    def __init__(self):
+        self.anos = array("i")
+        self.generos = array("I")
+        self.diretores = array("I")
+        self.dicionario_generos = DicionarioColuna()
+        self.dicionario_diretores = DicionarioColuna()
+
+    def __len__(self):
+        return len(self.anos)
+
+    def adicionar(self, filme: Filme):
+        """Acrescenta as colunas de um novo registro (na mesma ordem do arquivo binário)."""
+        self.anos.append(filme.ano)
+        self.generos.append(self.dicionario_generos.codificar(filme.genero))
+        self.diretores.append(self.dicionario_diretores.codificar(filme.diretor))
+
+    @classmethod
+    def construir_do_binario(cls, caminho_bin: str) -> "ColunasFilmes":
+        """Monta as colunas percorrendo o arquivo binário uma única vez."""
+        colunas = cls()
+        for _, filme in iterar_filmes_binario(caminho_bin):
+            colunas.adicionar(filme)
+        return colunas
+
+    def salvar(self, caminho: str):
+        generos = self.dicionario_generos.para_bytes()
+        diretores = self.dicionario_diretores.para_bytes()
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as f:
+            f.write(struct.pack(FORMATO_CABECALHO, MAGICO, len(self.anos), len(generos), len(diretores)))
+            self.anos.tofile(f)
+            self.generos.tofile(f)
+            self.diretores.tofile(f)
+            f.write(generos)
+            f.write(diretores)
+        os.replace(temporario, caminho)
+        print(f"📁 Colunas de estatísticas salvas em: {caminho}")
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "ColunasFilmes":
+        colunas = cls()
+        with open(caminho, "rb") as f:
+            cabecalho = f.read(struct.calcsize(FORMATO_CABECALHO))
+            if len(cabecalho) < struct.calcsize(FORMATO_CABECALHO):
+                raise ValueError(f"Arquivo de colunas inválido: {caminho}")
+            magico, n, tam_generos, tam_diretores = struct.unpack(FORMATO_CABECALHO, cabecalho)
+            if magico not in (MAGICO, MAGICO_V1):
+                raise ValueError(f"Arquivo não é um arquivo de colunas: {caminho}")
+            colunas.anos.fromfile(f, n)
+            colunas.generos.fromfile(f, n)
+            colunas.diretores.fromfile(f, n)
+            ler_dicionario = DicionarioColuna.de_bytes if magico == MAGICO else DicionarioColuna.de_bytes_separados
+            colunas.dicionario_generos = ler_dicionario(f.read(tam_generos))
+            colunas.dicionario_diretores = ler_dicionario(f.read(tam_diretores))
+        return colunas
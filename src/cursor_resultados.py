@@ -0,0 +1,119 @@
+# src/cursor_resultados.py
+
+import heapq
+from typing import Callable, Iterator, Sequence
+
+from src.filme import Filme
+from src.binary_store import obter_store
+
+# Offsets lidos do disco por vez quando o cursor é percorrido ou reordenado inteiro
+TAMANHO_LOTE_LEITURA = 512
+
+# Memória aproximada de cada entrada de uma OrdemPreguicosa (tupla do heap, chave e offset
+# como objetos Python), medida em offsets de 8 bytes de um array
+PESO_ENTRADA = 20
+
+class _Invertida:
+    """Chave com a comparação invertida, para a ordem decrescente no heap."""
+    __slots__ = ("valor",)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __lt__(self, outra: "_Invertida") -> bool:
+        return outra.valor < self.valor
+
+    def __eq__(self, outra) -> bool:
+        return self.valor == outra.valor
+
+class OrdemPreguicosa:
+    """
+    Sequência de offsets colocada em ordem sob demanda: recebe os pares (chave, offset) do
+    resultado na ordem atual, monta um heap em O(n) e só retira dele os offsets que alguém
+    pede (top-K). A primeira página sai sem ordenar o resultado inteiro; os offsets já
+    retirados ficam guardados, então as páginas seguintes continuam de onde parou.
+    A ordem final é a mesma de list.sort (estável, inclusive com reverso=True).
+    """
+
+    def __init__(self, pares: Sequence[tuple], reverso: bool = False):
+        chave = _Invertida if reverso else (lambda valor: valor)
+        self._heap = [(chave(valor), posicao, offset) for posicao, (valor, offset) in enumerate(pares)]
+        heapq.heapify(self._heap)
+        self._ordenados: list[int] = []
+        self._total = len(self._heap)
+
+    def __len__(self):
+        return self._total
+
+    @property
+    def completa(self) -> bool:
+        """True quando todos os offsets já saíram do heap (a ordem está toda materializada)."""
+        return not self._heap
+
+    def _garantir(self, quantidade: int):
+        """Retira do heap até haver `quantidade` offsets em ordem."""
+        heap, ordenados = self._heap, self._ordenados
+        while len(ordenados) < quantidade and heap:
+            ordenados.append(heapq.heappop(heap)[2])
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(self._total)
+            self._garantir(fim if passo > 0 else self._total)
+        else:
+            self._garantir(indice + 1 if indice >= 0 else self._total)
+        return self._ordenados[indice]
+
+    def __iter__(self) -> Iterator[int]:
+        for posicao in range(self._total):
+            yield self[posicao]
+
+class CursorResultados:
+    """
+    Resultado de uma busca sem os filmes em memória: os offsets (em uma lista, em um array
+    do cache de buscas ou em uma OrdemPreguicosa) e o total. Os filmes de uma página são
+    lidos do disco (pelo FilmeStore e seu cache de registros) só quando a página é pedida.
+    Funciona como uma lista de Filme para quem o percorre: len, índice, fatias, iteração e
+    sort (reordenação pelo heap, lendo as chaves em lotes).
+    """
+
+    def __init__(self, offsets: Sequence[int], caminho_bin: str = "data/filmes.bin"):
+        self.offsets = offsets
+        self.caminho_bin = caminho_bin
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __bool__(self):
+        return len(self.offsets) > 0
+
+    def __getitem__(self, indice) -> Filme | list[Filme]:
+        store = obter_store(self.caminho_bin)
+        if isinstance(indice, slice):
+            return store.fetch(self.offsets[indice])
+        filmes = store.fetch([self.offsets[indice]])
+        if not filmes:
+            raise IndexError(f"Offset inválido na posição {indice} do resultado")
+        return filmes[0]
+
+    def pagina(self, numero: int, itens_por_pagina: int) -> list[Filme]:
+        """Filmes da página informada (a partir de 1)."""
+        inicio = (numero - 1) * itens_por_pagina
+        return self[inicio:inicio + itens_por_pagina]
+
+    def _pares(self) -> Iterator[tuple[int, Filme]]:
+        """Pares (offset, Filme) de todo o resultado, lidos em lotes e na ordem atual."""
+        store = obter_store(self.caminho_bin)
+        for inicio in range(0, len(self.offsets), TAMANHO_LOTE_LEITURA):
+            yield from store.fetch_pares(self.offsets[inicio:inicio + TAMANHO_LOTE_LEITURA])
+
+    def __iter__(self) -> Iterator[Filme]:
+        for _, filme in self._pares():
+            yield filme
+
+    def sort(self, key: Callable[[Filme], object], reverse: bool = False):
+        """
+        Reordena o resultado pela chave: as chaves são calculadas lendo os registros em
+        lotes (sem manter os filmes) e a nova ordem é uma OrdemPreguicosa.
+        """
+        self.offsets = OrdemPreguicosa([(key(filme), offset) for offset, filme in self._pares()], reverse)
@@ -1,52 +1,140 @@
-# src/estatisticas.py 
+# src/estatisticas.py
 
-import struct
+import pickle
 from collections import defaultdict, Counter
-from src.filme import Filme 
+from itertools import compress
 
-# FORMATO_REGISTRO pode ser removido se Filme.FORMATO_REGISTRO for usado,
-# mas para manter compatibilidade com o unpack local, deixamos por enquanto.
-FORMATO_REGISTRO = "10s100si20s100s"
+from src.filme import Filme
+from src.colunas import ColunasFilmes
 
-def gerar_estatisticas(caminho_bin="data/filmes.bin"):
-    total = 0
-    por_ano = defaultdict(int)
-    por_genero = defaultdict(int)
-    por_diretor = defaultdict(int)
+# NumPy é opcional: com ele as agregações usam bincount sobre as colunas;
+# sem ele, Counter sobre os arrays (contagem feita em C) produz o mesmo resultado.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    try:
-        with open(caminho_bin, "rb") as f:
-            while True:
-                bytes_lidos = f.read(Filme.TAMANHO_REGISTRO) 
-                if not bytes_lidos:
-                    break
+# Quantidade de itens exibidos em cada ranking da tela de estatísticas
+TOP_N = 5
+
+#-------------------------------#
+#  Agregações sobre as colunas  #
+#-------------------------------#
+def _contar_codigos(codigos, tamanho: int) -> list[int]:
+    """Quantidade de registros por código (gênero ou diretor)."""
+    if np is not None and len(codigos):
+        return np.bincount(np.frombuffer(codigos, dtype=np.uint32), minlength=tamanho).tolist()
+    contagem = [0] * tamanho
+    for codigo, qtd in Counter(codigos).items():
+        contagem[codigo] = qtd
+    return contagem
+
+def _contar_anos(anos) -> Counter:
+    """Quantidade de registros por ano."""
+    if np is not None and len(anos):
+        valores, qtds = np.unique(np.frombuffer(anos, dtype=np.int32), return_counts=True)
+        return Counter(dict(zip(valores.tolist(), qtds.tolist())))
+    return Counter(anos)
+
+def _mascara_intervalo(anos, ano_min: int, ano_max: int):
+    """Seleção dos registros com ano no intervalo [ano_min, ano_max]."""
+    if np is not None:
+        valores = np.frombuffer(anos, dtype=np.int32)
+        return (valores >= ano_min) & (valores <= ano_max)
+    return [ano_min <= ano <= ano_max for ano in anos]
 
-                id_b, titulo_b, ano, genero_b, diretor_b = struct.unpack(FORMATO_REGISTRO, bytes_lidos)
+def _selecionar(codigos, mascara):
+    """Códigos dos registros selecionados pela máscara."""
+    if np is not None:
+        return np.frombuffer(codigos, dtype=np.uint32)[mascara]
+    return list(compress(codigos, mascara))
 
-                ano = int(ano)
-                genero = genero_b.decode("utf-8").strip("\x00")
-                diretor = diretor_b.decode("utf-8").strip("\x00")
+def _expandir_generos(colunas: ColunasFilmes, por_codigo: list[int]) -> Counter:
+    """
+    Converte contagens por código de gênero (o texto completo do campo, ex: "Drama,Romance")
+    em contagens por gênero individual.
+    """
+    por_genero = Counter()
+    for codigo, qtd in enumerate(por_codigo):
+        if qtd:
+            for g in colunas.dicionario_generos.valores[codigo].split(","):
+                por_genero[g.strip()] += qtd
+    return por_genero
 
-                total += 1
-                por_ano[ano] += 1
-                por_diretor[diretor] += 1
+def contar_por_decada(colunas: ColunasFilmes) -> dict[int, int]:
+    """Quantidade de filmes por década (1990 -> filmes de 1990 a 1999)."""
+    por_decada = defaultdict(int)
+    for ano, qtd in _contar_anos(colunas.anos).items():
+        por_decada[ano // 10 * 10] += qtd
+    return dict(sorted(por_decada.items()))
 
-                for g in genero.split(","):
-                    por_genero[g.strip()] += 1
+def contar_genero_por_ano(colunas: ColunasFilmes, genero: str) -> dict[int, int]:
+    """Quantidade de filmes de um gênero em cada ano."""
+    genero_lower = genero.strip().lower()
+    codigos = [codigo for codigo, valor in enumerate(colunas.dicionario_generos.valores)
+               if genero_lower in (g.strip().lower() for g in valor.split(","))]
+    if not codigos:
+        return {}
+    if np is not None:
+        mascara = np.isin(np.frombuffer(colunas.generos, dtype=np.uint32), codigos)
+        anos = np.frombuffer(colunas.anos, dtype=np.int32)[mascara]
+        valores, qtds = np.unique(anos, return_counts=True)
+        return dict(zip(valores.tolist(), qtds.tolist()))
+    selecionados = set(codigos)
+    mascara = [codigo in selecionados for codigo in colunas.generos]
+    return dict(sorted(Counter(compress(colunas.anos, mascara)).items()))
+
+def top_diretores_no_intervalo(colunas: ColunasFilmes, ano_min: int, ano_max: int,
+                               n: int = 10) -> list[tuple[str, int]]:
+    """Os N diretores com mais filmes lançados entre ano_min e ano_max."""
+    mascara = _mascara_intervalo(colunas.anos, ano_min, ano_max)
+    codigos = _selecionar(colunas.diretores, mascara)
+    if np is not None:
+        contagem = np.bincount(codigos, minlength=len(colunas.dicionario_diretores)).tolist()
+    else:
+        contagem = _contar_codigos(codigos, len(colunas.dicionario_diretores))
+    ranking = Counter({colunas.dicionario_diretores.valores[c]: q for c, q in enumerate(contagem) if q})
+    return ranking.most_common(n)
+
+#-------------------#
+#  Relatório geral  #
+#-------------------#
+def _obter_colunas(caminho_bin: str, colunas: ColunasFilmes | None) -> ColunasFilmes | None:
+    """Usa as colunas já carregadas ou, na falta delas, monta-as a partir do binário."""
+    if colunas is not None:
+        return colunas
+    try:
+        return ColunasFilmes.construir_do_binario(caminho_bin)
     except FileNotFoundError:
         print(f"⚠️ Arquivo binário não encontrado: {caminho_bin}. Nenhuma estatística gerada.")
-        return
     except Exception as e:
         print(f"❌ Erro ao ler dados para estatísticas: {e}")
+    return None
+
+def gerar_estatisticas(caminho_bin="data/filmes.bin", colunas: ColunasFilmes | None = None):
+    colunas = _obter_colunas(caminho_bin, colunas)
+    if colunas is None:
         return
 
+    total = len(colunas)
     if total == 0:
         print("📊 Nenhum dado de filme encontrado para gerar estatísticas.")
         return
 
-    mais_ano = max(por_ano.items(), key=lambda x: x[1]) if por_ano else (None, 0)
-    mais_genero = max(por_genero.items(), key=lambda x: x[1]) if por_genero else (None, 0)
-    mais_diretor = max(por_diretor.items(), key=lambda x: x[1]) if por_diretor else (None, 0)
+    por_ano = _contar_anos(colunas.anos)
+    por_genero = _expandir_generos(colunas, _contar_codigos(colunas.generos, len(colunas.dicionario_generos)))
+    por_codigo_diretor = _contar_codigos(colunas.diretores, len(colunas.dicionario_diretores))
+    por_diretor = Counter({colunas.dicionario_diretores.valores[c]: q
+                           for c, q in enumerate(por_codigo_diretor) if q})
+
+    _exibir_resumo(total, por_ano.most_common(TOP_N), por_genero.most_common(TOP_N),
+                   por_diretor.most_common(TOP_N))
+
+def _exibir_resumo(total: int, top_anos: list, top_generos: list, top_diretores: list):
+    """Imprime a tela de estatísticas a partir dos rankings já calculados."""
+    mais_ano = top_anos[0] if top_anos else (None, 0)
+    mais_genero = top_generos[0] if top_generos else (None, 0)
+    mais_diretor = top_diretores[0] if top_diretores else (None, 0)
 
     print("\n📊 Estatísticas dos Filmes")
     print("-------------------------")
@@ -55,23 +143,144 @@ def gerar_estatisticas(caminho_bin="data/filmes.bin"):
     print(f"🎭 Gênero mais comum: {mais_genero[0]} ({mais_genero[1]})")
     print(f"🎬 Diretor com mais filmes: {mais_diretor[0]} ({mais_diretor[1]})")
 
-    print("\nTop 5 Gêneros:")
-    if por_genero:
-        for genero, qtd in Counter(por_genero).most_common(5):
+    print(f"\nTop {TOP_N} Gêneros:")
+    if top_generos:
+        for genero, qtd in top_generos:
             print(f" - {genero}: {qtd} filme(s)")
     else:
         print(" - N/A")
 
-    print("\nTop 5 Diretores:")
-    if por_diretor:
-        for diretor, qtd in Counter(por_diretor).most_common(5):
+    print(f"\nTop {TOP_N} Diretores:")
+    if top_diretores:
+        for diretor, qtd in top_diretores:
             print(f" - {diretor}: {qtd} filme(s)")
     else:
         print(" - N/A")
 
-    print("\nTop 5 Anos com mais filmes:")
-    if por_ano:
-        for ano, qtd in Counter(por_ano).most_common(5):
+    print(f"\nTop {TOP_N} Anos com mais filmes:")
+    if top_anos:
+        for ano, qtd in top_anos:
             print(f" - {ano}: {qtd} filme(s)")
     else:
         print(" - N/A")
+
+#-----------------------------#
+#  Estatísticas incrementais  #
+#-----------------------------#
+class RankingIncremental:
+    """
+    Contagens de um atributo (ano, gênero ou diretor) com os N primeiros colocados
+    mantidos a cada incremento. Como as contagens só crescem, apenas a chave
+    incrementada pode entrar no ranking, e a atualização custa O(N).
+    Empates são desempatados pela ordem em que as chaves apareceram, como em
+    Counter.most_common.
+    """
+
+    def __init__(self, n: int = TOP_N):
+        self.n = n
+        self.contagens = {}
+        self._ordem = {}   # chave -> posição da primeira ocorrência
+        self.topo = []     # chaves do ranking, da mais frequente para a menos
+
+    def _posicao(self, chave):
+        return (-self.contagens[chave], self._ordem[chave])
+
+    def incrementar(self, chave, qtd: int = 1):
+        if chave not in self.contagens:
+            self._ordem[chave] = len(self._ordem)
+            self.contagens[chave] = 0
+        self.contagens[chave] += qtd
+
+        if chave not in self.topo:
+            if len(self.topo) < self.n:
+                self.topo.append(chave)
+            elif self._posicao(chave) < self._posicao(self.topo[-1]):
+                self.topo[-1] = chave
+            else:
+                return
+        self.topo.sort(key=self._posicao)
+
+    def mais_comuns(self) -> list[tuple]:
+        return [(chave, self.contagens[chave]) for chave in self.topo]
+
+    def __len__(self):
+        return len(self.contagens)
+
+class EstatisticasIncrementais:
+    """
+    Agregados do catálogo (total e contagens por ano, gênero e diretor) mantidos pelo
+    IndexBuilder a cada filme adicionado e salvos junto com os índices. A tela de
+    estatísticas é exibida a partir deles sem percorrer o catálogo.
+    """
+
+    def __init__(self, n: int = TOP_N):
+        self.total = 0
+        self.anos = RankingIncremental(n)
+        self.generos = RankingIncremental(n)
+        self.diretores = RankingIncremental(n)
+
+    def adicionar(self, filme: Filme):
+        self.total += 1
+        self.anos.incrementar(filme.ano)
+        self.diretores.incrementar(filme.diretor)
+        for g in filme.genero.split(","):
+            self.generos.incrementar(g.strip())
+
+    def adicionar_lote(self, filmes: list[Filme]):
+        """
+        Adiciona vários filmes de uma vez: as contagens do lote são agregadas antes e
+        cada chave distinta é incrementada uma só vez (na ordem em que apareceu).
+        """
+        anos, generos, diretores = Counter(), Counter(), Counter()
+        for filme in filmes:
+            anos[filme.ano] += 1
+            diretores[filme.diretor] += 1
+            for g in filme.genero.split(","):
+                generos[g.strip()] += 1
+        self.total += len(filmes)
+        for ranking, contagem in ((self.anos, anos), (self.generos, generos), (self.diretores, diretores)):
+            for chave, qtd in contagem.items():
+                ranking.incrementar(chave, qtd)
+
+    def exibir(self):
+        if self.total == 0:
+            print("📊 Nenhum dado de filme encontrado para gerar estatísticas.")
+            return
+        _exibir_resumo(self.total, self.anos.mais_comuns(), self.generos.mais_comuns(),
+                       self.diretores.mais_comuns())
+
+def salvar_estatisticas_em_arquivo(estatisticas: EstatisticasIncrementais, caminho: str) -> None:
+    with open(caminho, "wb") as f:
+        pickle.dump(estatisticas, f)
+    print(f"📁 Estatísticas salvas em: {caminho}")
+
+def carregar_estatisticas_de_arquivo(caminho: str) -> EstatisticasIncrementais:
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
+
+#-------------------------#
+#  Relatórios adicionais  #
+#-------------------------#
+def relatorio_por_decada(colunas: ColunasFilmes):
+    print("\n📅 Filmes por década:")
+    por_decada = contar_por_decada(colunas)
+    if not por_decada:
+        print(" - N/A")
+    for decada, qtd in por_decada.items():
+        print(f" - {decada}s: {qtd} filme(s)")
+
+def relatorio_genero_por_ano(colunas: ColunasFilmes, genero: str):
+    print(f"\n🎭 Filmes de '{genero}' por ano:")
+    por_ano = contar_genero_por_ano(colunas, genero)
+    if not por_ano:
+        print(" - N/A")
+    for ano, qtd in por_ano.items():
+        print(f" - {ano}: {qtd} filme(s)")
+
+def relatorio_top_diretores(colunas: ColunasFilmes, ano_min: int, ano_max: int, n: int = 10):
+    print(f"\n🎬 Top {n} diretores entre {ano_min} e {ano_max}:")
+    ranking = top_diretores_no_intervalo(colunas, ano_min, ano_max, n)
+    if not ranking:
+        print(" - N/A")
+    for diretor, qtd in ranking:
+        print(f" - {diretor}: {qtd} filme(s)")
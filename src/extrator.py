@@ -1,9 +1,21 @@
 # extrator.py
 
 import csv
-from typing import List, Dict
+import sys
+import time
+from typing import List, Dict, Iterator
 from src.filme import Filme
 
+try:
+    import resource
+except ImportError:  # Windows não possui o módulo resource
+    resource = None
+
+VALOR_NULO = r'\N'
+
+# A cada quantas linhas (ou filmes gerados) o pico de memória é conferido dentro das etapas
+INTERVALO_VERIFICACAO_TETO = 100_000
+
 #---------------------------#
 #  Carregar_nome_diretores  #
 #---------------------------#
@@ -69,4 +81,173 @@ def extrair_filmes(basics_tsv: str,
             if len(filmes) >= limite:
                 break
 
-    return filmes
\ No newline at end of file
+    return filmes
+
+#-----------------------------------------#
+#  Extração em etapas (memória limitada)  #
+#-----------------------------------------#
+def _pico_memoria_mb() -> float | None:
+    """Retorna o pico de memória residente (RSS) do processo em MB, se disponível."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def _verificar_teto(teto_memoria_mb: float | None, etapa: str, adicional_mb: float = 0.0):
+    """
+    Interrompe a extração se o pico de memória ultrapassar o teto configurado. Chamada a
+    cada INTERVALO_VERIFICACAO_TETO linhas dentro das etapas, e não só ao fim de cada uma,
+    para que a extração pare logo depois de passar do teto.
+    adicional_mb: memória de outros processos somada ao pico deste (ex: o que os
+    trabalhadores da extração paralela alocaram).
+    """
+    if teto_memoria_mb is None:
+        return
+    pico = _pico_memoria_mb()
+    if pico is not None:
+        pico += adicional_mb
+    if pico is not None and pico > teto_memoria_mb:
+        raise MemoryError(f"Extração excedeu o teto de memória na etapa '{etapa}': "
+                          f"{pico:.0f} MB > {teto_memoria_mb:.0f} MB")
+
+def _relatar_etapa(etapa: str, linhas: int, inicio: float):
+    """Imprime linhas processadas, vazão e pico de memória de uma etapa."""
+    duracao = time.perf_counter() - inicio
+    vazao = linhas / duracao if duracao > 0 else 0.0
+    pico = _pico_memoria_mb()
+    pico_txt = f"{pico:.0f} MB" if pico is not None else "n/d"
+    print(f"   ⏱️ {etapa}: {linhas} linhas em {duracao:.1f}s ({vazao:,.0f} linhas/s) | pico RSS: {pico_txt}")
+
+def _ler_tsv(caminho: str) -> Iterator[list[str]]:
+    """
+    Lê um TSV do IMDb linha a linha com um split simples (sem csv.DictReader).
+    A primeira linha gerada é o cabeçalho.
+    """
+    with open(caminho, encoding='utf-8-sig') as f:
+        for linha in f:
+            yield linha.rstrip('\n').split('\t')
+
+def _id_numerico(identificador: str) -> int | None:
+    """Converte 'tt0000001' / 'nm0000001' em inteiro, para ocupar menos memória nos conjuntos."""
+    try:
+        return int(identificador[2:])
+    except ValueError:
+        return None
+
+def _filme_valido(campos: list[str], col: dict[str, int]) -> bool:
+    """Aplica os mesmos filtros de extrair_filmes: apenas filmes com ano e gênero."""
+    if campos[col['titleType']] != 'movie':
+        return False
+    ano = campos[col['startYear']]
+    genero = campos[col['genres']]
+    if ano in (VALOR_NULO, '') or genero in (VALOR_NULO, ''):
+        return False
+    try:
+        int(ano)
+    except ValueError:
+        return False
+    return True
+
+def _colunas(cabecalho: list[str]) -> dict[str, int]:
+    """Mapeia o nome de cada coluna para sua posição."""
+    return {nome: i for i, nome in enumerate(cabecalho)}
+
+def extrair_filmes_em_etapas(basics_tsv: str,
+                             crew_tsv: str,
+                             nomes_tsv: str,
+                             limite: int | None = None,
+                             teto_memoria_mb: float | None = None) -> Iterator[Filme]:
+    """
+    Extrai filmes dos TSVs do IMDb sem carregar os arquivos inteiros em dicionários:
+      1. title.basics: coleta apenas os tconsts de filmes válidos;
+      2. title.crew:   guarda o primeiro diretor somente desses tconsts;
+      3. name.basics:  guarda o nome somente dos nconsts necessários;
+      4. title.basics: gera os objetos Filme na ordem do arquivo.
+    A memória fica proporcional ao número de filmes, não ao tamanho dos dumps.
+    Cada etapa informa linhas/s e pico de RSS; se teto_memoria_mb for informado,
+    a extração é interrompida com MemoryError ao ultrapassá-lo (conferido durante as
+    etapas, inclusive enquanto os filmes gerados são consumidos).
+    """
+    print("📥 Etapa 1/4: coletando tconsts de filmes em title.basics...")
+    inicio = time.perf_counter()
+    leitor = _ler_tsv(basics_tsv)
+    col = _colunas(next(leitor))
+    tconsts_filmes = set()
+    linhas = 0
+    for campos in leitor:
+        linhas += 1
+        if linhas % INTERVALO_VERIFICACAO_TETO == 0:
+            _verificar_teto(teto_memoria_mb, "title.basics")
+        if _filme_valido(campos, col):
+            tconst = _id_numerico(campos[col['tconst']])
+            if tconst is not None:
+                tconsts_filmes.add(tconst)
+    _relatar_etapa("title.basics (tconsts)", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "title.basics")
+
+    print("📥 Etapa 2/4: filtrando diretores em title.crew...")
+    inicio = time.perf_counter()
+    leitor = _ler_tsv(crew_tsv)
+    col = _colunas(next(leitor))
+    diretor_por_titulo: dict[int, int] = {}
+    linhas = 0
+    for campos in leitor:
+        linhas += 1
+        if linhas % INTERVALO_VERIFICACAO_TETO == 0:
+            _verificar_teto(teto_memoria_mb, "title.crew")
+        tconst = _id_numerico(campos[col['tconst']])
+        if tconst not in tconsts_filmes:
+            continue
+        diretores_ids = campos[col['directors']]
+        if diretores_ids and diretores_ids != VALOR_NULO:
+            nconst = _id_numerico(diretores_ids.split(',')[0])
+            if nconst is not None:
+                diretor_por_titulo[tconst] = nconst
+    del tconsts_filmes
+    _relatar_etapa("title.crew", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "title.crew")
+
+    print("📥 Etapa 3/4: carregando nomes dos diretores necessários em name.basics...")
+    inicio = time.perf_counter()
+    leitor = _ler_tsv(nomes_tsv)
+    col = _colunas(next(leitor))
+    nconsts_necessarios = set(diretor_por_titulo.values())
+    nomes: dict[int, str] = {}
+    linhas = 0
+    for campos in leitor:
+        linhas += 1
+        if linhas % INTERVALO_VERIFICACAO_TETO == 0:
+            _verificar_teto(teto_memoria_mb, "name.basics")
+        nconst = _id_numerico(campos[col['nconst']])
+        if nconst in nconsts_necessarios:
+            nomes[nconst] = campos[col['primaryName']]
+    del nconsts_necessarios
+    _relatar_etapa("name.basics", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "name.basics")
+
+    print("📥 Etapa 4/4: gerando filmes a partir de title.basics...")
+    inicio = time.perf_counter()
+    leitor = _ler_tsv(basics_tsv)
+    col = _colunas(next(leitor))
+    linhas = 0
+    gerados = 0
+    for campos in leitor:
+        linhas += 1
+        if linhas % INTERVALO_VERIFICACAO_TETO == 0:
+            _verificar_teto(teto_memoria_mb, "geração de filmes")
+        if not _filme_valido(campos, col):
+            continue
+        tconst = _id_numerico(campos[col['tconst']])
+        if tconst not in diretor_por_titulo:
+            continue
+
+        diretor_nome = nomes.get(diretor_por_titulo[tconst], "Desconhecido")
+        genero = campos[col['genres']].split(',')[0]
+        yield Filme(campos[col['tconst']], campos[col['primaryTitle']], int(campos[col['startYear']]), genero, diretor_nome)
+
+        gerados += 1
+        if limite is not None and gerados >= limite:
+            break
+    _relatar_etapa("title.basics (filmes)", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "geração de filmes")
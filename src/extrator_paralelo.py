@@ -0,0 +1,277 @@
+# src/extrator_paralelo.py
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from itertools import islice
+from typing import Iterator
+
+from src.filme import Filme
+from src.extrator import (
+    INTERVALO_VERIFICACAO_TETO,
+    VALOR_NULO,
+    _colunas,
+    _filme_valido,
+    _id_numerico,
+    _pico_memoria_mb,
+    _relatar_etapa,
+    _verificar_teto,
+)
+
+# Quantidade de faixas por processo (faixas menores equilibram melhor a carga)
+FAIXAS_POR_PROCESSO = 4
+
+# Faixas submetidas por processo e ainda não consumidas: os resultados parciais que
+# esperam a vez (na ordem do arquivo) ficam limitados a processos × FAIXAS_EM_ANDAMENTO
+FAIXAS_EM_ANDAMENTO = 2
+
+# Estado de cada processo trabalhador, definido pelo inicializador: o filtro da etapa
+# (conjunto ou dicionário), o teto de memória e o pico de memória ao iniciar
+_filtro = None
+_teto_memoria_mb = None
+_pico_inicial_mb = 0.0
+
+def _inicializar_trabalhador(filtro, teto_memoria_mb):
+    """Inicializador dos processos: guarda o filtro e o teto da etapa em variáveis globais."""
+    global _filtro, _teto_memoria_mb, _pico_inicial_mb
+    _filtro = filtro
+    _teto_memoria_mb = teto_memoria_mb
+    _pico_inicial_mb = _pico_memoria_mb() or 0.0
+
+def _verificar_teto_trabalhador(linhas: int, etapa: str):
+    """Confere o teto no trabalhador a cada INTERVALO_VERIFICACAO_TETO linhas da faixa."""
+    if linhas % INTERVALO_VERIFICACAO_TETO == 0:
+        _verificar_teto(_teto_memoria_mb, etapa)
+
+def _memoria_alocada_mb() -> float:
+    """
+    Quanto o pico de memória do trabalhador cresceu desde que ele foi iniciado: as páginas
+    herdadas do processo principal já são contadas no pico dele.
+    """
+    return max(0.0, (_pico_memoria_mb() or 0.0) - _pico_inicial_mb)
+
+#---------------------#
+#  Divisão em faixas  #
+#---------------------#
+def ler_cabecalho(caminho: str) -> tuple[dict[str, int], int]:
+    """Retorna o mapa de colunas do TSV e o offset em bytes onde começam os dados."""
+    with open(caminho, "rb") as f:
+        cabecalho = f.readline()
+    colunas = cabecalho.decode("utf-8-sig").rstrip("\r\n").split("\t")
+    return _colunas(colunas), len(cabecalho)
+
+def dividir_em_faixas(caminho: str, inicio_dados: int, n_faixas: int) -> list[tuple[int, int]]:
+    """
+    Divide o arquivo em até n_faixas intervalos [inicio, fim) de bytes,
+    cada um começando e terminando em uma quebra de linha.
+    """
+    tamanho = os.path.getsize(caminho)
+    passo = max(1, (tamanho - inicio_dados) // max(1, n_faixas))
+    limites = [inicio_dados]
+    with open(caminho, "rb") as f:
+        posicao = inicio_dados + passo
+        while posicao < tamanho:
+            f.seek(posicao)
+            f.readline()  # avança até o fim da linha parcial
+            fronteira = f.tell()
+            if fronteira >= tamanho:
+                break
+            if fronteira > limites[-1]:
+                limites.append(fronteira)
+            posicao = fronteira + passo
+    limites.append(tamanho)
+    return [(limites[i], limites[i + 1]) for i in range(len(limites) - 1) if limites[i] < limites[i + 1]]
+
+def _linhas_da_faixa(caminho: str, inicio: int, fim: int) -> Iterator[list[str]]:
+    """Gera as linhas (já divididas por tabulação) de uma faixa de bytes do TSV."""
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        posicao = inicio
+        for linha in f:
+            if posicao >= fim:
+                break
+            posicao += len(linha)
+            yield linha.decode("utf-8").rstrip("\r\n").split("\t")
+
+#---------------------------------------#
+#  Trabalhadores (um por faixa de TSV)  #
+#---------------------------------------#
+# Cada trabalhador retorna as linhas lidas, o resultado da faixa, o pid e a memória que
+# alocou (_memoria_alocada_mb), para que o processo principal a some ao próprio pico
+def _trabalho_tconsts(args) -> tuple[int, list[int], int, float]:
+    caminho, inicio, fim, col, _ = args
+    linhas = 0
+    tconsts = []
+    for campos in _linhas_da_faixa(caminho, inicio, fim):
+        linhas += 1
+        _verificar_teto_trabalhador(linhas, "title.basics")
+        if _filme_valido(campos, col):
+            tconst = _id_numerico(campos[col['tconst']])
+            if tconst is not None:
+                tconsts.append(tconst)
+    return linhas, tconsts, os.getpid(), _memoria_alocada_mb()
+
+def _trabalho_crew(args) -> tuple[int, dict[int, int], int, float]:
+    caminho, inicio, fim, col, _ = args
+    linhas = 0
+    diretores = {}
+    for campos in _linhas_da_faixa(caminho, inicio, fim):
+        linhas += 1
+        _verificar_teto_trabalhador(linhas, "title.crew")
+        tconst = _id_numerico(campos[col['tconst']])
+        if tconst not in _filtro:
+            continue
+        diretores_ids = campos[col['directors']]
+        if diretores_ids and diretores_ids != VALOR_NULO:
+            nconst = _id_numerico(diretores_ids.split(',')[0])
+            if nconst is not None:
+                diretores[tconst] = nconst
+    return linhas, diretores, os.getpid(), _memoria_alocada_mb()
+
+def _trabalho_nomes(args) -> tuple[int, dict[int, str], int, float]:
+    caminho, inicio, fim, col, _ = args
+    linhas = 0
+    nomes = {}
+    for campos in _linhas_da_faixa(caminho, inicio, fim):
+        linhas += 1
+        _verificar_teto_trabalhador(linhas, "name.basics")
+        nconst = _id_numerico(campos[col['nconst']])
+        if nconst in _filtro:
+            nomes[nconst] = campos[col['primaryName']]
+    return linhas, nomes, os.getpid(), _memoria_alocada_mb()
+
+def _trabalho_filmes(args) -> tuple[int, list[tuple], int, float]:
+    # Com limite, a faixa para no limite-ésimo filme: nenhuma faixa contribui com mais
+    caminho, inicio, fim, col, limite = args
+    linhas = 0
+    filmes = []
+    for campos in _linhas_da_faixa(caminho, inicio, fim):
+        linhas += 1
+        _verificar_teto_trabalhador(linhas, "geração de filmes")
+        if not _filme_valido(campos, col):
+            continue
+        tconst = _id_numerico(campos[col['tconst']])
+        if tconst not in _filtro:
+            continue
+        filmes.append((
+            campos[col['tconst']],
+            campos[col['primaryTitle']],
+            int(campos[col['startYear']]),
+            campos[col['genres']].split(',')[0],
+            _filtro[tconst],
+        ))
+        if limite is not None and len(filmes) >= limite:
+            break
+    return linhas, filmes, os.getpid(), _memoria_alocada_mb()
+
+def _executar_etapa(trabalho, caminho: str, processos: int, filtro=None,
+                    teto_memoria_mb: float | None = None, etapa: str = "",
+                    limite: int | None = None) -> Iterator[tuple[int, object]]:
+    """
+    Executa um trabalhador sobre as faixas do arquivo em paralelo e gera (linhas lidas,
+    resultado) de cada faixa, na ordem do arquivo, à medida que ficam prontos. Só
+    processos × FAIXAS_EM_ANDAMENTO faixas ficam submetidas e não consumidas: a faixa
+    seguinte é submetida quando uma é consumida, e fechar o gerador (ex: limite de filmes
+    atingido) cancela as pendentes sem processar o resto do arquivo.
+    O teto de memória vale para o total: cada trabalhador o confere durante a faixa, e o
+    processo principal soma ao próprio pico a memória alocada por cada trabalhador.
+    limite: repassado ao trabalhador (quantidade máxima de itens por faixa).
+    """
+    col, inicio_dados = ler_cabecalho(caminho)
+    faixas = dividir_em_faixas(caminho, inicio_dados, processos * FAIXAS_POR_PROCESSO)
+    tarefas = ((caminho, inicio, fim, col, limite) for inicio, fim in faixas)
+    alocada_por_trabalhador: dict[int, float] = {}
+    executor = ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_trabalhador,
+                                   initargs=(filtro, teto_memoria_mb))
+    try:
+        pendentes = deque(executor.submit(trabalho, tarefa)
+                          for tarefa in islice(tarefas, processos * FAIXAS_EM_ANDAMENTO))
+        while pendentes:
+            linhas, resultado, pid, alocada = pendentes.popleft().result()
+            proxima = next(tarefas, None)
+            if proxima is not None:
+                pendentes.append(executor.submit(trabalho, proxima))
+            alocada_por_trabalhador[pid] = max(alocada, alocada_por_trabalhador.get(pid, 0.0))
+            _verificar_teto(teto_memoria_mb, etapa, sum(alocada_por_trabalhador.values()))
+            yield linhas, resultado
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+#-------------------------------#
+#  Extração paralela em etapas  #
+#-------------------------------#
+def extrair_filmes_paralelo(basics_tsv: str,
+                            crew_tsv: str,
+                            nomes_tsv: str,
+                            limite: int | None = None,
+                            processos: int | None = None,
+                            teto_memoria_mb: float | None = None) -> Iterator[Filme]:
+    """
+    Versão paralela de extrair_filmes_em_etapas: cada TSV é dividido em faixas de bytes
+    alinhadas a quebras de linha, processadas por vários processos com um parser simples
+    baseado em split. Os resultados parciais são combinados na ordem original do arquivo,
+    então a saída é a mesma da extração sequencial. Na geração dos filmes, as faixas são
+    consumidas à medida que ficam prontas e a extração para no limite, sem processar o
+    resto do arquivo. O teto de memória inclui o que os processos trabalhadores alocam.
+    """
+    processos = processos or os.cpu_count() or 1
+    print(f"⚙️ Extração paralela com {processos} processo(s).")
+
+    print("📥 Etapa 1/4: coletando tconsts de filmes em title.basics...")
+    inicio = time.perf_counter()
+    linhas = 0
+    tconsts_filmes = set()
+    for linhas_faixa, parcial in _executar_etapa(_trabalho_tconsts, basics_tsv, processos,
+                                                 teto_memoria_mb=teto_memoria_mb, etapa="title.basics"):
+        linhas += linhas_faixa
+        tconsts_filmes.update(parcial)
+    _relatar_etapa("title.basics (tconsts)", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "title.basics")
+
+    print("📥 Etapa 2/4: filtrando diretores em title.crew...")
+    inicio = time.perf_counter()
+    linhas = 0
+    diretor_por_titulo: dict[int, int] = {}
+    for linhas_faixa, parcial in _executar_etapa(_trabalho_crew, crew_tsv, processos, tconsts_filmes,
+                                                 teto_memoria_mb, "title.crew"):
+        linhas += linhas_faixa
+        diretor_por_titulo.update(parcial)
+    del tconsts_filmes
+    _relatar_etapa("title.crew", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "title.crew")
+
+    print("📥 Etapa 3/4: carregando nomes dos diretores necessários em name.basics...")
+    inicio = time.perf_counter()
+    linhas = 0
+    nomes: dict[int, str] = {}
+    for linhas_faixa, parcial in _executar_etapa(_trabalho_nomes, nomes_tsv, processos,
+                                                 set(diretor_por_titulo.values()),
+                                                 teto_memoria_mb, "name.basics"):
+        linhas += linhas_faixa
+        nomes.update(parcial)
+    _relatar_etapa("name.basics", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "name.basics")
+
+    # As faixas são consumidas na ordem do arquivo e os filmes saem assim que a faixa fica
+    # pronta; atingido o limite, as faixas seguintes não são processadas
+    print("📥 Etapa 4/4: gerando filmes a partir de title.basics...")
+    inicio = time.perf_counter()
+    linhas = 0
+    gerados = 0
+    with closing(_executar_etapa(_trabalho_filmes, basics_tsv, processos, diretor_por_titulo,
+                                 teto_memoria_mb, "geração de filmes", limite)) as faixas:
+        for linhas_faixa, parcial in faixas:
+            linhas += linhas_faixa
+            for tconst, titulo, ano, genero, nconst in parcial:
+                yield Filme(tconst, titulo, ano, genero, nomes.get(nconst, "Desconhecido"))
+                gerados += 1
+                if gerados % INTERVALO_VERIFICACAO_TETO == 0:
+                    _verificar_teto(teto_memoria_mb, "geração de filmes")
+                if limite is not None and gerados >= limite:
+                    break
+            if limite is not None and gerados >= limite:
+                break
+    _relatar_etapa("title.basics (filmes)", linhas, inicio)
+    _verificar_teto(teto_memoria_mb, "geração de filmes")
@@ -3,6 +3,9 @@
 import struct
 
 class Filme:
+    # Sem __dict__ por instância: o catálogo completo tem centenas de milhares de filmes
+    __slots__ = ("id", "titulo", "ano", "genero", "diretor")
+
     # Atributos de classe para o formato e tamanho do registro
     FORMATO_REGISTRO = "10s100si20s100s"
     TAMANHO_REGISTRO = struct.calcsize(FORMATO_REGISTRO)
@@ -46,10 +49,23 @@ class Filme:
         de acordo com FORMATO_REGISTRO (atributo de classe).
         """
         id_b, titulo_b, ano, genero_b, diretor_b = struct.unpack(cls.FORMATO_REGISTRO, data) # Acessa via cls.FORMATO_REGISTRO
+        return cls._de_campos(id_b, titulo_b, ano, genero_b, diretor_b)
+
+    @classmethod
+    def from_buffer(cls, buffer, offset: int = 0):
+        """
+        Cria um objeto Filme lendo o registro diretamente de um buffer
+        (ex: mmap) a partir do offset informado, sem copiar o registro antes.
+        """
+        return cls._de_campos(*struct.unpack_from(cls.FORMATO_REGISTRO, buffer, offset))
+
+    @classmethod
+    def _de_campos(cls, id_b: bytes, titulo_b: bytes, ano: int, genero_b: bytes, diretor_b: bytes):
+        """Monta o Filme a partir dos campos brutos de um registro."""
         return cls(
             id_b.decode("utf-8").rstrip("\x00"),
             titulo_b.decode("utf-8").rstrip("\x00"),
             ano,
             genero_b.decode("utf-8").rstrip("\x00"),
             diretor_b.decode("utf-8").rstrip("\x00")
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,293 @@
+# src/formato_blocos.py
+
+import lzma
+import os
+import struct
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Iterator
+
+from src.filme import Filme
+from src.formato_compacto import (serializar_filme, desserializar_filme, tamanho_serializado,
+                                  FORMATO_SERIALIZADO, TAMANHO_SERIALIZADO)
+from src.varredura import FiltroVarredura
+
+MAGICO = b"SIXBLK01"
+
+# Cabeçalho do arquivo: mágico, registros por bloco e compressor
+FORMATO_CABECALHO = "<8sIB"
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+
+# Cabeçalho de cada bloco: tamanho comprimido, quantidade de registros e crc32 dos dados comprimidos
+FORMATO_BLOCO = "<III"
+TAMANHO_CABECALHO_BLOCO = struct.calcsize(FORMATO_BLOCO)
+
+REGISTROS_POR_BLOCO = 256
+BLOCOS_EM_CACHE = 64
+
+# Compressores da biblioteca padrão, na ordem dos códigos gravados no cabeçalho
+COMPRESSORES = ("zlib", "lzma")
+
+def _comprimir(compressor: int, dados: bytes) -> bytes:
+    return lzma.compress(dados) if compressor == 1 else zlib.compress(dados, 6)
+
+def _descomprimir(compressor: int, dados: bytes) -> bytes:
+    return lzma.decompress(dados) if compressor == 1 else zlib.decompress(dados)
+
+#-----------------#
+#  FormatoBlocos  #
+#-----------------#
+class FormatoBlocos:
+    """
+    Arquivo binário em blocos comprimidos, para arquivamento e leituras com cache frio:
+    cada bloco guarda até registros_por_bloco filmes serializados (serializar_filme) e é
+    comprimido de forma independente (zlib ou lzma). O diretório de blocos (filmes.blk)
+    guarda o offset de cada bloco; pode ser refeito a partir do arquivo de dados.
+    O endereço de um filme (o "offset" guardado nos índices) é o número do registro: o
+    bloco é numero // registros_por_bloco, então uma busca por índice descomprime só os
+    blocos que toca. Os blocos descomprimidos ficam em um cache LRU.
+    O último bloco, enquanto incompleto, é regravado a cada descarregar(), sempre no final
+    do arquivo, depois da versão anterior: o diretório só passa a apontar para a nova versão
+    quando ela está gravada (e sincronizada), então uma gravação interrompida nunca estraga
+    filmes já gravados. A versão antiga fica como espaço morto. Ao carregar, um bloco válido
+    encontrado depois de um bloco incompleto é uma versão mais nova dele (um bloco novo só
+    começa depois que o anterior enche).
+    """
+
+    inicio_dados = 0
+    em_blocos = True
+
+    def __init__(self, caminho: str, blocos_em_cache: int = BLOCOS_EM_CACHE):
+        self.caminho = caminho
+        self.caminho_diretorio = os.path.splitext(caminho)[0] + ".blk"
+        with open(caminho, "rb") as f:
+            cabecalho = f.read(TAMANHO_CABECALHO)
+        if len(cabecalho) < TAMANHO_CABECALHO:
+            raise ValueError(f"Arquivo em blocos inválido: {caminho}")
+        magico, self.registros_por_bloco, self.compressor = struct.unpack(FORMATO_CABECALHO, cabecalho)
+        if magico != MAGICO:
+            raise ValueError(f"Arquivo não é um arquivo em blocos: {caminho}")
+        self.blocos = array("Q")   # offset de cada bloco no arquivo de dados
+        self.total = 0
+        self.capacidade_cache = blocos_em_cache
+        self._cache: OrderedDict[int, list[bytes]] = OrderedDict()
+        self.acertos = 0
+        self.blocos_lidos = 0      # blocos lidos do disco e descomprimidos
+        self._aberto = None        # filmes serializados do último bloco, enquanto recebe filmes
+        self._bloco_aberto = None  # número desse bloco
+        self._aberto_sujo = False
+        self._carregar_diretorio()
+
+    @classmethod
+    def criar(cls, caminho: str, compressor: str = "zlib",
+              registros_por_bloco: int = REGISTROS_POR_BLOCO) -> "FormatoBlocos":
+        """Cria um arquivo em blocos vazio (e o diretório), substituindo os existentes."""
+        with open(caminho, "wb") as f:
+            f.write(struct.pack(FORMATO_CABECALHO, MAGICO, registros_por_bloco, COMPRESSORES.index(compressor)))
+        open(os.path.splitext(caminho)[0] + ".blk", "wb").close()
+        return cls(caminho)
+
+    def _carregar_diretorio(self):
+        """
+        Lê o diretório de blocos e o confere com o arquivo de dados: blocos gravados depois
+        do diretório são acrescentados a ele (ou, depois de um bloco incompleto, substituem
+        a versão dele) e um bloco final incompleto ou corrompido (gravação interrompida) é
+        descartado.
+        """
+        alterado = False
+        if os.path.exists(self.caminho_diretorio):
+            with open(self.caminho_diretorio, "rb") as f:
+                dados = f.read()
+            self.blocos.frombytes(dados[:len(dados) - len(dados) % self.blocos.itemsize])
+            alterado = len(dados) % self.blocos.itemsize != 0   # entrada incompleta no final
+        tamanho_dados = os.path.getsize(self.caminho)
+        with open(self.caminho, "rb") as f:
+            posicao = TAMANHO_CABECALHO
+            while self.blocos:
+                tamanho = self._tamanho_bloco_valido(f, self.blocos[-1])
+                if tamanho is not None:
+                    posicao = self.blocos[-1] + TAMANHO_CABECALHO_BLOCO + tamanho
+                    break
+                self.blocos.pop()
+                alterado = True
+            while posicao < tamanho_dados:
+                tamanho = self._tamanho_bloco_valido(f, posicao)
+                if tamanho is None:
+                    break
+                if self.blocos and self._quantidade_em(f, self.blocos[-1]) < self.registros_por_bloco:
+                    self.blocos[-1] = posicao   # versão mais nova do último bloco
+                else:
+                    self.blocos.append(posicao)
+                posicao += TAMANHO_CABECALHO_BLOCO + tamanho
+                alterado = True
+            if self.blocos:
+                quantidade = self._quantidade_em(f, self.blocos[-1])
+                self.total = (len(self.blocos) - 1) * self.registros_por_bloco + quantidade
+        if posicao < tamanho_dados:
+            print(f"⚠️ Bloco incompleto descartado no final de {self.caminho}.")
+            with open(self.caminho, "r+b") as f:
+                f.truncate(posicao)
+        if alterado:
+            with open(self.caminho_diretorio, "wb") as f:
+                self.blocos.tofile(f)
+
+    @staticmethod
+    def _quantidade_em(f, posicao: int) -> int:
+        """Quantidade de registros do bloco na posição (lida do cabeçalho do bloco)."""
+        f.seek(posicao)
+        _, quantidade, _ = struct.unpack(FORMATO_BLOCO, f.read(TAMANHO_CABECALHO_BLOCO))
+        return quantidade
+
+    @staticmethod
+    def _tamanho_bloco_valido(f, posicao: int) -> int | None:
+        """Tamanho comprimido do bloco na posição, ou None se ele estiver incompleto ou corrompido."""
+        f.seek(posicao)
+        cabecalho = f.read(TAMANHO_CABECALHO_BLOCO)
+        if len(cabecalho) < TAMANHO_CABECALHO_BLOCO:
+            return None
+        tamanho, _, crc = struct.unpack(FORMATO_BLOCO, cabecalho)
+        comprimido = f.read(tamanho)
+        if len(comprimido) < tamanho or zlib.crc32(comprimido) != crc:
+            return None
+        return tamanho
+
+    def _registros_do_bloco(self, numero: int) -> list[bytes]:
+        """Filmes serializados de um bloco, lidos do disco e descomprimidos."""
+        with open(self.caminho, "rb") as f:
+            f.seek(self.blocos[numero])
+            tamanho, quantidade, _ = struct.unpack(FORMATO_BLOCO, f.read(TAMANHO_CABECALHO_BLOCO))
+            dados = _descomprimir(self.compressor, f.read(tamanho))
+        self.blocos_lidos += 1
+        registros = []
+        posicao = 0
+        for _ in range(quantidade):
+            fim = posicao + tamanho_serializado(dados, posicao)
+            registros.append(dados[posicao:fim])
+            posicao = fim
+        return registros
+
+    def _ler_bloco(self, numero: int) -> list[bytes]:
+        """Registros de um bloco pelo cache LRU (só os filmes pedidos são desserializados)."""
+        registros = self._cache.get(numero)
+        if registros is not None:
+            self._cache.move_to_end(numero)
+            self.acertos += 1
+            return registros
+        registros = self._registros_do_bloco(numero)
+        self._cache[numero] = registros
+        while len(self._cache) > self.capacidade_cache:
+            self._cache.popitem(last=False)
+        return registros
+
+    def ler_varios(self, numeros: Iterable[int]) -> list[Filme]:
+        """
+        Lê vários filmes pelos números de registro, descomprimindo cada bloco envolvido uma
+        única vez. O resultado preserva a ordem pedida; números inválidos são ignorados.
+        Os filmes do último bloco ainda não gravados (antes de descarregar()) vêm da memória.
+        """
+        numeros = list(numeros)
+        lidos = {}
+        for numero in sorted({n for n in numeros if 0 <= n < self.total}):
+            bloco, posicao = divmod(numero, self.registros_por_bloco)
+            registros = self._aberto if bloco == self._bloco_aberto else self._ler_bloco(bloco)
+            lidos[numero] = desserializar_filme(registros[posicao])
+        return [lidos[n] for n in numeros if n in lidos]
+
+    def iterar(self, inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+        """Gera (número do registro, Filme) em ordem, sem passar pelo cache de blocos."""
+        for bloco in range(max(inicio, 0) // self.registros_por_bloco, len(self.blocos)):
+            numero = bloco * self.registros_por_bloco
+            for registro in self._registros_do_bloco(bloco):
+                if numero >= inicio:
+                    yield numero, desserializar_filme(registro)
+                numero += 1
+
+    def varrer(self, filtro: FiltroVarredura, inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+        """
+        Como iterar, mas o filtro é aplicado no cabeçalho e nos bytes crus do gênero de cada
+        registro descomprimido; só os registros aceitos viram Filme.
+        """
+        cabecalho = struct.Struct(FORMATO_SERIALIZADO).unpack_from
+        aceita = filtro.aceita
+        for bloco in range(max(inicio, 0) // self.registros_por_bloco, len(self.blocos)):
+            numero = bloco * self.registros_por_bloco
+            for registro in self._registros_do_bloco(bloco):
+                if numero >= inicio:
+                    filtro.examinados += 1
+                    ano, n_id, n_titulo, n_genero, _ = cabecalho(registro)
+                    inicio_genero = TAMANHO_SERIALIZADO + n_id + n_titulo
+                    if aceita(ano, registro[inicio_genero:inicio_genero + n_genero]):
+                        filtro.aceitos += 1
+                        yield numero, desserializar_filme(registro)
+                numero += 1
+
+    @staticmethod
+    def como_gravado(filme: Filme) -> Filme:
+        """O filme como é lido de volta deste formato (campos cortados nos limites de bytes)."""
+        return desserializar_filme(serializar_filme(filme))
+
+    def adicionar(self, filme: Filme) -> int:
+        """Acrescenta um filme ao último bloco e retorna o número do registro."""
+        if self._aberto is None:
+            self._aberto, self._bloco_aberto = [], self.total // self.registros_por_bloco
+            if self.total % self.registros_por_bloco:
+                # Último bloco incompleto: continua nele (a nova versão vai para o final)
+                self._aberto = self._registros_do_bloco(len(self.blocos) - 1)
+        self._aberto.append(serializar_filme(filme))
+        self._aberto_sujo = True
+        numero = self.total
+        self.total += 1
+        if len(self._aberto) == self.registros_por_bloco:
+            self._gravar_bloco_aberto()
+            self._aberto, self._bloco_aberto = None, None
+        return numero
+
+    def _gravar_bloco_aberto(self):
+        """
+        Grava o último bloco no final do arquivo e só então aponta o diretório para ele
+        (acrescentando a entrada, se o bloco é novo, ou trocando a última, se é uma nova
+        versão); até lá, o diretório continua apontando para a versão anterior, intacta.
+        """
+        comprimido = _comprimir(self.compressor, b"".join(self._aberto))
+        bloco = struct.pack(FORMATO_BLOCO, len(comprimido), len(self._aberto), zlib.crc32(comprimido)) + comprimido
+        with open(self.caminho, "r+b") as f:
+            inicio = f.seek(0, os.SEEK_END)
+            f.write(bloco)
+            f.flush()
+            os.fsync(f.fileno())
+        entrada = struct.pack("<Q", inicio)
+        if self._bloco_aberto < len(self.blocos):
+            self.blocos[self._bloco_aberto] = inicio
+            with open(self.caminho_diretorio, "r+b") as f_diretorio:
+                f_diretorio.seek(self._bloco_aberto * len(entrada))
+                f_diretorio.write(entrada)
+        else:
+            self.blocos.append(inicio)
+            with open(self.caminho_diretorio, "ab") as f_diretorio:
+                f_diretorio.write(entrada)
+        self._cache.pop(self._bloco_aberto, None)
+        self._aberto_sujo = False
+
+    def __len__(self):
+        return self.total
+
+    def fim_dos_registros(self) -> int:
+        return self.total
+
+    def fim_do_registro(self, numero: int) -> int:
+        return numero + 1
+
+    def assinatura(self, fim: int) -> int:
+        """crc32 do registro anterior a fim (serializado)."""
+        filmes = self.ler_varios([fim - 1]) if fim > 0 else []
+        return zlib.crc32(serializar_filme(filmes[0])) if filmes else 0
+
+    def descarregar(self):
+        """Grava o último bloco, se ele recebeu filmes desde a última gravação."""
+        if self._aberto_sujo:
+            self._gravar_bloco_aberto()
+
+    def fechar(self):
+        self.descarregar()
+        self._cache.clear()
@@ -0,0 +1,357 @@
+# src/formato_compacto.py
+
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Iterator
+
+from src.filme import Filme
+from src.varredura import FiltroVarredura, TAMANHO_LOTE
+
+SEPARADOR = b"\x00"
+
+#--------------------#
+#  DicionarioColuna  #
+#--------------------#
+class DicionarioColuna:
+    """Codifica valores de texto repetidos (gênero, diretor) como inteiros sequenciais."""
+
+    def __init__(self, valores: list[str] | None = None):
+        self.valores = list(valores or [])
+        self._codigos = {valor: i for i, valor in enumerate(self.valores)}
+
+    def codificar(self, valor: str) -> int:
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = len(self.valores)
+            self._codigos[valor] = codigo
+            self.valores.append(valor)
+        return codigo
+
+    def codigo(self, valor: str) -> int | None:
+        return self._codigos.get(valor)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def para_bytes(self) -> bytes:
+        """Quantidade de valores e o tamanho de cada um (uint32), seguidos dos valores em UTF-8."""
+        codificados = [valor.encode("utf-8") for valor in self.valores]
+        tamanhos = struct.pack(f"<I{len(codificados)}I", len(codificados), *map(len, codificados))
+        return tamanhos + b"".join(codificados)
+
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> "DicionarioColuna":
+        (quantidade,) = struct.unpack_from("<I", dados, 0)
+        tamanhos = struct.unpack_from(f"<{quantidade}I", dados, 4)
+        valores = []
+        posicao = 4 + 4 * quantidade
+        for tamanho in tamanhos:
+            valores.append(dados[posicao:posicao + tamanho].decode("utf-8"))
+            posicao += tamanho
+        return cls(valores)
+
+    @classmethod
+    def de_bytes_separados(cls, dados: bytes) -> "DicionarioColuna":
+        """
+        Formato anterior, com os valores separados por NUL. Ambíguo quando o dicionário tem
+        um único valor vazio (gravado como b""); mantido só para ler arquivos antigos.
+        """
+        return cls([parte.decode("utf-8") for parte in dados.split(SEPARADOR)] if dados else [])
+
+#----------------------------------#
+#  Serialização autocontida (log)  #
+#----------------------------------#
+# Ano e tamanhos do ID, do título, do gênero e do diretor, seguidos dos textos em UTF-8
+FORMATO_SERIALIZADO = "<iBHBH"
+TAMANHO_SERIALIZADO = struct.calcsize(FORMATO_SERIALIZADO)
+
+def _texto(valor: str, limite: int) -> bytes:
+    """Codifica em UTF-8 sem passar do limite de bytes e sem cortar um caractere ao meio."""
+    dados = valor.encode("utf-8")
+    if len(dados) > limite:
+        dados = dados[:limite].decode("utf-8", errors="ignore").encode("utf-8")
+    return dados
+
+def serializar_filme(filme: Filme) -> bytes:
+    """Serializa um filme com campos de tamanho variável, sem depender de dicionários."""
+    id_b = _texto(filme.id, 0xFF)
+    titulo_b = _texto(filme.titulo, 0xFFFF)
+    genero_b = _texto(filme.genero, 0xFF)
+    diretor_b = _texto(filme.diretor, 0xFFFF)
+    return (struct.pack(FORMATO_SERIALIZADO, filme.ano, len(id_b), len(titulo_b), len(genero_b), len(diretor_b))
+            + id_b + titulo_b + genero_b + diretor_b)
+
+def tamanho_serializado(dados, offset: int = 0) -> int:
+    """Tamanho do filme serializado que começa no offset."""
+    _, n_id, n_titulo, n_genero, n_diretor = struct.unpack_from(FORMATO_SERIALIZADO, dados, offset)
+    return TAMANHO_SERIALIZADO + n_id + n_titulo + n_genero + n_diretor
+
+def desserializar_filme(dados, offset: int = 0) -> Filme:
+    ano, n_id, n_titulo, n_genero, n_diretor = struct.unpack_from(FORMATO_SERIALIZADO, dados, offset)
+    fim_id = offset + TAMANHO_SERIALIZADO + n_id
+    fim_titulo = fim_id + n_titulo
+    fim_genero = fim_titulo + n_genero
+    return Filme(str(dados[fim_id - n_id:fim_id], "utf-8"), str(dados[fim_id:fim_titulo], "utf-8"), ano,
+                 str(dados[fim_titulo:fim_genero], "utf-8"), str(dados[fim_genero:fim_genero + n_diretor], "utf-8"))
+
+#-------------------#
+#  FormatoCompacto  #
+#-------------------#
+MAGICO = b"SIXBIN02"
+MAGICO_DICIONARIOS = b"SIXDIC01"
+
+# Registro: ano, código do gênero, código do diretor, tamanho do ID e do título (em bytes),
+# seguidos do ID e do título em UTF-8
+FORMATO_REGISTRO = "<iIIBH"
+TAMANHO_FIXO = struct.calcsize(FORMATO_REGISTRO)
+
+# Entrada do arquivo de dicionários: coluna (gênero ou diretor) e tamanho do valor em bytes
+FORMATO_ENTRADA_DICIONARIO = "<BH"
+TAMANHO_ENTRADA_DICIONARIO = struct.calcsize(FORMATO_ENTRADA_DICIONARIO)
+COLUNA_GENERO, COLUNA_DIRETOR = 0, 1
+
+class FormatoCompacto:
+    """
+    Versão 2 do arquivo binário: registros de tamanho variável, com gênero e diretor
+    codificados por dicionário e o título completo (sem o corte em 100 bytes).
+    O arquivo de dados (filmes.bin) começa com MAGICO e é acompanhado de dois arquivos
+    auxiliares, ambos somente de acréscimo:
+    - filmes.dic: os valores dos dicionários, na ordem dos códigos. Cada valor novo é gravado
+      antes do primeiro registro que o usa.
+    - filmes.off: a tabela número do registro -> offset (uint64), usada para contar os registros,
+      localizar o último e acessar um registro pelo número. Pode ser refeita a partir dos dados.
+    Os índices continuam guardando o offset de cada registro, então o acesso aleatório
+    segue O(1): o cabeçalho fixo do registro informa o tamanho dos campos variáveis.
+    """
+
+    tamanho_minimo = TAMANHO_FIXO
+    inicio_dados = len(MAGICO)
+    em_blocos = False
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        base = os.path.splitext(caminho)[0]
+        self.caminho_dicionarios = base + ".dic"
+        self.caminho_offsets = base + ".off"
+        self.generos = DicionarioColuna()
+        self.diretores = DicionarioColuna()
+        self.offsets = array("Q")
+        self._offsets_pendentes = array("Q")
+        self._carregar_dicionarios()
+        self._carregar_offsets()
+        self._f_dicionarios = open(self.caminho_dicionarios, "ab", buffering=0)
+
+    @classmethod
+    def criar(cls, caminho: str) -> "FormatoCompacto":
+        """Cria um arquivo de dados vazio (e os auxiliares), substituindo os existentes."""
+        base = os.path.splitext(caminho)[0]
+        with open(caminho, "wb") as f:
+            f.write(MAGICO)
+        with open(base + ".dic", "wb") as f:
+            f.write(MAGICO_DICIONARIOS)
+        open(base + ".off", "wb").close()
+        return cls(caminho)
+
+    def _carregar_dicionarios(self):
+        with open(self.caminho_dicionarios, "r+b") as f:
+            dados = f.read()
+            if not dados.startswith(MAGICO_DICIONARIOS):
+                raise ValueError(f"Arquivo não é um dicionário do formato compacto: {self.caminho_dicionarios}")
+            posicao = len(MAGICO_DICIONARIOS)
+            while posicao + TAMANHO_ENTRADA_DICIONARIO <= len(dados):
+                coluna, tamanho = struct.unpack_from(FORMATO_ENTRADA_DICIONARIO, dados, posicao)
+                fim = posicao + TAMANHO_ENTRADA_DICIONARIO + tamanho
+                if fim > len(dados):
+                    break
+                dicionario = self.generos if coluna == COLUNA_GENERO else self.diretores
+                dicionario.codificar(dados[posicao + TAMANHO_ENTRADA_DICIONARIO:fim].decode("utf-8"))
+                posicao = fim
+            if posicao < len(dados):
+                # Valor incompleto no final (gravação interrompida): nenhum registro o usa
+                f.truncate(posicao)
+
+    def _carregar_offsets(self):
+        """
+        Lê a tabela de offsets e completa-a com os registros gravados depois dela. Um registro
+        incompleto no final do arquivo de dados (gravação interrompida) é descartado.
+        """
+        tamanho_dados = os.path.getsize(self.caminho)
+        with open(self.caminho_offsets, "rb") as f:
+            dados = f.read()
+            completos = len(dados) - len(dados) % self.offsets.itemsize
+            self.offsets.frombytes(dados[:completos])
+
+        with open(self.caminho, "rb") as f:
+            # Descarta offsets de registros que não estão completos no arquivo de dados
+            inicio = self.inicio_dados
+            while self.offsets:
+                f.seek(self.offsets[-1])
+                cabecalho = f.read(TAMANHO_FIXO)
+                if len(cabecalho) == TAMANHO_FIXO:
+                    inicio = self.offsets[-1] + self.tamanho_em(cabecalho, 0)
+                    if inicio <= tamanho_dados:
+                        break
+                self.offsets.pop()
+            if len(self.offsets) * self.offsets.itemsize != len(dados):
+                with open(self.caminho_offsets, "r+b") as f_offsets:
+                    f_offsets.truncate(len(self.offsets) * self.offsets.itemsize)
+            if not self.offsets:
+                inicio = self.inicio_dados
+            if inicio >= tamanho_dados:
+                return
+            f.seek(inicio)
+            dados = f.read()
+        posicao = 0
+        while posicao + TAMANHO_FIXO <= len(dados):
+            fim = posicao + self.tamanho_em(dados, posicao)
+            if fim > len(dados):
+                break
+            self._offsets_pendentes.append(inicio + posicao)
+            posicao = fim
+        self.offsets.extend(self._offsets_pendentes)
+        self.descarregar()
+        if posicao < len(dados):
+            print(f"⚠️ Registro incompleto descartado no final de {self.caminho}.")
+            with open(self.caminho, "r+b") as f:
+                f.truncate(inicio + posicao)
+
+    def _codigo(self, dicionario: DicionarioColuna, coluna: int, valor: str) -> int:
+        codigo = dicionario.codigo(valor)
+        if codigo is None:
+            dados = valor.encode("utf-8")
+            # Sem buffer: o valor chega ao arquivo antes de qualquer registro que o use
+            self._f_dicionarios.write(struct.pack(FORMATO_ENTRADA_DICIONARIO, coluna, len(dados)) + dados)
+            codigo = dicionario.codificar(valor)
+        return codigo
+
+    def codificar(self, filme: Filme) -> bytes:
+        id_b = _texto(filme.id, 0xFF)
+        titulo_b = _texto(filme.titulo, 0xFFFF)
+        genero = self._codigo(self.generos, COLUNA_GENERO, _texto(filme.genero, 0xFFFF).decode("utf-8"))
+        diretor = self._codigo(self.diretores, COLUNA_DIRETOR, _texto(filme.diretor, 0xFFFF).decode("utf-8"))
+        return struct.pack(FORMATO_REGISTRO, filme.ano, genero, diretor, len(id_b), len(titulo_b)) + id_b + titulo_b
+
+    def decodificar(self, buffer, offset: int) -> Filme:
+        ano, genero, diretor, n_id, n_titulo = struct.unpack_from(FORMATO_REGISTRO, buffer, offset)
+        fim_id = offset + TAMANHO_FIXO + n_id
+        # Gênero e diretor vêm dos dicionários: as strings são compartilhadas entre os filmes
+        return Filme(str(buffer[fim_id - n_id:fim_id], "utf-8"), str(buffer[fim_id:fim_id + n_titulo], "utf-8"),
+                     ano, self.generos.valores[genero], self.diretores.valores[diretor])
+
+    @staticmethod
+    def como_gravado(filme: Filme) -> Filme:
+        """O filme como é lido de volta deste formato (campos cortados nos limites de bytes)."""
+        return Filme(_texto(filme.id, 0xFF).decode("utf-8"), _texto(filme.titulo, 0xFFFF).decode("utf-8"),
+                     filme.ano, _texto(filme.genero, 0xFFFF).decode("utf-8"),
+                     _texto(filme.diretor, 0xFFFF).decode("utf-8"))
+
+    @staticmethod
+    def tamanho_em(buffer, offset: int) -> int:
+        """Tamanho do registro que começa no offset (lido do cabeçalho fixo)."""
+        _, _, _, n_id, n_titulo = struct.unpack_from(FORMATO_REGISTRO, buffer, offset)
+        return TAMANHO_FIXO + n_id + n_titulo
+
+    def iterar(self, inicio: int = 0, tamanho_bloco: int = 1024 * 1024) -> Iterator[tuple[int, Filme]]:
+        """Gera (offset, Filme) a partir do offset inicio, lendo o arquivo em blocos."""
+        offset = max(inicio, self.inicio_dados)
+        with open(self.caminho, "rb") as f:
+            f.seek(offset)
+            resto = b""
+            while True:
+                bloco = f.read(tamanho_bloco)
+                if not bloco:
+                    return
+                dados = resto + bloco
+                posicao = 0
+                while posicao + TAMANHO_FIXO <= len(dados):
+                    fim = posicao + self.tamanho_em(dados, posicao)
+                    if fim > len(dados):
+                        break
+                    yield offset + posicao, self.decodificar(dados, posicao)
+                    posicao = fim
+                resto = dados[posicao:]
+                offset += posicao
+
+    def varrer(self, filtro: FiltroVarredura, inicio: int = 0) -> Iterator[tuple[int, Filme]]:
+        """
+        Como iterar, mas o filtro é aplicado no cabeçalho fixo de cada registro: o ano e o
+        código do gênero, comparado com o conjunto de códigos aceitos (calculado uma vez a
+        partir do dicionário). Só os registros aceitos viram Filme.
+        """
+        generos = self.generos.valores
+        codigos = None if filtro.genero is None else {c for c, valor in enumerate(generos)
+                                                       if filtro.aceita_genero(valor)}
+        ano_min, ano_max = filtro.ano_min, filtro.ano_max
+        cabecalho = struct.Struct(FORMATO_REGISTRO).unpack_from
+        offset = max(inicio, self.inicio_dados)
+        with open(self.caminho, "rb") as f:
+            f.seek(offset)
+            resto = b""
+            while True:
+                bloco = f.read(TAMANHO_LOTE)
+                if not bloco:
+                    return
+                dados = resto + bloco
+                posicao = 0
+                limite = len(dados) - TAMANHO_FIXO
+                examinados = 0
+                while posicao <= limite:
+                    ano, genero, _, n_id, n_titulo = cabecalho(dados, posicao)
+                    fim = posicao + TAMANHO_FIXO + n_id + n_titulo
+                    if fim > len(dados):
+                        break
+                    examinados += 1
+                    if ((ano_min is None or ano_min <= ano <= ano_max)
+                            and (codigos is None or genero in codigos)):
+                        filtro.aceitos += 1
+                        yield offset + posicao, self.decodificar(dados, posicao)
+                    posicao = fim
+                filtro.examinados += examinados
+                resto = dados[posicao:]
+                offset += posicao
+
+    def registrar_offset(self, offset: int):
+        self.offsets.append(offset)
+        self._offsets_pendentes.append(offset)
+
+    def offset_do_registro(self, numero: int) -> int:
+        return self.offsets[numero]
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def fim_dos_registros(self) -> int:
+        """Offset logo após o último registro completo."""
+        if not self.offsets:
+            return self.inicio_dados
+        with open(self.caminho, "rb") as f:
+            f.seek(self.offsets[-1])
+            return self.offsets[-1] + self.tamanho_em(f.read(TAMANHO_FIXO), 0)
+
+    def fim_do_registro(self, offset: int) -> int:
+        with open(self.caminho, "rb") as f:
+            f.seek(offset)
+            return offset + self.tamanho_em(f.read(TAMANHO_FIXO), 0)
+
+    def assinatura(self, fim: int) -> int:
+        """crc32 do registro que termina em fim."""
+        if fim <= self.inicio_dados:
+            return 0
+        with open(self.caminho, "rb") as f:
+            inicio = self.offsets[bisect_left(self.offsets, fim) - 1]
+            f.seek(inicio)
+            return zlib.crc32(f.read(fim - inicio))
+
+    def descarregar(self):
+        """Grava no arquivo a parte nova da tabela de offsets."""
+        if self._offsets_pendentes:
+            with open(self.caminho_offsets, "ab") as f:
+                self._offsets_pendentes.tofile(f)
+            self._offsets_pendentes = array("Q")
+
+    def fechar(self):
+        self.descarregar()
+        self._f_dicionarios.close()
@@ -1,127 +1,628 @@
 # src/index_builder.py
 
 import csv
+import glob
+import json
+import os
+import threading
+import time
 from collections import defaultdict
-from typing import List, Dict
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict
 
 from src.filme import Filme
-from src.binary_store import adicionar_filme_ao_binario, ler_filmes_binario
+from src.binary_store import ler_filmes_binario, iterar_filmes_binario, GravadorBinario, obter_formato, obter_store
+from src.ordenacao_externa import OrdenadorExterno, pares_em_memoria
+from src.colunas import ColunasFilmes
+from src.estatisticas import EstatisticasIncrementais, salvar_estatisticas_em_arquivo, carregar_estatisticas_de_arquivo
+from src.log_indices import LogIndices
+from src.cache_buscas import invalidar_cache_buscas
 
-from indices.trie import Trie, salvar_trie_em_arquivo, carregar_trie_de_arquivo
+from indices.trie_compacta import TrieCompacta, salvar_trie_compacta, carregar_trie_compacta
 from indices.hash import salvar_hash_em_arquivo, carregar_hash_de_arquivo
-from indices.arvore import BTree
+from indices.diretores import IndiceDiretores, salvar_indice_diretores_em_arquivo, carregar_indice_diretores_de_arquivo
+from indices.genero import chaves_de_genero, salvar_indice_genero_em_arquivo, carregar_indice_genero_de_arquivo
+from indices.palavras import IndicePalavras, salvar_indice_palavras_em_arquivo, carregar_indice_palavras_de_arquivo
+from indices.arvore_paginada import BTreePaginada, tamanho_chave_texto
+
+# Quantidade de linhas do TSV processadas por lote na importação
+LINHAS_POR_LOTE = 10000
+
+# Arquivos de um snapshot dos índices; cada checkpoint grava uma nova geração (ex: trie.3.idx)
+ARQUIVOS_INDICE = ("trie.idx", "palavras.idx", "hash.idx", "diretores.idx", "genero.idx", "colunas.idx",
+                   "estatisticas.idx", "b_ano.idx", "b_id.idx")
+ARQUIVO_MANIFESTO = "indices.manifest"
+ARQUIVO_LOG = "indices.log"
+
+# Quantidade de entradas no log a partir da qual salvar_todos_indices faz um checkpoint
+LIMITE_LOG_CHECKPOINT = 100000
+
+# Atributos do IndexBuilder carregados sob demanda e o arquivo de cada um no snapshot
+INDICES_SOB_DEMANDA = {
+    "trie": "trie.idx",
+    "indice_palavras": "palavras.idx",
+    "hash_diretor": "hash.idx",
+    "indice_diretores": "diretores.idx",
+    "indice_genero": "genero.idx",
+    "colunas": "colunas.idx",
+    "estatisticas": "estatisticas.idx",
+    "indice_ano": "b_ano.idx",
+    "indice_id": "b_id.idx",
+}
+
+def _filmes_do_lote(linhas: list[list[str]]) -> Iterator[Filme]:
+    """Converte as linhas de um lote do TSV simplificado em filmes, ignorando as inválidas."""
+    for linha in linhas:
+        # Pula linhas malformadas ou vazias
+        if len(linha) != 5:
+            continue
+
+        id_filme, titulo, ano_str, genero, diretor = linha
+
+        try:
+            ano = int(ano_str)
+        except ValueError:
+            print(f"⚠️ Linha ignorada: ano inválido ('{ano_str}') para o filme '{titulo}'")
+            continue
+
+        yield Filme(id_filme, titulo, ano, genero, diretor)
+
+def _campos(filme: Filme) -> tuple:
+    """Todos os campos do filme (Filme.__eq__ compara só o ID)."""
+    return (filme.id, filme.titulo, filme.ano, filme.genero, filme.diretor)
+
+class _IndiceSobDemanda:
+    """
+    Atributo de índice do IndexBuilder. Depois de carregar_todos_indices, o índice só é
+    lido do disco no primeiro acesso (pelo menu ou pela thread de aquecimento).
+    """
+
+    def __set_name__(self, dono, nome):
+        self.nome = nome
+
+    def __get__(self, builder, dono=None):
+        if builder is None:
+            return self
+        indices = builder._indices
+        if self.nome not in indices:
+            with builder._trava:
+                if self.nome not in indices:
+                    builder._carregar_indice(self.nome)
+        return indices[self.nome]
+
+    def __set__(self, builder, valor):
+        builder._indices[self.nome] = valor
 
 
 class IndexBuilder:
-    def __init__(self, bin_path: str = "data/filmes.bin"):
+    trie = _IndiceSobDemanda()
+    indice_palavras = _IndiceSobDemanda()
+    hash_diretor = _IndiceSobDemanda()
+    indice_diretores = _IndiceSobDemanda()
+    indice_genero = _IndiceSobDemanda()
+    colunas = _IndiceSobDemanda()
+    estatisticas = _IndiceSobDemanda()
+    indice_ano = _IndiceSobDemanda()
+    indice_id = _IndiceSobDemanda()
+
+    def __init__(self, bin_path: str = "data/filmes.bin", tamanho_buffer: int = 256):
         """
         Inicializa o IndexBuilder e as instâncias dos índices.
         bin_path: Caminho para o arquivo binário principal de filmes.
+        tamanho_buffer: quantidade de nós de cada B-Tree paginada mantidos em memória.
+        Os arquivos de índice ficam na mesma pasta do arquivo binário.
+        Os índices em disco formam um snapshot (geração) indicado pelo manifesto; as
+        alterações posteriores ficam no log de alterações até o próximo checkpoint.
+        Ao carregar, cada índice é lido do disco só no primeiro uso.
         """
         self.bin_path = bin_path
-        self.trie = Trie()
+        self.dir_indices = os.path.dirname(bin_path) or "."
+        self.tamanho_buffer = tamanho_buffer
+        self._indices = {}
+        self._trava = threading.RLock()
+        # Tempo de carga (s) de cada índice carregado sob demanda
+        self.tempos_carga = {}
+        self.trie = TrieCompacta()
+        # Índice invertido das palavras dos títulos (busca por palavra ou trecho, com ranking)
+        self.indice_palavras = IndicePalavras()
         self.hash_diretor = defaultdict(list)
-        self.indice_ano = BTree(t=3)
-        self.indice_id = BTree(t=3)
+        # Nomes dos diretores normalizados e por trigramas (busca sem caixa/acentos e aproximada)
+        self.indice_diretores = IndiceDiretores()
+        self.indice_genero = defaultdict(list)
+        # Colunas de ano, gênero e diretor (uma posição por registro) usadas nas estatísticas
+        self.colunas = ColunasFilmes()
+        # Contagens e rankings do catálogo, atualizados a cada filme adicionado
+        self.estatisticas = EstatisticasIncrementais()
+        # As B-Trees de ano e ID são paginadas em disco; são abertas ao construir ou carregar
+        self.indice_ano = None
+        self.indice_id = None
+        # Geração do snapshot em disco e última sequência do log que ela já contém
+        self.geracao = 0
+        self.seq_snapshot = 0
+        self.log = None
+        self._snapshot_pendente = False
+        # Entradas do log posteriores ao snapshot, reaplicadas em cada índice ao carregá-lo
+        self._seq_carregada = 0
+        self._pendentes = []
+        self._total_snapshot = 0
+        # Bytes iniciais de filmes.bin cobertos pelos índices (snapshot + log)
+        self.tamanho_coberto = 0
+
+    def _caminho_indice(self, nome: str, geracao: int | None = None) -> str:
+        """Caminho do arquivo de índice (de uma geração do snapshot) dentro da pasta de dados."""
+        base, extensao = os.path.splitext(nome)
+        geracao = self.geracao if geracao is None else geracao
+        return os.path.join(self.dir_indices, f"{base}.{geracao}{extensao}")
+
+    #------------------------------#
+    #  Manifesto e log de índices  #
+    #------------------------------#
+    def _ler_manifesto(self) -> dict:
+        with open(os.path.join(self.dir_indices, ARQUIVO_MANIFESTO), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _gravar_manifesto(self, geracao: int, seq: int, tamanho_bin: int):
+        """
+        Troca o manifesto de forma atômica (arquivo temporário + os.replace). O manifesto é o
+        cabeçalho comum dos arquivos da geração: além da geração e da sequência do log, guarda
+        o tamanho de filmes.bin coberto pelo snapshot e o crc do último registro coberto.
+        """
+        caminho = os.path.join(self.dir_indices, ARQUIVO_MANIFESTO)
+        temporario = caminho + ".tmp"
+        manifesto = {"geracao": geracao, "seq": seq, "tamanho_bin": tamanho_bin,
+                     "crc_final": obter_formato(self.bin_path).assinatura(tamanho_bin)}
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, caminho)
+
+    def _conferir_binario(self, manifesto: dict) -> bool:
+        """
+        Confere, em tempo constante, se o snapshot e o log abertos correspondem a filmes.bin:
+        o último registro coberto pelo log (ou, sem log pendente, o crc do último registro
+        coberto pelo snapshot) precisa estar no binário, no mesmo offset, com os campos do
+        registro do log como o formato ativo os grava. Registros do binário
+        além do que os índices cobrem (ex: importação interrompida antes de registrar o lote
+        no log) são acrescentados ao log e incorporados como as demais alterações pendentes.
+        Retorna False se o binário não corresponde aos índices.
+        """
+        # Ao abrir o formato, um registro incompleto no final do binário já é descartado
+        formato = obter_formato(self.bin_path)
+        tamanho = formato.fim_dos_registros()
+        if "tamanho_bin" not in manifesto:
+            # Manifesto sem o cabeçalho de validação (gravado por uma versão anterior)
+            self.tamanho_coberto = tamanho
+            return True
+
+        if self.log.seq > self.seq_snapshot:
+            offset, filme_log = self.log.ultima
+            filme = obter_store(self.bin_path).ler(offset)
+            # O log guarda o Filme completo; o binário, com os campos cortados pelo formato
+            gravado = formato.como_gravado(filme_log)
+            confere = filme is not None and _campos(filme) == _campos(gravado)
+            coberto = formato.fim_do_registro(offset) if confere else 0
+        else:
+            coberto = manifesto["tamanho_bin"]
+            confere = coberto <= tamanho and formato.assinatura(coberto) == manifesto["crc_final"]
+        if not confere:
+            print(f"⚠️ Os índices não correspondem a {self.bin_path} (arquivo substituído ou truncado).")
+            return False
+
+        if tamanho > coberto:
+            faltantes = 0
+            registros = iterar_filmes_binario(self.bin_path, inicio=coberto)
+            while True:
+                lote = list(islice(registros, LINHAS_POR_LOTE))
+                if not lote:
+                    break
+                self.log.registrar(lote)
+                faltantes += len(lote)
+            print(f"🩹 {faltantes} registro(s) de {self.bin_path} ainda não indexados; "
+                  "serão incorporados aos índices.")
+        self.tamanho_coberto = tamanho
+        return True
+
+    def _abrir_log(self, seq_inicial: int):
+        if self.log is not None:
+            self.log.fechar()
+        self.log = LogIndices(os.path.join(self.dir_indices, ARQUIVO_LOG), seq_inicial)
+
+    def _entradas_pendentes(self) -> list[tuple[int, Filme]]:
+        """Entradas do log entre o snapshot e o momento do carregamento (lidas uma vez)."""
+        if self._pendentes is None:
+            self._pendentes = list(self.log.entradas_apos(self.seq_snapshot, self._seq_carregada))
+        return self._pendentes
+
+    def _carregar_indice(self, nome: str):
+        """
+        Lê um índice da geração atual e reaplica nele as entradas pendentes do log.
+        Chamado no primeiro acesso ao atributo (com a trava do IndexBuilder).
+        """
+        inicio = time.perf_counter()
+        caminho = self._caminho_indice(INDICES_SOB_DEMANDA[nome])
+        if nome == "trie":
+            # A trie compacta é mapeada em memória (sem unpickle)
+            indice = carregar_trie_compacta(caminho)
+        elif nome == "indice_palavras":
+            indice = carregar_indice_palavras_de_arquivo(caminho)
+        elif nome == "hash_diretor":
+            indice = carregar_hash_de_arquivo(caminho)
+        elif nome == "indice_diretores":
+            indice = carregar_indice_diretores_de_arquivo(caminho)
+        elif nome == "indice_genero":
+            indice = carregar_indice_genero_de_arquivo(caminho)
+        elif nome == "colunas":
+            indice = ColunasFilmes.carregar(caminho)
+        elif nome == "estatisticas":
+            indice = carregar_estatisticas_de_arquivo(caminho)
+        else:
+            # As B-Trees paginadas leem só o cabeçalho; os nós vêm do disco sob demanda.
+            # Sem roubo: as alterações até o próximo checkpoint não tocam o snapshot.
+            indice = BTreePaginada(caminho, self.tamanho_buffer, sem_roubo=True)
+
+        pendentes = self._entradas_pendentes()
+        if nome == "colunas":
+            self._total_snapshot = len(indice)
+        if pendentes:
+            total_atual = None
+            if nome in ("indice_ano", "indice_id"):
+                self.colunas   # garante que o total do snapshot seja conhecido
+                total_atual = self._total_snapshot
+            self._incorporar_em(nome, indice, pendentes, total_atual)
+        self._indices[nome] = indice
+        if all(n in self._indices for n in INDICES_SOB_DEMANDA):
+            self._pendentes = []   # todos os índices já receberam as entradas
+
+        duracao = time.perf_counter() - inicio
+        self.tempos_carga[nome] = duracao
+        if threading.current_thread() is threading.main_thread():
+            print(f"📂 Índice '{nome}' carregado sob demanda em {duracao:.3f}s.")
+
+    def aquecer_em_segundo_plano(self) -> threading.Thread:
+        """Carrega em uma thread de fundo os índices que ainda não foram usados."""
+        def aquecer():
+            for nome in INDICES_SOB_DEMANDA:
+                try:
+                    getattr(self, nome)
+                except Exception:
+                    # O erro se repete (e é exibido) quando o menu usar o índice
+                    pass
+
+        thread = threading.Thread(target=aquecer, name="aquecer-indices", daemon=True)
+        thread.start()
+        return thread
+
+    def _descartar_indices(self):
+        """Fecha os índices carregados e os esquece (serão recarregados no próximo uso)."""
+        self._fechar_b_trees()
+        trie = self._indices.get("trie")
+        if trie is not None:
+            trie.fechar()
+        self._indices.clear()
+
+    def _remover_temporarios(self):
+        """Remove cópias de trabalho de B-Trees deixadas por uma execução interrompida."""
+        abertos = {indice.caminho for indice in (self._indices.get("indice_ano"), self._indices.get("indice_id"))
+                   if indice is not None}
+        for nome in ("b_ano.idx", "b_id.idx"):
+            base, extensao = os.path.splitext(nome)
+            for caminho in glob.glob(os.path.join(self.dir_indices, f"{base}.*{extensao}.*.tmp")):
+                if caminho not in abertos:
+                    os.remove(caminho)
+
+    def checkpoint(self):
+        """
+        Grava todos os índices como uma nova geração, troca o manifesto de forma atômica e
+        esvazia o log. Até a troca do manifesto a geração anterior e o log continuam
+        valendo, então uma falha no meio do checkpoint não mistura arquivos antigos e novos.
+        """
+        inicio = time.perf_counter()
+        anterior, nova = self.geracao, self.geracao + 1
+        print(f"💾 Checkpoint dos índices (geração {nova})...")
+        salvar_trie_compacta(self.trie, self._caminho_indice("trie.idx", nova))
+        salvar_indice_palavras_em_arquivo(self.indice_palavras, self._caminho_indice("palavras.idx", nova))
+        salvar_hash_em_arquivo(self.hash_diretor, self._caminho_indice("hash.idx", nova))
+        salvar_indice_diretores_em_arquivo(self.indice_diretores, self._caminho_indice("diretores.idx", nova))
+        salvar_indice_genero_em_arquivo(self.indice_genero, self._caminho_indice("genero.idx", nova))
+        self.colunas.salvar(self._caminho_indice("colunas.idx", nova))
+        salvar_estatisticas_em_arquivo(self.estatisticas, self._caminho_indice("estatisticas.idx", nova))
+        self.indice_ano.salvar_como(self._caminho_indice("b_ano.idx", nova))
+        self.indice_id.salvar_como(self._caminho_indice("b_id.idx", nova))
+        for nome in ARQUIVOS_INDICE:
+            with open(self._caminho_indice(nome, nova), "rb") as f:
+                os.fsync(f.fileno())
+
+        self._gravar_manifesto(nova, self.log.seq, self.tamanho_coberto)
+        self.geracao, self.seq_snapshot = nova, self.log.seq
+        self._snapshot_pendente = False
+        self._pendentes = []
+        self.log.reiniciar()
+        for nome in ARQUIVOS_INDICE:
+            try:
+                os.remove(self._caminho_indice(nome, anterior))
+            except FileNotFoundError:
+                pass
+        self._remover_temporarios()
+        print(f"✅ Checkpoint concluído em {time.perf_counter() - inicio:.2f}s.")
+
+    def _fechar_b_trees(self):
+        """Fecha as B-Trees paginadas abertas (antes de recriá-las ou recarregá-las)."""
+        for nome in ("indice_ano", "indice_id"):
+            indice = self._indices.get(nome)
+            if indice is not None:
+                indice.fechar()
+            self._indices[nome] = None
 
     def construir_todos_indices(self, filmes: List[Filme]):
         """
         Constrói todos os índices do zero a partir de uma lista completa de filmes.
+        Os offsets são os do formato fixo (filmes gravados nesta ordem); para os demais
+        formatos, use construir_indices_do_binario.
+        """
+        registros = ((i * Filme.TAMANHO_REGISTRO, filme) for i, filme in enumerate(filmes))
+        self._construir(registros)
+
+    def construir_indices_do_binario(self, memoria_mb: float | None = None):
+        """
+        Constrói todos os índices lendo os filmes diretamente do arquivo binário,
+        sem manter a lista de objetos Filme em memória (usado no catálogo completo).
+        memoria_mb: orçamento para ordenar as chaves das B-Trees; se as chaves não
+        couberem nele, a ordenação usa runs em disco e intercalação (ordenação externa).
+        O orçamento vale só para essas chaves: a Trie, o índice de palavras, o Hash, o índice
+        de diretores, o índice de gênero e as colunas são montados inteiros em memória (são
+        os mesmos que ficam em memória durante o uso), além do orçamento.
+        """
+        self._construir(iterar_filmes_binario(self.bin_path), memoria_mb)
+
+    def _construir(self, registros: Iterable[tuple[int, Filme]], memoria_mb: float | None = None):
+        """
+        Constrói os índices a partir de pares (offset, Filme). A Trie, o índice de palavras,
+        o Hash, o índice de diretores e o índice de gênero são preenchidos em uma única
+        passada; as chaves das B-Trees são ordenadas, em memória ou externamente, conforme
+        o orçamento, e gravadas como B-Trees paginadas.
         """
         print("🛠️ Construindo todos os índices...")
-        
-        self.trie = Trie()
+
+        # Os índices construídos formam a próxima geração; o log anterior não vale mais
+        try:
+            manifesto = self._ler_manifesto()
+            self.geracao = max(self.geracao, manifesto["geracao"])
+            self.seq_snapshot = max(self.seq_snapshot, manifesto["seq"])
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        self._snapshot_pendente = True
+        if self.log is not None:
+            self.log.fechar()
+            self.log = None
+        caminho_log = os.path.join(self.dir_indices, ARQUIVO_LOG)
+        if os.path.exists(caminho_log):
+            os.remove(caminho_log)
+        self._abrir_log(self.seq_snapshot)
+        self._pendentes = []
+        # Os offsets dos resultados guardados podem não valer para o novo binário
+        invalidar_cache_buscas(self.bin_path)
+
+        self._descartar_indices()
+        self.trie = TrieCompacta()
+        self.indice_palavras = IndicePalavras()
         self.hash_diretor = defaultdict(list)
-        self.indice_ano = BTree(t=3)
-        self.indice_id = BTree(t=3)
+        self.indice_diretores = IndiceDiretores()
+        self.indice_genero = defaultdict(list)
+        self.colunas = ColunasFilmes()
+        self.estatisticas = EstatisticasIncrementais()
+
+        max_pares = pares_em_memoria(memoria_mb, n_ordenadores=2)
+        pares_ano = OrdenadorExterno(max_pares)
+        pares_id = OrdenadorExterno(max_pares)
+        maior_id = 0   # bytes UTF-8 do maior ID: o espaço das chaves da B-Tree de IDs
 
-        for i, filme in enumerate(filmes):
-            offset = i * Filme.TAMANHO_REGISTRO 
-            
+        for offset, filme in registros:
             self.trie.inserir(filme.titulo, offset)
+            self.indice_palavras.inserir(filme.titulo, offset)
+            if filme.diretor not in self.hash_diretor:
+                self.indice_diretores.inserir(filme.diretor)
             self.hash_diretor[filme.diretor].append(offset)
-            self.indice_ano.inserir(filme.ano, offset)
-            self.indice_id.inserir(filme.id, offset)
+            for chave in chaves_de_genero(filme.genero):
+                self.indice_genero[chave].append(offset)
+            self.colunas.adicionar(filme)
+            self.estatisticas.adicionar(filme)
+            pares_ano.adicionar((filme.ano, offset))
+            pares_id.adicionar((filme.id, offset))
+            maior_id = max(maior_id, tamanho_chave_texto(filme.id))
+        if os.path.exists(self.bin_path):
+            self.tamanho_coberto = obter_formato(self.bin_path).fim_dos_registros()
+
+        if pares_ano.usou_disco():
+            print("💽 Chaves das B-Trees excederam o orçamento de memória; usando ordenação externa.")
+
+        self._fechar_b_trees()
+        self.indice_ano = BTreePaginada.construir(self._caminho_indice("b_ano.idx", self.geracao + 1),
+                                                  pares_ano.ordenados(), "int",
+                                                  tamanho_buffer=self.tamanho_buffer, sem_roubo=True)
+        self.indice_id = BTreePaginada.construir(self._caminho_indice("b_id.idx", self.geracao + 1),
+                                                 pares_id.ordenados(), "str",
+                                                 tamanho_buffer=self.tamanho_buffer, sem_roubo=True,
+                                                 tamanho_chave=maior_id)
         print("✅ Índices construídos.")
 
     def atualizar_indices_com_novo_filme(self, filme: Filme):
         """
         Adiciona um único filme ao arquivo binário e atualiza todos os índices.
         """
-        offset = adicionar_filme_ao_binario(filme, self.bin_path)
-        self.trie.inserir(filme.titulo, offset)
-        self.hash_diretor.setdefault(filme.diretor, []).append(offset)
-        self.indice_ano.inserir(filme.ano, offset)
-        self.indice_id.inserir(filme.id, offset)
+        with GravadorBinario(self.bin_path) as gravador:
+            offset = gravador.adicionar(filme)
+        self.log.registrar([(offset, filme)])
+        self.tamanho_coberto = gravador.offset
+        for nome in INDICES_SOB_DEMANDA:
+            self._incorporar_em(nome, getattr(self, nome), [(offset, filme)])
+        invalidar_cache_buscas(self.bin_path)
         return offset
 
     ### NOVO MÉTODO ADICIONADO ###
-    def importar_lote_simplificado(self, caminho_tsv: str) -> int:
+    def importar_lote_simplificado(self, caminho_tsv: str, linhas_por_lote: int = LINHAS_POR_LOTE) -> int:
         """
         Importa filmes de um arquivo TSV com formato simplificado:
         id\ttitulo\tano\tgenero\tdiretor
         E os adiciona ao binário, atualizando todos os índices.
+        O TSV é lido em lotes de linhas e os registros são gravados por um único arquivo
+        com buffer. A Trie, o índice de palavras, o Hash, o índice de diretores, o índice de
+        gênero, as colunas e as estatísticas são atualizados a cada lote; as chaves das
+        B-Trees são incorporadas de uma vez no final.
+        Retorna a quantidade de filmes adicionados, inclusive quando um erro interrompe a
+        importação depois de alguns lotes (esses filmes continuam no catálogo).
         """
         adicionados = 0
+        inicio = time.perf_counter()
+        total_antes = len(self.colunas)
+        importados = []
         print(f"🔄 Importando filmes do TSV simplificado: {caminho_tsv}")
-        
+
         try:
-            with open(caminho_tsv, mode='r', encoding='utf-8') as f_tsv:
+            with open(caminho_tsv, mode='r', encoding='utf-8') as f_tsv, GravadorBinario(self.bin_path) as gravador:
                 leitor = csv.reader(f_tsv, delimiter='\t')
-                for linha in leitor:
-                    # Pula linhas malformadas ou vazias
-                    if len(linha) != 5:
-                        continue
-                    
-                    id_filme, titulo, ano_str, genero, diretor = linha
-
-                    try:
-                        ano = int(ano_str)
-                    except ValueError:
-                        print(f"⚠️ Linha ignorada: ano inválido ('{ano_str}') para o filme '{titulo}'")
-                        continue
-
-                    # Cria o objeto Filme
-                    filme = Filme(id_filme, titulo, ano, genero, diretor)
-                    
-                    # Adiciona ao binário e atualiza todos os índices
-                    self.atualizar_indices_com_novo_filme(filme)
-                    adicionados += 1
-                    
+                while True:
+                    linhas = list(islice(leitor, linhas_por_lote))
+                    if not linhas:
+                        break
+
+                    novos = []
+                    for filme in _filmes_do_lote(linhas):
+                        novos.append((gravador.adicionar(filme), filme))
+                    # Os registros do lote vão para o arquivo antes de os índices apontarem para eles
+                    gravador.descarregar()
+                    self.log.registrar(novos)
+                    self.tamanho_coberto = gravador.offset
+                    self._incorporar_lote(novos)
+                    importados.extend(novos)
+                    adicionados += len(novos)
+
         except FileNotFoundError:
             print(f"❌ Arquivo TSV não encontrado: {caminho_tsv}")
             return 0
         except Exception as e:
+            # Os lotes anteriores ao erro já estão no binário, no log e nos índices
             print(f"❌ Erro ao processar o arquivo TSV: {e}")
-            return 0
-                
-        print(f"✅ {adicionados} filmes importados e índices atualizados.")
+            print(f"⚠️ Importação interrompida: {adicionados} filme(s) dos lotes anteriores "
+                  "foram gravados e indexados.")
+            return adicionados
+        finally:
+            # Mesmo se a importação parar no meio, os registros já gravados entram nas B-Trees
+            if importados:
+                for nome in ("indice_ano", "indice_id"):
+                    self._incorporar_em(nome, getattr(self, nome), importados, total_antes)
+                # Buscas guardadas no cache não contêm os filmes importados
+                invalidar_cache_buscas(self.bin_path)
+
+        duracao = time.perf_counter() - inicio
+        print(f"✅ {adicionados} filmes importados e índices atualizados "
+              f"em {duracao:.2f}s ({adicionados / max(duracao, 1e-9):,.0f} filmes/s).")
         return adicionados
 
+    def _incorporar_lote(self, novos: list[tuple[int, Filme]]):
+        """
+        Incorpora à Trie, ao índice de palavras, ao Hash, ao índice de diretores, ao índice
+        de gênero, às colunas e às estatísticas um lote de pares (offset, Filme) já gravados
+        no binário.
+        """
+        for nome in ("trie", "indice_palavras", "hash_diretor", "indice_diretores", "indice_genero", "colunas", "estatisticas"):
+            self._incorporar_em(nome, getattr(self, nome), novos)
+
+    @staticmethod
+    def _incorporar_em(nome: str, indice, novos: list[tuple[int, Filme]], total_atual: int | None = None):
+        """
+        Incorpora a um único índice um lote de pares (offset, Filme). Os offsets são
+        agrupados por diretor e por gênero antes de estender as listas, as estatísticas são
+        agregadas por lote e as B-Trees recebem as chaves de uma vez (total_atual é a
+        quantidade de chaves que a árvore já tem, usada para decidir entre inserir e reconstruir).
+        """
+        if nome in ("trie", "indice_palavras"):
+            for offset, filme in novos:
+                indice.inserir(filme.titulo, offset)
+        elif nome in ("hash_diretor", "indice_genero"):
+            agrupados = defaultdict(list)
+            for offset, filme in novos:
+                if nome == "hash_diretor":
+                    agrupados[filme.diretor].append(offset)
+                else:
+                    for chave in chaves_de_genero(filme.genero):
+                        agrupados[chave].append(offset)
+            for chave, offsets in agrupados.items():
+                indice.setdefault(chave, []).extend(offsets)
+        elif nome == "indice_diretores":
+            for diretor in dict.fromkeys(filme.diretor for _, filme in novos):
+                indice.inserir(diretor)
+        elif nome == "colunas":
+            for _, filme in novos:
+                indice.adicionar(filme)
+        elif nome == "estatisticas":
+            indice.adicionar_lote([filme for _, filme in novos])
+        elif nome == "indice_ano":
+            if len(novos) == 1:
+                indice.inserir(novos[0][1].ano, novos[0][0])
+            else:
+                indice.inserir_lote([(filme.ano, offset) for offset, filme in novos], total_atual)
+        elif nome == "indice_id":
+            if len(novos) == 1:
+                indice.inserir(novos[0][1].id, novos[0][0])
+            else:
+                indice.inserir_lote([(filme.id, offset) for offset, filme in novos], total_atual)
+
     def salvar_todos_indices(self):
-        """Salva todas as instâncias dos índices em seus respectivos arquivos."""
+        """
+        Persiste as alterações dos índices. Depois de uma construção, ou com o log grande
+        demais, faz um checkpoint; nos demais casos basta sincronizar o log, cujo custo
+        depende do tamanho da alteração e não do tamanho do catálogo.
+        """
         print("💾 Salvando índices...")
-        salvar_trie_em_arquivo(self.trie, "data/trie.idx")
-        salvar_hash_em_arquivo(self.hash_diretor, "data/hash.idx")
-        self.indice_ano.salvar_para_arquivo("data/b_ano.idx")
-        self.indice_id.salvar_para_arquivo("data/b_id.idx")
+        if self._snapshot_pendente or self.log.entradas >= LIMITE_LOG_CHECKPOINT:
+            self.checkpoint()
+        else:
+            self.log.sincronizar()
+            print(f"📝 Log de alterações sincronizado ({self.log.entradas} entrada(s) desde o último checkpoint).")
         print("✅ Todos os índices foram salvos com sucesso.")
 
     def carregar_todos_indices(self) -> bool:
         """
-        Tenta carregar todas as instâncias dos índices de seus arquivos.
+        Abre o snapshot indicado pelo manifesto e o log de alterações. Os índices em si não
+        são lidos aqui: cada um é carregado (e recebe as entradas do log) no primeiro uso,
+        então o menu fica disponível sem esperar pelos índices que a sessão não usa.
         """
         print("🔄 Carregando índices existentes...")
         try:
-            self.trie = carregar_trie_de_arquivo("data/trie.idx")
-            self.hash_diretor = carregar_hash_de_arquivo("data/hash.idx")
-            self.indice_ano = BTree.carregar_de_arquivo("data/b_ano.idx")
-            self.indice_id = BTree.carregar_de_arquivo("data/b_id.idx")
-            print("✅ Índices carregados.")
+            manifesto = self._ler_manifesto()
+            geracao = manifesto["geracao"]
+            for nome in ARQUIVOS_INDICE:
+                caminho = self._caminho_indice(nome, geracao)
+                if not os.path.exists(caminho):
+                    raise FileNotFoundError(caminho)
+            with self._trava:
+                self._descartar_indices()
+                self.geracao, self.seq_snapshot = geracao, manifesto["seq"]
+                self._snapshot_pendente = False
+                self._remover_temporarios()
+                self._abrir_log(self.seq_snapshot)
+                if not self._conferir_binario(manifesto):
+                    print("⚠️ Será necessário reconstruir os índices a partir do arquivo binário.")
+                    return False
+                self._seq_carregada = self.log.seq
+                self._pendentes = None
+                invalidar_cache_buscas(self.bin_path)
+            pendentes = self.log.seq - self.seq_snapshot
+            if pendentes:
+                print(f"🔁 {pendentes} alteração(ões) do log serão reaplicadas em cada índice no primeiro uso.")
+            print("✅ Índices prontos (carregados sob demanda).")
             return True
         except FileNotFoundError:
             print("⚠️ Um ou mais arquivos de índice não encontrados. Será necessário reconstruir.")
             return False
         except Exception as e:
             print(f"❌ Erro ao carregar índices: {e}. Será necessário reconstruir.")
-            return False
\ No newline at end of file
+            return False
+
+    def fechar(self):
+        """Fecha os arquivos dos índices e o log (as alterações já estão no log)."""
+        self._descartar_indices()
+        if self.log is not None:
+            self.log.fechar()
+            self.log = None
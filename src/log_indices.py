@@ -0,0 +1,123 @@
+# src/log_indices.py
+
+import os
+import struct
+import zlib
+from typing import Iterator
+
+from src.filme import Filme
+from src.formato_compacto import serializar_filme, desserializar_filme
+
+MAGICO = b"SIXLOG02"
+TAMANHO_CABECALHO = len(MAGICO)
+
+# Cada entrada: crc32 do restante da entrada, número de sequência, offset do filme em
+# filmes.bin e tamanho do filme serializado (serializar_filme), seguido dele. A serialização
+# não depende do formato de filmes.bin nem corta os textos, então o log reproduz o filme inteiro.
+FORMATO_ENTRADA = "<IQqH"
+TAMANHO_PREFIXO = struct.calcsize(FORMATO_ENTRADA)
+
+class LogIndices:
+    """
+    Log de alterações dos índices, somente de acréscimo. Cada filme adicionado ao catálogo
+    gera uma entrada (offset + registro), da qual todas as chaves dos índices podem ser
+    recalculadas. Ao abrir, o log é validado pelo crc de cada entrada e uma entrada
+    incompleta no final (gravação interrompida) é descartada.
+    Os números de sequência continuam crescendo entre checkpoints: o manifesto dos
+    índices guarda até qual sequência o snapshot já contém.
+    """
+
+    def __init__(self, caminho: str, seq_inicial: int = 0):
+        self.caminho = caminho
+        self.seq = seq_inicial   # último número de sequência usado
+        self.entradas = 0        # entradas válidas no arquivo
+        self.ultima = None       # (offset, Filme) da última entrada, se houver
+        self._f = open(caminho, "a+b")
+        try:
+            self._validar()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _validar(self):
+        self._f.seek(0)
+        cabecalho = self._f.read(TAMANHO_CABECALHO)
+        if not cabecalho:
+            self._f.write(MAGICO)
+            self._f.flush()
+            return
+        if cabecalho != MAGICO:
+            raise ValueError(f"Arquivo não é um log de índices: {self.caminho}")
+
+        fim_valido = TAMANHO_CABECALHO
+        ultima = None
+        for seq, offset, registro, fim in self._ler(self._f):
+            self.seq = max(self.seq, seq)
+            self.entradas += 1
+            ultima = (offset, registro)
+            fim_valido = fim
+        if ultima is not None:
+            self.ultima = (ultima[0], desserializar_filme(ultima[1]))
+        if fim_valido < os.fstat(self._f.fileno()).st_size:
+            print(f"⚠️ Entrada incompleta descartada no final do log: {self.caminho}")
+            self._f.truncate(fim_valido)
+
+    @staticmethod
+    def _ler(f) -> Iterator[tuple[int, int, bytes, int]]:
+        """Gera (seq, offset, registro, posição final) das entradas válidas, em ordem."""
+        f.seek(TAMANHO_CABECALHO)
+        posicao = TAMANHO_CABECALHO
+        while True:
+            prefixo = f.read(TAMANHO_PREFIXO)
+            if len(prefixo) < TAMANHO_PREFIXO:
+                return
+            crc, seq, offset, tamanho = struct.unpack(FORMATO_ENTRADA, prefixo)
+            registro = f.read(tamanho)
+            if len(registro) < tamanho or zlib.crc32(registro, zlib.crc32(prefixo[4:])) != crc:
+                return
+            posicao += TAMANHO_PREFIXO + tamanho
+            yield seq, offset, registro, posicao
+
+    def registrar(self, novos: list[tuple[int, Filme]]):
+        """Acrescenta uma entrada por par (offset, Filme), com uma única escrita."""
+        if not novos:
+            return
+        partes = []
+        for offset, filme in novos:
+            self.seq += 1
+            registro = serializar_filme(filme)
+            corpo = struct.pack("<QqH", self.seq, offset, len(registro)) + registro
+            partes.append(struct.pack("<I", zlib.crc32(corpo)) + corpo)
+        self._f.write(b"".join(partes))
+        self._f.flush()
+        self.entradas += len(novos)
+        self.ultima = (offset, filme)
+
+    def entradas_apos(self, seq: int, ate: int | None = None) -> Iterator[tuple[int, Filme]]:
+        """
+        Gera os pares (offset, Filme) registrados depois da sequência seq (e até a
+        sequência ate, se informada). Usa um descritor de leitura próprio, então pode
+        ser chamado enquanto outras entradas são registradas.
+        """
+        with open(self.caminho, "rb") as f:
+            for seq_entrada, offset, registro, _ in self._ler(f):
+                if ate is not None and seq_entrada > ate:
+                    return
+                if seq_entrada > seq:
+                    yield offset, desserializar_filme(registro)
+
+    def sincronizar(self):
+        """Garante que as entradas registradas estejam no disco."""
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def reiniciar(self):
+        """Esvazia o log depois de um checkpoint (a sequência não volta a zero)."""
+        self._f.truncate(TAMANHO_CABECALHO)
+        self.sincronizar()
+        self.entradas = 0
+        self.ultima = None
+
+    def fechar(self):
+        if not self._f.closed:
+            self._f.close()
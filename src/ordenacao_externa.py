@@ -0,0 +1,99 @@
+# src/ordenacao_externa.py
+
+import heapq
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Iterator
+
+# Quantidade de itens gravados por bloco de pickle dentro de cada run
+ITENS_POR_BLOCO = 4096
+
+# Estimativa de memória ocupada por um par (chave, offset) em uma lista Python
+BYTES_POR_PAR = 200
+
+class OrdenadorExterno:
+    """
+    Ordena uma sequência de pares (chave, offset) maior que a memória disponível.
+    Os itens são acumulados até max_em_memoria; cada lote cheio é ordenado e gravado
+    em disco como um "run". No final, os runs são intercalados com heapq.merge.
+    Se tudo couber em memória, nenhum arquivo temporário é criado.
+    """
+
+    def __init__(self, max_em_memoria: int, dir_tmp: str | None = None):
+        self.max_em_memoria = max(1, max_em_memoria)
+        self.dir_tmp = dir_tmp
+        self._buffer = []
+        self._runs = []
+        self._dir_runs = None
+        self.total = 0
+
+    def adicionar(self, item):
+        """Adiciona um item; grava um run em disco quando o buffer enche."""
+        self._buffer.append(item)
+        self.total += 1
+        if len(self._buffer) >= self.max_em_memoria:
+            self._gravar_run()
+
+    def _gravar_run(self):
+        """Ordena o buffer atual e o grava como um novo run."""
+        if not self._buffer:
+            return
+        if self._dir_runs is None:
+            self._dir_runs = tempfile.mkdtemp(prefix="sixchairs_runs_", dir=self.dir_tmp)
+        self._buffer.sort()
+        caminho = os.path.join(self._dir_runs, f"run_{len(self._runs):05d}.tmp")
+        with open(caminho, "wb") as f:
+            for i in range(0, len(self._buffer), ITENS_POR_BLOCO):
+                pickle.dump(self._buffer[i:i + ITENS_POR_BLOCO], f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._runs.append(caminho)
+        self._buffer = []
+
+    @staticmethod
+    def _ler_run(caminho: str) -> Iterator:
+        """Lê os itens de um run na ordem em que foram gravados."""
+        with open(caminho, "rb") as f:
+            while True:
+                try:
+                    bloco = pickle.load(f)
+                except EOFError:
+                    return
+                yield from bloco
+
+    def usou_disco(self) -> bool:
+        """Indica se a ordenação precisou gravar runs em disco."""
+        return bool(self._runs)
+
+    def ordenados(self) -> Iterator:
+        """
+        Gera todos os itens adicionados em ordem crescente.
+        Os arquivos temporários são removidos ao final da iteração.
+        """
+        try:
+            if not self._runs:
+                self._buffer.sort()
+                yield from self._buffer
+                return
+
+            self._gravar_run()
+            yield from heapq.merge(*(self._ler_run(caminho) for caminho in self._runs))
+        finally:
+            self.fechar()
+
+    def fechar(self):
+        """Descarta o buffer e remove os runs temporários."""
+        self._buffer = []
+        self._runs = []
+        if self._dir_runs is not None:
+            shutil.rmtree(self._dir_runs, ignore_errors=True)
+            self._dir_runs = None
+
+def pares_em_memoria(memoria_mb: float | None, n_ordenadores: int = 1) -> int:
+    """
+    Converte um orçamento de memória (MB) no número de pares que cada ordenador
+    pode manter em memória antes de recorrer a runs em disco.
+    """
+    if memoria_mb is None:
+        return 2 ** 62
+    return max(1, int(memoria_mb * 1024 * 1024) // (BYTES_POR_PAR * max(1, n_ordenadores)))
@@ -0,0 +1,245 @@
+# src/planejador.py
+
+from src.filme import Filme
+from src.binary_store import obter_store, varrer_filmes_binario
+from src.varredura import FiltroVarredura
+from indices.palavras import pontuar_titulo
+from indices.diretores import resolver_diretor
+
+# Custo relativo de ler e decodificar um registro do disco, comparado ao custo
+# de obter um offset de um índice. Um critério só é aplicado pelo índice se buscar
+# seus offsets custar menos do que ler os candidatos restantes e filtrá-los.
+CUSTO_LEITURA_REGISTRO = 4
+
+ESTRATEGIA_INDICE = "índice"
+ESTRATEGIA_FILTRO = "filtro no registro"
+ESTRATEGIA_VARREDURA = "varredura sequencial"
+
+class EtapaPlano:
+    """
+    Um critério da busca combinada, com sua estimativa de seletividade
+    (quantidade de filmes que satisfazem o critério segundo o índice).
+    """
+
+    def __init__(self, criterio: str, valor, estimativa: int | None, obter_offsets, aceita,
+                 estimativa_minima: bool = False):
+        self.criterio = criterio
+        self.valor = valor
+        self.estimativa = estimativa    # None quando não há índice para o critério
+        self.estimativa_minima = estimativa_minima  # contagem interrompida: há ao menos `estimativa`
+        self.obter_offsets = obter_offsets
+        self.aceita = aceita            # predicado aplicado ao Filme lido do disco
+        self.estrategia = None
+        self.restantes = None           # candidatos após aplicar a etapa pelo índice
+
+    def __repr__(self):
+        return f"EtapaPlano({self.criterio}={self.valor!r}, estimativa={self.estimativa}, estrategia={self.estrategia})"
+
+class PlanoBusca:
+    """
+    Plano de execução de uma busca combinada. As etapas são ordenadas da mais
+    seletiva para a menos seletiva; a interseção é feita sobre conjuntos de offsets
+    e só os offsets que sobrevivem são lidos do disco.
+    """
+
+    def __init__(self, etapas: list[EtapaPlano], caminho_bin: str):
+        self.etapas = sorted(etapas, key=lambda e: (e.estimativa is None, e.estimativa or 0))
+        self.caminho_bin = caminho_bin
+        self.registros_lidos = 0
+
+    def executar(self) -> list[Filme]:
+        """Executa o plano e retorna os filmes que satisfazem todos os critérios."""
+        return [filme for _, filme in self.executar_pares()]
+
+    def executar_pares(self) -> list[tuple[int, Filme]]:
+        """Executa o plano e retorna os pares (offset, Filme) que satisfazem todos os critérios."""
+        indexadas = [e for e in self.etapas if e.estimativa is not None]
+        if not indexadas:
+            # Nenhum critério tem índice: varredura sequencial aplicando todos os critérios
+            for etapa in self.etapas:
+                etapa.estrategia = ESTRATEGIA_VARREDURA
+            # Ano e gênero são filtrados nos campos crus, antes de os filmes serem criados
+            valores = {etapa.criterio: etapa.valor for etapa in self.etapas}
+            filtro = FiltroVarredura(ano=valores.get("ano"), genero=valores.get("gênero"))
+            try:
+                pares = list(varrer_filmes_binario(self.caminho_bin, filtro))
+            except FileNotFoundError:
+                print(f"⚠️  Arquivo binário não encontrado: {self.caminho_bin}")
+                return []
+            self.registros_lidos = filtro.examinados if not filtro.vazio else len(pares)
+            cache = obter_store(self.caminho_bin).cache
+            return [(offset, cache.reaproveitar(offset, filme)) for offset, filme in self._filtrar(pares)]
+
+        candidatos = None
+        for etapa in indexadas:
+            if candidatos is not None and (not candidatos or
+                                           len(candidatos) * CUSTO_LEITURA_REGISTRO < etapa.estimativa):
+                etapa.estrategia = ESTRATEGIA_FILTRO
+                continue
+            etapa.estrategia = ESTRATEGIA_INDICE
+            offsets = set(etapa.obter_offsets())
+            candidatos = offsets if candidatos is None else candidatos & offsets
+            etapa.restantes = len(candidatos)
+
+        for etapa in self.etapas:
+            if etapa.estrategia is None:
+                etapa.estrategia = ESTRATEGIA_FILTRO
+
+        pares = obter_store(self.caminho_bin).fetch_pares(sorted(candidatos))
+        self.registros_lidos = len(pares)
+        return self._filtrar(pares)
+
+    def _filtrar(self, pares: list[tuple[int, Filme]]) -> list[tuple[int, Filme]]:
+        """Aplica nos registros lidos os critérios que não foram resolvidos pelo índice."""
+        residuais = [e for e in self.etapas if e.estrategia in (ESTRATEGIA_FILTRO, ESTRATEGIA_VARREDURA)]
+        # Mantém a semântica de conjunto por ID das buscas anteriores
+        resultado = {}
+        for offset, filme in pares:
+            if filme not in resultado and all(e.aceita(filme) for e in residuais):
+                resultado[filme] = offset
+        return [(offset, filme) for filme, offset in resultado.items()]
+
+    def explicar(self) -> str:
+        """Descrição textual do plano (estimativas, ordem e estratégia de cada etapa)."""
+        linhas = ["🧭 Plano de execução:"]
+        for i, etapa in enumerate(self.etapas, 1):
+            if etapa.estimativa is None:
+                estimativa = "sem índice"
+            elif etapa.estimativa_minima:
+                estimativa = f"≥{etapa.estimativa} filme(s)"
+            else:
+                estimativa = f"~{etapa.estimativa} filme(s)"
+            estrategia = etapa.estrategia or "pendente"
+            restantes = f" → {etapa.restantes} candidato(s)" if etapa.restantes is not None else ""
+            linhas.append(f"  {i}. {etapa.criterio} = {etapa.valor!r} [{estimativa}] via {estrategia}{restantes}")
+        linhas.append(f"  📀 Registros lidos do disco: {self.registros_lidos}")
+        return "\n".join(linhas)
+
+#-----------------------#
+#  Montagem das etapas  #
+#-----------------------#
+def _offsets_uma_vez(buscar) -> tuple:
+    """
+    Para índices sem contagem barata: busca os offsets uma única vez e devolve a quantidade
+    (a estimativa, exata) e a função que entrega os mesmos offsets, sem percorrer o índice de novo.
+    """
+    offsets = buscar()
+    return len(offsets), lambda: offsets
+
+def _contagem_anos(ano, contagem_anos: dict) -> int:
+    """Filmes do ano (ou do intervalo de anos) segundo as contagens por ano das estatísticas."""
+    if isinstance(ano, tuple):
+        return sum(qtd for a, qtd in contagem_anos.items() if ano[0] <= a <= ano[1])
+    return contagem_anos.get(ano, 0)
+
+def planejar_busca(prefixo_titulo: str | None,
+                   diretor: str | None,
+                   ano: int | tuple | None,
+                   genero: str | None,
+                   trie_obj,
+                   hash_diretor_obj: dict,
+                   indice_ano_obj,
+                   indice_genero_obj: dict | None,
+                   caminho_bin: str,
+                   palavras_titulo: str | None = None,
+                   indice_palavras_obj=None,
+                   indice_diretores_obj=None,
+                   contagem_anos: dict | None = None) -> PlanoBusca | None:
+    """
+    Monta o plano da busca combinada, estimando a seletividade de cada critério
+    a partir dos índices, sem ler registros do disco. Retorna None se nenhum
+    critério foi informado.
+    contagem_anos: filmes por ano (EstatisticasIncrementais.anos.contagens); com ele, o
+    critério de ano é estimado sem percorrer a B-Tree. Sem ele, a B-Tree é contada só até
+    o ponto em que o critério já seria aplicado como filtro (ver _estimar_ano).
+    """
+    etapas = []
+
+    if palavras_titulo:
+        aceita = lambda f: pontuar_titulo(palavras_titulo, f.titulo) is not None
+        if indice_palavras_obj is not None:
+            etapas.append(EtapaPlano(
+                "palavras do título", palavras_titulo, indice_palavras_obj.contar(palavras_titulo),
+                lambda: indice_palavras_obj.buscar(palavras_titulo),
+                aceita,
+            ))
+        else:
+            etapas.append(EtapaPlano("palavras do título", palavras_titulo, None, None, aceita))
+
+    if prefixo_titulo:
+        prefixo_lower = prefixo_titulo.lower()
+        contar = getattr(trie_obj, "contar", None)
+        if contar:
+            estimativa, obter = contar(prefixo_titulo), lambda: trie_obj.buscar(prefixo_titulo)
+        else:
+            # Trie sem contagem: os offsets buscados para estimar são os que a etapa usa
+            estimativa, obter = _offsets_uma_vez(lambda: trie_obj.buscar(prefixo_titulo))
+        etapas.append(EtapaPlano(
+            "título", prefixo_titulo, estimativa, obter,
+            lambda f: f.titulo.lower().startswith(prefixo_lower),
+        ))
+
+    if diretor:
+        # O nome é resolvido sem diferenciar caixa e acentos quando há índice de diretores
+        nomes = resolver_diretor(diretor, hash_diretor_obj, indice_diretores_obj)
+        etapas.append(EtapaPlano(
+            "diretor", diretor, sum(len(hash_diretor_obj[n]) for n in nomes),
+            lambda: [offset for n in nomes for offset in hash_diretor_obj[n]],
+            lambda f: f.diretor in nomes,
+        ))
+
+    etapa_ano = None
+    if ano:
+        if isinstance(ano, tuple):
+            obter = lambda: indice_ano_obj.buscar_intervalo(ano[0], ano[1])
+            aceita = lambda f: ano[0] <= f.ano <= ano[1]
+        else:
+            obter = lambda: indice_ano_obj.buscar(ano)
+            aceita = lambda f: f.ano == ano
+        # A estimativa é feita depois das demais etapas, que limitam a contagem na B-Tree
+        etapa_ano = EtapaPlano("ano", ano, None, obter, aceita)
+        etapas.append(etapa_ano)
+
+    if genero:
+        genero_lower = genero.lower()
+        aceita = lambda f: genero_lower in f.genero.lower().split(',')
+        if indice_genero_obj is not None:
+            etapas.append(EtapaPlano(
+                "gênero", genero, len(indice_genero_obj.get(genero_lower, [])),
+                lambda: indice_genero_obj.get(genero_lower, []),
+                aceita,
+            ))
+        else:
+            # Sem índice de gênero, a etapa só pode ser aplicada como filtro ou varredura
+            etapas.append(EtapaPlano("gênero", genero, None, None, aceita))
+
+    if etapa_ano is not None:
+        _estimar_ano(etapa_ano, indice_ano_obj, contagem_anos,
+                     [e.estimativa for e in etapas if e is not etapa_ano and e.estimativa is not None])
+
+    if not etapas:
+        return None
+    return PlanoBusca(etapas, caminho_bin)
+
+def _estimar_ano(etapa: EtapaPlano, indice_ano_obj, contagem_anos: dict | None, outras: list[int]):
+    """
+    Estima o critério de ano sem percorrer o intervalo duas vezes (contar e depois buscar):
+      - com as contagens por ano das estatísticas, a estimativa é exata e não lê a B-Tree;
+      - com outras etapas indexadas, a contagem para em min(outras) × CUSTO_LEITURA_REGISTRO + 1:
+        acima disso o critério é aplicado como filtro de qualquer forma, e o número exato
+        não muda o plano (a estimativa vira um mínimo);
+      - sendo o único critério indexado, ele será aplicado pelo índice: os offsets são
+        buscados uma vez e a quantidade deles é a estimativa.
+    """
+    ano = etapa.valor
+    if contagem_anos is not None:
+        etapa.estimativa = _contagem_anos(ano, contagem_anos)
+    elif outras:
+        limite = min(outras) * CUSTO_LEITURA_REGISTRO + 1
+        if isinstance(ano, tuple):
+            etapa.estimativa = indice_ano_obj.contar_intervalo(ano[0], ano[1], limite)
+        else:
+            etapa.estimativa = indice_ano_obj.contar(ano, limite)
+        etapa.estimativa_minima = etapa.estimativa >= limite
+    else:
+        etapa.estimativa, etapa.obter_offsets = _offsets_uma_vez(etapa.obter_offsets)
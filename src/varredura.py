@@ -0,0 +1,48 @@
+# src/varredura.py
+
+# Bytes lidos do arquivo binário por vez nas varreduras completas
+TAMANHO_LOTE = 4 * 1024 * 1024
+
+class FiltroVarredura:
+    """
+    Predicados de uma varredura completa de filmes.bin (ano exato ou intervalo de anos e
+    gênero), aplicados pelos formatos nos campos crus de cada registro, desempacotados em
+    lote, antes de qualquer Filme ser criado: só os registros aceitos viram objetos.
+    O gênero chega cru (bytes do registro, ou o texto do dicionário no formato compacto) e
+    a decisão é memorizada por valor, já que as combinações de gêneros se repetem muito;
+    assim cada combinação distinta é decodificada e separada por vírgulas uma única vez.
+    Conta os registros examinados e os aceitos.
+    """
+
+    def __init__(self, ano: int | tuple[int, int] | None = None, genero: str | None = None):
+        if isinstance(ano, tuple):
+            self.ano_min, self.ano_max = ano
+        elif ano:
+            self.ano_min = self.ano_max = ano
+        else:
+            self.ano_min = self.ano_max = None
+        self.genero = genero.lower() if genero is not None else None
+        self._generos: dict[bytes | str, bool] = {}
+        self.examinados = 0
+        self.aceitos = 0
+
+    @property
+    def vazio(self) -> bool:
+        """True quando o filtro aceita todos os registros."""
+        return self.ano_min is None and self.genero is None
+
+    def aceita_ano(self, ano: int) -> bool:
+        return self.ano_min is None or self.ano_min <= ano <= self.ano_max
+
+    def aceita_genero(self, genero: bytes | str) -> bool:
+        """genero: o campo cru (bytes, com ou sem os nulos de preenchimento) ou já em texto."""
+        if self.genero is None:
+            return True
+        aceito = self._generos.get(genero)
+        if aceito is None:
+            texto = genero if isinstance(genero, str) else genero.rstrip(b"\x00").decode("utf-8", errors="ignore")
+            aceito = self._generos[genero] = self.genero in texto.lower().split(",")
+        return aceito
+
+    def aceita(self, ano: int, genero: bytes | str) -> bool:
+        return self.aceita_ano(ano) and self.aceita_genero(genero)
@@ -0,0 +1,75 @@
+# tests/test_arvore_paginada.py
+#
+# Ida e volta de chaves de texto pela B-Tree paginada: IDs longos e com caracteres
+# fora do ASCII não podem ser truncados nem colidir.
+#
+# Uso (a partir da raiz do projeto):
+#     python -m pytest -q tests
+
+import os
+import tempfile
+
+from indices.arvore_paginada import BTreePaginada
+
+IDS = ["tt0000001", "tt1234567890123", "tt1234567890999", "ttaaaaaaaaa€x", "tt€€€€€€€€€€€€€€€€€€", "tt9"]
+
+def _construir(pasta: str, ids: list[str], **kwargs) -> BTreePaginada:
+    pares = sorted((id_filme, offset) for offset, id_filme in enumerate(ids))
+    return BTreePaginada.construir(os.path.join(pasta, "b_id.idx"), iter(pares), "str", **kwargs)
+
+def test_chaves_longas_e_nao_ascii_na_construcao():
+    with tempfile.TemporaryDirectory() as pasta:
+        arvore = _construir(pasta, IDS, tamanho_chave=max(len(i.encode("utf-8")) for i in IDS))
+        for offset, id_filme in enumerate(IDS):
+            assert arvore.buscar(id_filme) == [offset]
+        arvore.fechar()
+
+        reaberta = BTreePaginada(os.path.join(pasta, "b_id.idx"))
+        assert [chave for chave, _ in reaberta.scan()] == sorted(IDS)
+        reaberta.fechar()
+
+def test_chave_maior_que_o_espaco_nao_e_truncada():
+    with tempfile.TemporaryDirectory() as pasta:
+        try:
+            _construir(pasta, IDS)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("chave maior que o espaço foi aceita na construção")
+
+def test_insercao_alarga_o_espaco_das_chaves():
+    with tempfile.TemporaryDirectory() as pasta:
+        arvore = _construir(pasta, ["tt0000001", "tt0000002"])
+        caminho = arvore.caminho
+        arvore.inserir("tt1234567890123", 10)
+        arvore.inserir_lote([("tt1234567890999", 11), ("ttaaaaaaaaa€x", 12)])
+        assert arvore.buscar("tt1234567890123") == [10]
+        assert arvore.buscar("tt1234567890999") == [11]
+        assert arvore.buscar("ttaaaaaaaaa€x") == [12]
+        arvore.salvar()
+        arvore.fechar()
+
+        reaberta = BTreePaginada(caminho)
+        assert reaberta.tamanho_chave >= len("tt1234567890999")
+        assert reaberta.buscar("ttaaaaaaaaa€x") == [12]
+        reaberta.fechar()
+
+def test_insercao_sem_roubo_preserva_o_snapshot():
+    with tempfile.TemporaryDirectory() as pasta:
+        arvore = _construir(pasta, ["tt0000001"])
+        arvore.fechar()
+        caminho = os.path.join(pasta, "b_id.idx")
+        snapshot = open(caminho, "rb").read()
+
+        arvore = BTreePaginada(caminho, sem_roubo=True)
+        arvore.inserir("tt1234567890123", 5)
+        assert arvore.buscar("tt1234567890123") == [5]
+        novo = os.path.join(pasta, "b_id.2.idx")
+        arvore.salvar_como(novo)
+        arvore.fechar()
+        assert open(caminho, "rb").read() == snapshot
+
+        reaberta = BTreePaginada(novo)
+        assert reaberta.buscar("tt1234567890123") == [5]
+        assert reaberta.buscar("tt0000001") == [0]
+        reaberta.fechar()